@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+#
+#  bench_devenv.py
+"""
+Offline benchmarks for creating devenvs.
+
+Synthetic projects with a configurable number of dependencies and extras are generated
+along with dummy wheels for every requirement, which pip installs from a local ``--find-links``
+directory with ``--no-index``, so the benchmarks never touch the network.
+
+Each run is appended to a JSON-lines history file, and compared with the previous run
+for the same interpreter so regressions are reported.
+
+Usage::
+
+	python benchmarks/bench_devenv.py --sizes 10,100,1000 --extras 5
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import base64
+import datetime
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# 3rd party
+import click
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv import __version__, mkdevenv
+from pyproject_devenv.config import clear_config_cache, load_toml
+
+__all__ = ("make_wheel", "make_project", "offline_environment", "run_benchmarks", "compare")
+
+HERE = PathPlus(__file__).parent
+
+
+def _record_hash(data: bytes) -> str:
+	digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b'=')
+	return f"sha256={digest.decode('ASCII')}"
+
+
+def make_wheel(wheel_dir: PathPlus, name: str, version: str = "1.0") -> PathPlus:
+	"""
+	Write a minimal, pure-Python wheel for the distribution ``name`` to ``wheel_dir``.
+
+	:param wheel_dir:
+	:param name:
+	:param version:
+	"""
+
+	module = name.replace('-', '_')
+	dist_info = f"{module}-{version}.dist-info"
+
+	files = {
+			f"{module}/__init__.py": f"__version__ = {version!r}\n",
+			f"{dist_info}/METADATA": f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n",
+			f"{dist_info}/WHEEL": (
+					"Wheel-Version: 1.0\nGenerator: bench_devenv\nRoot-Is-Purelib: true\nTag: py3-none-any\n"
+					),
+			}
+
+	record = [f"{filename},{_record_hash(content.encode('UTF-8'))},{len(content)}" for filename, content in files.items()]
+	record.append(f"{dist_info}/RECORD,,")
+
+	wheel_file = wheel_dir / f"{module}-{version}-py3-none-any.whl"
+
+	with zipfile.ZipFile(wheel_file, 'w') as wheel:
+		for filename, content in files.items():
+			wheel.writestr(filename, content)
+		wheel.writestr(f"{dist_info}/RECORD", '\n'.join(record) + '\n')
+
+	return wheel_file
+
+
+def make_project(project_dir: PathPlus, wheel_dir: PathPlus, dependencies: int, extras: int) -> None:
+	"""
+	Write a ``pyproject.toml`` file for a synthetic project, and dummy wheels for its requirements.
+
+	:param project_dir:
+	:param wheel_dir:
+	:param dependencies: The number of dependencies.
+	:param extras: The number of extras, each of which has two requirements of its own.
+	"""
+
+	project_dir.maybe_make(parents=True)
+	wheel_dir.maybe_make(parents=True)
+
+	requirements = [f"bench-dep-{i:04d}" for i in range(dependencies)]
+	optional = {f"extra{i}": [f"bench-extra-{i}-a", f"bench-extra-{i}-b"] for i in range(extras)}
+
+	for name in [*requirements, *(req for reqs in optional.values() for req in reqs)]:
+		if not (wheel_dir / f"{name.replace('-', '_')}-1.0-py3-none-any.whl").is_file():
+			make_wheel(wheel_dir, name)
+
+	lines = [
+			"[project]",
+			f"name = 'bench-{dependencies}-{extras}'",
+			"version = '0.0.0'",
+			"dependencies = [",
+			*(f"    '{req}>=1.0'," for req in requirements),
+			']',
+			'',
+			"[project.optional-dependencies]",
+			*(f"{extra} = {reqs!r}" for extra, reqs in optional.items()),
+			]
+
+	(project_dir / "pyproject.toml").write_lines(lines)
+
+
+class offline_environment:
+	"""
+	Context manager which configures pip to install only from ``wheel_dir``.
+
+	:param wheel_dir:
+	"""
+
+	def __init__(self, wheel_dir: PathPlus):
+		self.environ = {
+				"PIP_NO_INDEX": '1',
+				"PIP_FIND_LINKS": os.fspath(wheel_dir),
+				"PIP_INDEX_URL": '',
+				"PIP_EXTRA_INDEX_URL": '',
+				"PIP_DISABLE_PIP_VERSION_CHECK": '1',
+				}
+		self._saved: Dict[str, Optional[str]] = {}
+
+	def __enter__(self) -> None:
+		for key, value in self.environ.items():
+			self._saved[key] = os.environ.get(key)
+			os.environ[key] = value
+
+	def __exit__(self, *args) -> None:
+		for key, value in self._saved.items():
+			if value is None:
+				os.environ.pop(key, None)
+			else:
+				os.environ[key] = value
+
+
+def _best_of(function: Callable[[], object], repeat: int) -> float:
+	times = []
+
+	for _ in range(repeat):
+		start = time.perf_counter()
+		function()
+		times.append(time.perf_counter() - start)
+
+	return min(times)
+
+
+def _benchmarks(workdir: PathPlus, sizes: List[int], extras: int, repeat: int) -> Iterator[Tuple[str, float]]:
+	wheel_dir = workdir / "wheels"
+
+	for size in sizes:
+		project_dir = workdir / f"project-{size}"
+		make_project(project_dir, wheel_dir, size, extras)
+
+		pyproject_file = project_dir / "pyproject.toml"
+		yield f"load_toml[{size}]", _best_of(lambda: load_toml(pyproject_file, use_cache=False), repeat * 10)
+
+		load_toml(pyproject_file)
+		yield f"load_toml-memory[{size}]", _best_of(lambda: load_toml(pyproject_file), repeat * 10)
+		yield f"load_toml-disk[{size}]", _best_of(
+				lambda: (clear_config_cache(), load_toml(pyproject_file)),
+				repeat * 10,
+				)
+
+		with offline_environment(wheel_dir):
+			yield f"mkdevenv[{size}]", _best_of(
+					lambda: mkdevenv(project_dir, verbosity=0, force=True),
+					1,
+					)
+			yield f"mkdevenv-noop[{size}]", _best_of(lambda: mkdevenv(project_dir, verbosity=0), repeat)
+
+
+def run_benchmarks(sizes: List[int], extras: int = 2, repeat: int = 5) -> Dict[str, float]:
+	"""
+	Run the benchmarks, and return a mapping of benchmark names to the time taken in seconds.
+
+	:param sizes: The numbers of dependencies to generate projects with.
+	:param extras: The number of extras for each project.
+	:param repeat: The number of times to repeat the faster benchmarks. The best time is reported.
+	"""
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		return dict(_benchmarks(PathPlus(tmpdir), sizes, extras, repeat))
+
+
+def _git_revision() -> Optional[str]:
+	try:
+		process = subprocess.run(
+				["git", "rev-parse", "--short", "HEAD"],
+				cwd=HERE,
+				stdout=subprocess.PIPE,
+				stderr=subprocess.DEVNULL,
+				check=True,
+				)
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+	return process.stdout.decode("UTF-8").strip()
+
+
+def compare(
+		current: Dict[str, float],
+		previous: Dict[str, float],
+		threshold: float,
+		) -> Tuple[List[str], List[str]]:
+	"""
+	Compare the results of two runs.
+
+	:param current:
+	:param previous:
+	:param threshold: The fractional slowdown above which a benchmark is considered to have regressed.
+
+	:returns: The lines of a table showing the change for each benchmark, and the names of those which regressed.
+	"""
+
+	width = max(map(len, current))
+	lines = [f"{'Benchmark':<{width}}  {'Time (s)':>10}  {'Previous':>10}  {'Change':>8}"]
+	regressions = []
+
+	for name, seconds in current.items():
+		if name in previous and previous[name]:
+			change = (seconds - previous[name]) / previous[name]
+			lines.append(f"{name:<{width}}  {seconds:>10.4f}  {previous[name]:>10.4f}  {change:>+8.1%}")
+			if change > threshold:
+				regressions.append(name)
+		else:
+			lines.append(f"{name:<{width}}  {seconds:>10.4f}  {'-':>10}  {'-':>8}")
+
+	return lines, regressions
+
+
+@click.option(
+		"--fail-on-regression",
+		is_flag=True,
+		default=False,
+		help="Exit with a non-zero status if any benchmark regressed.",
+		)
+@click.option(
+		"--threshold",
+		type=click.FLOAT,
+		default=0.2,
+		show_default=True,
+		help="The fractional slowdown compared to the previous run which counts as a regression.",
+		)
+@click.option(
+		"--history",
+		type=click.Path(dir_okay=False),
+		default=os.fspath(HERE / "history.jsonl"),
+		show_default=True,
+		help="The file to record results in, one JSON object per line.",
+		)
+@click.option("--repeat", type=click.INT, default=5, show_default=True, help="Repetitions of the faster benchmarks.")
+@click.option("--extras", type=click.INT, default=2, show_default=True, help="The number of extras per project.")
+@click.option(
+		"--sizes",
+		default="10,100,1000",
+		show_default=True,
+		help="Comma-separated numbers of dependencies to generate projects with.",
+		)
+@click.command()
+def main(
+		sizes: str,
+		extras: int,
+		repeat: int,
+		history: str,
+		threshold: float,
+		fail_on_regression: bool,
+		) -> None:
+	"""
+	Benchmark creating devenvs for synthetic projects, offline.
+	"""
+
+	size_list = [int(size) for size in sizes.split(',')]
+	results = run_benchmarks(size_list, extras, repeat)
+
+	entry = {
+			"timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+			"revision": _git_revision(),
+			"pyproject-devenv": __version__,
+			"python": platform.python_version(),
+			"implementation": platform.python_implementation(),
+			"platform": sys.platform,
+			"extras": extras,
+			"results": results,
+			}
+
+	history_file = PathPlus(history)
+	previous: Dict[str, float] = {}
+
+	if history_file.is_file():
+		for line in history_file.read_text().splitlines():
+			if not line.strip():
+				continue
+			old_entry = json.loads(line)
+			if all(old_entry.get(key) == entry[key] for key in ("python", "implementation", "platform", "extras")):
+				previous = old_entry["results"]
+
+	table, regressions = compare(results, previous, threshold)
+	click.echo('\n'.join(table))
+
+	history_file.parent.maybe_make(parents=True)
+	with history_file.open('a') as fp:
+		fp.write(json.dumps(entry) + '\n')
+
+	if regressions:
+		click.echo(f"\nRegressed by more than {threshold:.0%}: {', '.join(regressions)}", err=True)
+		if fail_on_regression:
+			sys.exit(1)
+
+
+if __name__ == "__main__":
+	sys.exit(main())
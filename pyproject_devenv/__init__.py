@@ -27,27 +27,48 @@ Create virtual environments using ``pyproject.toml`` metadata.
 #
 
 # stdlib
+import copy
+import hashlib
+import json
 import os
 import pathlib
+import re
 import shutil
-from typing import Dict, List, Optional, Union
+import sys
+import tempfile
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, ContextManager, Dict, Iterable, List, Mapping, Optional, Sequence, Union
 
 # 3rd party
 import click
-import virtualenv  # type: ignore[import-untyped]
 from domdf_python_tools.paths import PathPlus, traverse_to_file
 from domdf_python_tools.typing import PathLike
 from domdf_python_tools.words import word_join
-from packaging.requirements import Requirement
-from shippinglabel import read_pyvenv
-from virtualenv.run import session_via_cli  # type: ignore[import-untyped]
-from virtualenv.run.session import Session  # type: ignore[import-untyped]
-from virtualenv.seed.wheels import pip_wheel_env_run  # type: ignore[import-untyped]
 
-# this package
-from pyproject_devenv.config import ConfigDict, load_toml
-
-__all__ = ("mkdevenv", "BaseInstallError", "InstallFromFileError", "InstallError")
+if TYPE_CHECKING:
+	# 3rd party
+	from packaging.requirements import Requirement
+	from shippinglabel.requirements import ComparableRequirement
+	from virtualenv.run.session import Session  # type: ignore[import-untyped]
+
+	# this package
+	from pyproject_devenv.config import ConfigDict
+	from pyproject_devenv.installers import Installer
+	from pyproject_devenv.requirements import RequirementConflict
+	from pyproject_devenv.store import PackageStore
+	from pyproject_devenv.timing import Timings
+
+# virtualenv, packaging, shippinglabel and the configuration parser are only imported where they are needed,
+# so that ``--version`` and up-to-date devenvs don't pay for importing them.
+
+__all__ = (
+		"mkdevenv",
+		"BaseInstallError",
+		"InstallFromFileError",
+		"InstallError",
+		"CombinedInstallError",
+		"ConflictError",
+		)
 
 __author__: str = "Dominic Davis-Foster"
 __copyright__: str = "2020-2021 Dominic Davis-Foster"
@@ -55,13 +76,18 @@ __license__: str = "MIT License"
 __version__: str = "0.3.0"
 __email__: str = "dominic@davis-foster.co.uk"
 
-virtualenv_version = tuple(map(int, virtualenv.__version__.split('.')[:3]))
 
-if virtualenv_version >= (20, 4):
-	_pip_wheel_env_run = pip_wheel_env_run
+def pip_wheel_env_run(search_dirs, app_data):  # noqa: MAN001,MAN002
+	# 3rd party
+	import virtualenv  # type: ignore[import-untyped]
+	from virtualenv.seed.wheels import pip_wheel_env_run  # type: ignore[import-untyped]
+
+	virtualenv_version = tuple(map(int, virtualenv.__version__.split('.')[:3]))
 
-	def pip_wheel_env_run(search_dirs, app_data):  # noqa: MAN001,MAN002
-		return _pip_wheel_env_run(search_dirs, app_data, os.environ)
+	if virtualenv_version >= (20, 4):
+		return pip_wheel_env_run(search_dirs, app_data, os.environ)
+	else:  # pragma: no cover
+		return pip_wheel_env_run(search_dirs, app_data)
 
 
 class BaseInstallError(RuntimeError):
@@ -69,15 +95,32 @@ class BaseInstallError(RuntimeError):
 	Base :exc:`Exception` to indicate an error occurred when installing packages.
 	"""
 
+	#: The last lines of the installer's output, if known.
+	output: List[str] = []
+
+
+def _with_output(message: str, output: Sequence[str]) -> str:
+	"""
+	Append the last lines of the installer's output to the message, if there are any.
+	"""
+
+	if not output:
+		return message
+
+	return '\n'.join([message, '', "The last lines of output were:", *(f"    {line}" for line in output)])
+
 
 class InstallFromFileError(BaseInstallError):
 	"""
 	:exc:`Exception` to indicate an error occurred when installing packages from a requirements file.
 
 	:param filename: The file listing the packages to install.
+	:param output: The last lines of the installer's output.
+
+	.. versionchanged:: 0.4.0  Added the ``output`` keyword argument.
 	"""
 
-	def __init__(self, filename: PathLike):
+	def __init__(self, filename: PathLike, *, output: Sequence[str] = ()):
 		if not isinstance(filename, pathlib.Path):
 			filename = PathPlus(filename)
 
@@ -88,7 +131,8 @@ class InstallFromFileError(BaseInstallError):
 		.. latex:clearpage::
 		"""
 
-		super().__init__(f"Could not install from {self.filename!r}")
+		self.output = list(output)
+		super().__init__(_with_output(f"Could not install from {self.filename!r}", self.output))
 
 
 class InstallError(BaseInstallError):
@@ -96,14 +140,132 @@ class InstallError(BaseInstallError):
 	:exc:`Exception` to indicate an error occurred when installing packages.
 
 	:param \*requirements: The requirements being installed.
+	:param output: The last lines of the installer's output.
+
+	.. versionchanged:: 0.4.0  Added the ``output`` keyword argument.
 	"""
 
-	def __init__(self, *requirements: Union[str, Requirement]):
+	def __init__(self, *requirements: Union[str, "Requirement"], output: Sequence[str] = ()):
 		#: The requirements being installed.
 		self.requirements: List[str] = list(map(str, requirements))
+		self.output = list(output)
 
 		requirements_string = word_join(self.requirements, use_repr=True)
-		super().__init__(f"Could not install the given requirements: {requirements_string}")
+		super().__init__(_with_output(f"Could not install the given requirements: {requirements_string}", self.output))
+
+
+#: Patterns matching the requirement which pip or uv could not install, in the last lines of their output.
+_FAILED_REQUIREMENT_PATTERNS = (
+		re.compile(r"satisfies the requirement (\S+)"),
+		re.compile(r"No matching distribution found for (\S+)"),
+		re.compile(r"Failed building wheel for (\S+)"),
+		re.compile(r"there is no version of (\S+)"),
+		re.compile(r"(\S+) was not found in the package registry"),
+		)
+
+_requirement_name_re = re.compile(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+
+def _requirement_name(requirement: str) -> Optional[str]:
+	"""
+	Returns the normalized name of the requirement, or :py:obj:`None` if it doesn't start with one.
+	"""
+
+	# 3rd party
+	from packaging.utils import canonicalize_name
+
+	match = _requirement_name_re.match(requirement.strip("`'\""))
+	if match is None:
+		return None
+
+	return canonicalize_name(match.group(1))
+
+
+def _failed_requirement_names(output: Sequence[str]) -> List[str]:
+	"""
+	Returns the normalized names of the requirements the installer reported it could not install.
+	"""
+
+	names = []
+
+	for line in output:
+		for pattern in _FAILED_REQUIREMENT_PATTERNS:
+			for match in pattern.finditer(line):
+				name = _requirement_name(match.group(1))
+				if name is not None and name not in names:
+					names.append(name)
+
+	return names
+
+
+class CombinedInstallError(InstallError):
+	"""
+	:exc:`Exception` to indicate an error occurred when installing several groups of requirements at once.
+
+	The requirement which failed is found from the installer's output, and mapped back to its group(s).
+
+	:param groups: Mapping of group names (e.g. ``"extra 'doc'"``) to the requirements in that group.
+	:param output: The last lines of the installer's output.
+
+	.. versionadded:: 0.4.0
+	"""
+
+	def __init__(self, groups: Mapping[str, Sequence[Union[str, "Requirement"]]], *, output: Sequence[str] = ()):
+		#: Mapping of group names to the requirements in that group.
+		self.groups: Dict[str, List[str]] = {name: list(map(str, reqs)) for name, reqs in groups.items()}
+
+		#: The requirements being installed.
+		self.requirements: List[str] = [req for reqs in self.groups.values() for req in reqs]
+
+		self.output = list(output)
+
+		failed_names = _failed_requirement_names(self.output)
+
+		#: Mapping of group names to the requirements in that group which the installer could not install.
+		#: Empty if they could not be identified from the installer's output.
+		self.failed_groups: Dict[str, List[str]] = {}
+
+		for name, reqs in self.groups.items():
+			failed = [req for req in reqs if _requirement_name(req) in failed_names]
+			if failed:
+				self.failed_groups[name] = failed
+
+		lines = ["Could not install the given requirements:"]
+		for name, reqs in self.groups.items():
+			lines.append(f"  {name}: {word_join(reqs, use_repr=True)}")
+
+		lines.append('')
+		if self.failed_groups:
+			lines.append("The requirements which could not be installed are in:")
+			for name, reqs in self.failed_groups.items():
+				lines.append(f"  {name}: {word_join(reqs, use_repr=True)}")
+		else:
+			lines.append("Could not tell which requirement failed; it could be in any of the groups above.")
+
+		BaseInstallError.__init__(self, _with_output('\n'.join(lines), self.output))
+
+
+class ConflictError(BaseInstallError):
+	"""
+	:exc:`Exception` to indicate the project's requirements conflict with one another,
+	so could not all be installed.
+
+	:param conflicts:
+
+	.. versionadded:: 0.4.0
+	"""  # noqa: D400
+
+	def __init__(self, conflicts: Sequence["RequirementConflict"]):
+		#: The conflicting requirements.
+		self.conflicts: List["RequirementConflict"] = list(conflicts)
+
+		lines = ["The project's requirements conflict:"]
+		for conflict in self.conflicts:
+			lines.append(f"  {conflict.name} ({conflict.reason}):")
+			for group, reqs in conflict.requirements.items():
+				lines.append(f"    {group}: {word_join(reqs, use_repr=True)}")
+
+		super().__init__('\n'.join(lines))
 
 
 class _Devenv:
@@ -117,6 +279,28 @@ class _Devenv:
 	:param verbosity: The verbosity of the function. ``0`` = quiet, ``2`` = very verbose.
 	:param upgrade: Whether to upgrade all specified packages to the newest available version.
 	:param python: Path to the Python interpreter to use (e.g. a version of CPython, PyPy, RustPython, GraalPython).
+	:param combine: Whether to install all groups of requirements with a single invocation of pip.
+	:param force: Recreate the devenv even if its :meth:`~._Devenv.fingerprint` shows it is up to date.
+	:param prune: When syncing, uninstall distributions which are not required by the project.
+	:param locked: Install the exact versions recorded in the project's lockfile, without resolving dependencies.
+	:param golden: Clone the devenv from a cached "golden" virtualenv with the same requirements, if there is one,
+		and otherwise add the newly created devenv to the cache.
+	:param pip_cache_dir: The cache directory for the installer to use, e.g. to share downloaded and built wheels
+		between devenvs. By default the installer's own cache directory is used.
+	:param timings: Records the time taken by each phase of creating the devenv.
+	:param installer: The name of the installer backend to use (see :mod:`pyproject_devenv.installers`),
+		or ``'auto'`` to use uv if it is available.
+	:param seeder: How to install pip, setuptools and wheel into the new virtualenv.
+		See :meth:`~._Devenv.seeder_args`.
+	:param extras: The extras to install. By default all of the project's extras are installed.
+	:param project: Whether to install the project's requirements.
+	:param tests: Whether to install the test requirements.
+	:param build: Whether to install the build requirements.
+	:param log_file: If given, the full output of the installer is appended to this file.
+	:param editable: Whether to install the project itself in editable mode (:pep:`660`).
+		See :attr:`~._Devenv.build_isolation`.
+	:param store: Whether to link distributions from the :attr:`~._Devenv.package_store` where possible,
+		and add those installed by pip to it.
 	"""
 
 	def __init__(
@@ -127,16 +311,233 @@ class _Devenv:
 			verbosity: int = 1,
 			upgrade: bool = False,
 			python: Optional[str] = None,
+			combine: bool = False,
+			force: bool = False,
+			prune: bool = False,
+			locked: bool = False,
+			golden: bool = False,
+			pip_cache_dir: Optional[PathLike] = None,
+			timings: Optional["Timings"] = None,
+			installer: str = "pip",
+			seeder: str = "pip",
+			extras: Optional[Iterable[str]] = None,
+			project: bool = True,
+			tests: bool = True,
+			build: bool = True,
+			log_file: Optional[PathLike] = None,
+			editable: bool = False,
+			store: bool = False,
 			):
 		self.project_dir: PathPlus = self.determine_project_dir(project_dir)
-		self.config: ConfigDict = self.load_config()
 		self.venv_dir = self.project_dir / venv_dir
 		self.verbosity: int = int(verbosity)
 		self.upgrade: bool = upgrade
 		self.python: Optional[str] = python
+		self.combine: bool = combine
+		self.force: bool = force
+		self.prune: bool = prune
+		self.locked: bool = locked
+		self.golden: bool = golden
+		self.pip_cache_dir: Optional[PathLike] = pip_cache_dir
+		self.timings: Optional["Timings"] = timings
+		self.extras: Optional[List[str]] = None if extras is None else sorted(set(extras))
+		self.project: bool = project
+		self.tests: bool = tests
+		self.build: bool = build
+		self.log_file: Optional[PathLike] = log_file
+		self.editable: bool = editable
+		self.store: bool = store
+
+		# this package
+		from pyproject_devenv.installers import installers
+
+		if installer != "auto" and installer not in installers:
+			raise ValueError(f"Unknown installer {installer!r}")
+
+		self.installer: str = installer
+
+		if store and installer == "uv":
+			raise ValueError("The package store can't be used with the 'uv' installer.")
+
+		if seeder not in {"pip", "app-data"}:
+			raise ValueError(f"Unknown seeder {seeder!r}")
+
+		self.seeder: str = seeder
+		self._installer_backend: Optional["Installer"] = None
+
+		# The configuration is loaded on first use, so that up-to-date devenvs don't pay for parsing it.
+		self._config: Optional["ConfigDict"] = None
+		self._extras_to_install: Optional[List[str]] = None
+		self._marker_environment: Optional[Dict[str, str]] = None
+		self._fingerprint: Optional[str] = None
+
+	@property
+	def config(self) -> "ConfigDict":
+		"""
+		The project's configuration, as returned by :meth:`~._Devenv.load_config`.
+		"""
+
+		if self._config is None:
+			with self.phase("config"):
+				self._config = self.load_config()
+
+		return self._config
 
-		# TODO: config option
-		self.extras_to_install = sorted(self.config["optional_dependencies"])
+	@config.setter
+	def config(self, value: "ConfigDict") -> None:
+		self._config = value
+
+	def reset(self) -> None:
+		"""
+		Forget the configuration, fingerprint and selected extras, so they are determined again on next use.
+
+		Call this after the project's ``pyproject.toml`` or requirements files change.
+		The interpreter and installer are kept.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		self._config = None
+		self._extras_to_install = None
+		self._fingerprint = None
+
+	@property
+	def installer_backend(self) -> "Installer":
+		"""
+		The backend used to install requirements, as selected by :attr:`~._Devenv.installer`.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if self._installer_backend is None:
+			# this package
+			from pyproject_devenv.installers import get_installer
+			from pyproject_devenv.output import StreamedOutput
+
+			self._installer_backend = get_installer(
+					self.installer,
+					verbosity=self.verbosity,
+					cache_dir=self.pip_cache_dir,
+					output=StreamedOutput(log_file=self.log_file),
+					)
+
+		return self._installer_backend
+
+	@property
+	def extras_to_install(self) -> List[str]:
+		"""
+		The extras to install.
+
+		:raises: :exc:`dom_toml.parser.BadConfigError` if the project does not have one of the selected extras.
+		"""
+
+		if self._extras_to_install is None:
+			if self.extras is None:
+				self._extras_to_install = sorted(self.config["optional_dependencies"])
+			else:
+				# 3rd party
+				from dom_toml.parser import BadConfigError
+
+				for extra in self.extras:
+					if extra not in self.config["optional_dependencies"]:
+						raise BadConfigError(f"The project has no extra named {extra!r}")
+
+				self._extras_to_install = list(self.extras)
+
+		return self._extras_to_install
+
+	@extras_to_install.setter
+	def extras_to_install(self, value: List[str]) -> None:
+		self._extras_to_install = value
+
+	@property
+	def marker_environment(self) -> Dict[str, str]:
+		"""
+		The environment used to evaluate markers, for the interpreter the devenv is created with.
+
+		The interpreter is looked up once, and never started.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if self._marker_environment is None:
+			# this package
+			from pyproject_devenv.discovery import find_interpreter, marker_environment
+
+			self._marker_environment = marker_environment(find_interpreter(self.python))
+
+		return self._marker_environment
+
+	def applicable_requirements(self, requirements: Iterable["Requirement"]) -> List["Requirement"]:
+		"""
+		Returns the requirements whose markers apply to the devenv's interpreter, with the markers removed.
+
+		:param requirements:
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.requirements import evaluate_marker
+
+		applicable = []
+
+		for requirement in requirements:
+			if requirement.marker is None:
+				applicable.append(requirement)
+			elif evaluate_marker(requirement, self.marker_environment):
+				requirement = copy.copy(requirement)
+				requirement.marker = None
+				applicable.append(requirement)
+
+		return applicable
+
+	@property
+	def test_requirements_file(self) -> Optional[PathPlus]:
+		"""
+		The file to install the test requirements from,
+		or :py:obj:`None` if the project has none or they are not to be installed.
+
+		.. versionadded:: 0.4.0
+		"""  # noqa: D400
+
+		# TODO: config option for tests dir
+		test_requirements_file = self.project_dir / "tests" / "requirements.txt"
+
+		if self.tests and test_requirements_file.is_file():
+			return test_requirements_file
+		else:
+			return None
+
+	@property
+	def package_store(self) -> "PackageStore":
+		"""
+		The content-addressed store of installed distributions which is used if ``store`` is :py:obj:`True`.
+
+		It is kept in the ``store`` directory of :func:`~pyproject_devenv.cache.cache_dir`.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.cache import cache_dir
+		from pyproject_devenv.store import PackageStore
+
+		return PackageStore(cache_dir() / "store")
+
+	@property
+	def build_isolation(self) -> bool:
+		"""
+		Whether pip builds sdists and the project in isolated build environments.
+
+		When the project is installed in editable mode and the build requirements are installed,
+		the build requirements are installed first and builds then use them from the devenv,
+		rather than pip installing them again into a temporary environment for each build.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		return not (self.editable and self.build)
 
 	@staticmethod
 	def determine_project_dir(project_dir: PathLike) -> PathPlus:
@@ -150,24 +551,147 @@ class _Devenv:
 
 		return traverse_to_file(PathPlus(project_dir), "pyproject.toml")
 
-	def load_config(self) -> ConfigDict:
+	def phase(self, name: str) -> ContextManager[None]:
+		"""
+		Context manager which records the time taken by its body in :attr:`~._Devenv.timings`, if set.
+
+		:param name: The name of the phase.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if self.timings is None:
+			return nullcontext()
+		else:
+			return self.timings.phase(name)
+
+	def load_config(self) -> "ConfigDict":
 		"""
 		Load the configuration.
 
 		Subclasses may override this method to customise the behaviour.
 		"""
 
+		# this package
+		from pyproject_devenv.config import load_toml
+
 		return load_toml(self.project_dir / "pyproject.toml")
 
+	def fingerprint(self) -> str:
+		"""
+		Returns a fingerprint of the inputs used to create the devenv.
+
+		The fingerprint covers the ``[project]`` and ``[build-system]`` tables from ``pyproject.toml``,
+		``requirements.txt``, ``tests/requirements.txt``, the lockfile (when ``locked`` is :py:obj:`True`),
+		the target interpreter, the selected groups of requirements,
+		and the version of ``pyproject-devenv``.
+
+		Subclasses may override this method to customise the behaviour.
+		"""
+
+		if self._fingerprint is not None:
+			return self._fingerprint
+
+		# 3rd party
+		import dom_toml
+
+		pyproject = dom_toml.load(self.project_dir / "pyproject.toml")
+
+		inputs = {
+				"pyproject-devenv": __version__,
+				"project": pyproject.get("project"),
+				"build-system": pyproject.get("build-system"),
+				"python": _interpreter_identity(self.python),
+				"locked": self.locked,
+				"groups": {"extras": self.extras, "project": self.project, "tests": self.tests, "build": self.build},
+				"editable": self.editable,
+				}
+
+		if self.locked:
+			# this package
+			from pyproject_devenv.lock import LOCKFILE_NAME
+
+			lockfile = self.project_dir / LOCKFILE_NAME
+			inputs[LOCKFILE_NAME] = hashlib.sha256(lockfile.read_bytes()).hexdigest() if lockfile.is_file() else None
+
+		for filename in ("requirements.txt", "tests/requirements.txt"):
+			file = self.project_dir / filename
+			if file.is_file():
+				inputs[filename] = hashlib.sha256(file.read_bytes()).hexdigest()
+			else:
+				inputs[filename] = None
+
+		serialised = json.dumps(inputs, sort_keys=True, default=str)
+		self._fingerprint = hashlib.sha256(serialised.encode("UTF-8")).hexdigest()
+		return self._fingerprint
+
+	def is_up_to_date(self) -> bool:
+		"""
+		Returns whether the devenv already exists and was created from the same inputs.
+
+		This compares :meth:`~._Devenv.fingerprint` with the one recorded in ``pyvenv.cfg``.
+		"""
+
+		if not (self.venv_dir / "pyvenv.cfg").is_file():
+			return False
+
+		# Read directly rather than with shippinglabel.read_pyvenv, which is slow to import,
+		# as this is all that's needed when the devenv is already up to date.
+		for line in (self.venv_dir / "pyvenv.cfg").read_lines():
+			key, _, value = line.partition(" = ")
+			if key == "pyproject-devenv-fingerprint":
+				return value == self.fingerprint()
+
+		return False
+
 	def create(self) -> int:
+		"""
+		Create the devenv, unless it is already up to date.
+
+		Afterwards, as creating the devenv may have added to the caches, old entries are evicted from them
+		if they weren't pruned recently. See :func:`pyproject_devenv.cache.auto_prune`.
+
+		:returns: The exit code.
+		"""
+
+		# With upgrade the requirements are always reinstalled, as newer versions may have been released.
+		if not (self.force or self.upgrade):
+			with self.phase("fingerprint"):
+				up_to_date = self.is_up_to_date()
+
+			if up_to_date:
+				if self.verbosity:
+					click.echo(f"The devenv in {self.venv_dir.as_posix()!r} is already up to date.")
+				return 0
+
+		ret = self._create()
+
+		# this package
+		from pyproject_devenv.cache import auto_prune, auto_prune_due
+
+		if auto_prune_due():
+			with self.phase("cache:prune"):
+				auto_prune()
+
+		return ret
+
+	def _create(self) -> int:
+		if not self.locked:
+			self.check_requirements()
+
+		if self.golden and not self.upgrade:
+			with self.phase("golden:clone"):
+				cloned = self.clone_golden_venv()
+
+			if cloned:
+				with self.phase("update_pyvenv"):
+					self.update_pyvenv()
+				return 0
 
 		args = [
 				str(self.venv_dir),
 				"--prompt",
 				f"{self.config['name']}",
-				"--seeder",
-				"pip",
-				"--download",
 				]
 
 		if self.verbosity:
@@ -176,50 +700,310 @@ class _Devenv:
 			args.append("--verbose")
 
 		if self.python:
+			# this package
+			from pyproject_devenv.discovery import find_interpreter
+
+			# The interpreter found previously is reused, and find_interpreter() has given virtualenv
+			# the cached information about it, so virtualenv neither searches for it nor starts it again.
 			args.append("--python")
-			args.append(self.python)
+			args.append(find_interpreter(self.python).executable)
+
+		if self.seeder == "app-data":
+			try:
+				of_session = self._create_session([*args, *self.seeder_args("app-data")])
+			except Exception as e:  # pylint: disable=broad-except
+				# virtualenv can fail in many ways if the app-data cache is unusable, but pip can still seed it.
+				click.echo(f"Could not seed the virtualenv from the app-data cache ({e}); using pip instead.", err=True)
+				of_session = self._create_session([*args, *self.seeder_args("pip"), "--clear"])
+		else:
+			of_session = self._create_session([*args, *self.seeder_args("pip")])
+
+		if of_session is None:  # pragma: no cover
+			return 1
+
+		if self._marker_environment is None:
+			# this package
+			from pyproject_devenv.discovery import marker_environment
+
+			self._marker_environment = marker_environment(of_session.interpreter)
+
+		pip_env = pip_wheel_env_run(of_session.seeder.extra_search_dir, of_session.seeder.app_data)
+
+		with self.installer_backend.session(of_session.creator.exe, pip_env):
+			if self.locked:
+				with self.phase("install:locked"):
+					self.install_locked_requirements(of_session)
+			elif self.combine:
+				with self.phase("install:combined"):
+					self.install_combined_requirements(of_session)
+			else:
+				if not self.build_isolation:
+					# The build requirements are needed to build sdists in the other groups.
+					with self.phase("install:build"):
+						self.install_build_requirements(of_session)
+
+				if self.project:
+					with self.phase("install:project"):
+						self.install_project_requirements(of_session)
 
-		of_session = session_via_cli(args)
+				with self.phase("install:extras"):
+					self.install_extra_requirements(of_session)
+
+				if self.test_requirements_file is not None:
+					with self.phase("install:tests"):
+						self.install_test_requirements(of_session)
+
+				if self.build and self.build_isolation:
+					with self.phase("install:build"):
+						self.install_build_requirements(of_session)
+
+			if self.editable:
+				with self.phase("install:editable"):
+					self.install_editable(of_session.creator.exe)
+
+		if self.verbosity:
+			click.echo()
+
+		with self.phase("update_pyvenv"):
+			self.update_pyvenv()
+
+		if self.golden and not self.upgrade:
+			with self.phase("golden:store"):
+				self.store_golden_venv()
+
+		return 0
+
+	@staticmethod
+	def seeder_args(seeder: str) -> List[str]:
+		"""
+		Returns the arguments for ``virtualenv`` to seed the devenv with pip, setuptools and wheel.
+
+		:param seeder: ``'pip'`` to install the latest versions with pip, or ``'app-data'`` to link the versions
+			bundled with virtualenv from its app-data cache, without accessing the network.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if seeder == "app-data":
+			args = ["--seeder", "app-data", "--no-download", "--no-periodic-update"]
+			if sys.platform != "win32":
+				args.append("--symlink-app-data")
+			return args
+		else:
+			return ["--seeder", "pip", "--download"]
+
+	def _create_session(self, args: List[str]) -> Optional["Session"]:
+		"""
+		Create and seed the virtualenv with the given ``virtualenv`` arguments.
+
+		:returns: The virtualenv session, or :py:obj:`None` if seeding is disabled.
+		"""
+
+		# 3rd party
+		from virtualenv.run import session_via_cli  # type: ignore[import-untyped]
+
+		# Finds the interpreter and prepares the creator and seeder.
+		with self.phase("discovery"):
+			of_session = session_via_cli(args)
 
 		if not of_session.seeder.enabled:  # pragma: no cover
-			return 1
+			return None
 
-		with of_session:
+		with of_session, self.phase("seed"):
 			of_session.run()
 
-		self.install_project_requirements(of_session)
+		return of_session
 
-		self.install_extra_requirements(of_session)
+	def golden_venv_dir(self) -> PathPlus:
+		"""
+		Returns the directory of the cached "golden" virtualenv for this devenv.
 
-		# TODO: config option for tests dir
-		if (self.project_dir / "tests" / "requirements.txt").is_file():
-			self.install_test_requirements(of_session)
+		The directory name is a hash of the project name, the requirements which would be installed
+		(after evaluating their markers), the target interpreter and the version of ``pyproject-devenv``.
+
+		.. versionadded:: 0.4.0
+		"""
 
-		self.install_build_requirements(of_session)
+		# this package
+		from pyproject_devenv.cache import cache_dir
+
+		inputs = {
+				"pyproject-devenv": __version__,
+				"name": self.config["name"],
+				"requirements": sorted(map(str, self.applicable_requirements(self.all_requirements()))),
+				"python": _interpreter_identity(self.python),
+				# Editable installs point to the project's directory.
+				"editable": self.project_dir.as_posix() if self.editable else None,
+				}
+
+		if self.locked:
+			# this package
+			from pyproject_devenv.lock import LOCKFILE_NAME
+
+			inputs[LOCKFILE_NAME] = hashlib.sha256((self.project_dir / LOCKFILE_NAME).read_bytes()).hexdigest()
+
+		key = hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("UTF-8")).hexdigest()
+		return cache_dir() / "golden" / key
+
+	def clone_golden_venv(self) -> bool:
+		"""
+		Create the devenv by cloning the cached "golden" virtualenv, if there is one.
+
+		Files are reflinked where the filesystem supports it, and hardlinked otherwise.
+		Files which contain the virtualenv's path are copied and updated.
+
+		:returns: Whether the golden virtualenv was found and cloned.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.cache import touch
+		from pyproject_devenv.relocate import clone_venv
+
+		golden_dir = self.golden_venv_dir()
+
+		if not (golden_dir / "pyvenv.cfg").is_file():
+			return False
+
+		self.report_installing("from cached virtualenv")
+
+		tmp_dir = self.venv_dir.parent / f".{self.venv_dir.name}.pyproject-devenv-tmp"
+		if tmp_dir.exists():  # pragma: no cover
+			shutil.rmtree(tmp_dir)
+
+		clone_venv(golden_dir, tmp_dir, new_prefix=self.venv_dir)
+		touch(golden_dir)
+
+		if self.venv_dir.exists():
+			old_dir = self.venv_dir.parent / f".{self.venv_dir.name}.pyproject-devenv-old"
+			os.replace(self.venv_dir, old_dir)
+			os.replace(tmp_dir, self.venv_dir)
+			shutil.rmtree(old_dir)
+		else:
+			os.replace(tmp_dir, self.venv_dir)
 
 		if self.verbosity:
 			click.echo()
 
-		self.update_pyvenv()
+		return True
 
-		return 0
+	def store_golden_venv(self) -> None:
+		"""
+		Add the devenv to the cache of "golden" virtualenvs, unless there is one with the same requirements already.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.relocate import clone_venv
+
+		golden_dir = self.golden_venv_dir()
+
+		if golden_dir.exists():
+			return
+
+		golden_dir.parent.maybe_make(parents=True)
+		tmp_dir = golden_dir.parent / f".{golden_dir.name}.{os.getpid()}"
+		clone_venv(self.venv_dir, tmp_dir, new_prefix=golden_dir)
+
+		try:
+			os.rename(tmp_dir, golden_dir)
+		except OSError:  # pragma: no cover
+			# Another process got there first.
+			shutil.rmtree(tmp_dir)
 
-	def install_project_requirements(self, of_session: Session) -> None:
+	def archive_path(self, archive_dir: PathLike) -> PathPlus:
+		"""
+		Returns the path of the archive of the devenv in ``archive_dir``, which is named after its fingerprint.
+
+		An editable install refers to the project directory, so if ``editable`` is :py:obj:`True`
+		the name also includes a hash of the project's location, and the archive can only be
+		unpacked for a project in the same place.
+
+		:param archive_dir:
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if self.editable:
+			location = hashlib.sha256(os.fsencode(self.project_dir)).hexdigest()[:16]
+			return PathPlus(archive_dir) / f"{self.fingerprint()}-{location}.zip"
+
+		return PathPlus(archive_dir) / f"{self.fingerprint()}.zip"
+
+	def pack(self, archive_dir: PathLike) -> PathPlus:
+		"""
+		Pack the devenv into a relocatable archive in ``archive_dir`` (see :mod:`pyproject_devenv.pack`).
+
+		The archive is named after the fingerprint, which must match the one recorded in the devenv,
+		so the archive can later be found and unpacked with :meth:`~._Devenv.unpack`.
+
+		:param archive_dir:
+
+		:returns: The path to the archive.
+
+		:raises: :exc:`ValueError` if the devenv doesn't exist or is out of date.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.pack import pack_venv
+
+		if not self.is_up_to_date():
+			raise ValueError(
+					f"The devenv in {self.venv_dir.as_posix()!r} is missing or out of date. "
+					"Run 'pyproject-devenv --sync' first."
+					)
+
+		archive = self.archive_path(archive_dir)
+		archive.parent.maybe_make(parents=True)
+
+		with self.phase("pack"):
+			return pack_venv(self.venv_dir, archive, fingerprint=self.fingerprint())
+
+	def unpack(self, archive_dir: PathLike, *, jobs: Optional[int] = None) -> bool:
+		"""
+		Restore the devenv from the archive in ``archive_dir`` with the same fingerprint, if there is one.
+
+		Any existing devenv is replaced.
+
+		:param archive_dir:
+		:param jobs: The number of threads to unpack the archive with.
+
+		:returns: Whether the archive was found and unpacked.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.pack import unpack_venv
+
+		archive = self.archive_path(archive_dir)
+
+		if not archive.is_file():
+			return False
+
+		with self.phase("unpack"):
+			unpack_venv(archive, self.venv_dir, jobs=jobs)
+
+		return True
+
+	def install_project_requirements(self, of_session: "Session") -> None:
 		"""
 		Install the project's requirements/dependencies.
 
 		:param of_session:
 		"""
 
-		if self.config["dependencies"]:
-			self.report_installing("project requirements")
+		requirements = self.applicable_requirements(self.config["dependencies"])
 
-			self.install_requirements(
-					of_session,
-					*self.config["dependencies"],
-					)
+		if requirements:
+			self.report_installing("project requirements")
+			self.install_requirements(of_session, *requirements)
 
-	def install_extra_requirements(self, of_session: Session) -> None:
+	def install_extra_requirements(self, of_session: "Session") -> None:
 		"""
 		Install the project's extra-requirements/optional-dependencies.
 
@@ -227,14 +1011,14 @@ class _Devenv:
 		"""
 
 		for extra in self.extras_to_install:
-			extra_requirements = self.config["optional_dependencies"][extra]
+			extra_requirements = self.applicable_requirements(self.config["optional_dependencies"][extra])
 			if not extra_requirements:
 				continue
 
 			self.report_installing(f"extra {extra!r}")
 			self.install_requirements(of_session, *extra_requirements)
 
-	def install_test_requirements(self, of_session: Session) -> None:
+	def install_test_requirements(self, of_session: "Session") -> None:
 		"""
 		Install the project's test requirements.
 
@@ -248,21 +1032,185 @@ class _Devenv:
 				requirements_file=self.project_dir / "tests" / "requirements.txt",
 				)
 
-	def install_build_requirements(self, of_session: Session) -> None:
+	def install_build_requirements(self, of_session: "Session") -> None:
 		"""
 		Install the project's build requirements.
 
 		:param of_session:
 		"""
 
-		if self.config["build_dependencies"] is not None:
+		requirements = self.applicable_requirements(self.config["build_dependencies"] or [])
+
+		if requirements:
 			self.report_installing("build requirements")
+			self.install_requirements(of_session, *requirements)
+
+	def install_combined_requirements(self, of_session: "Session") -> None:
+		"""
+		Install the project's requirements, extras, test requirements and build requirements
+		with a single invocation of pip.
+
+		This means pip's resolver only has to run once, rather than once per group.
+
+		:param of_session:
+
+		:raises: :exc:`~.CombinedInstallError` if the requirements could not be installed.
+		"""  # noqa: D400
+
+		# 3rd party
+		from shippinglabel.requirements import read_requirements
+
+		groups: Dict[str, Sequence["Requirement"]] = {}
+
+		if self.project:
+			groups["project requirements"] = self.applicable_requirements(self.config["dependencies"])
+
+		for extra in self.extras_to_install:
+			groups[f"extra {extra!r}"] = self.applicable_requirements(self.config["optional_dependencies"][extra])
+
+		if not self.build_isolation:
+			# The build requirements are needed to build sdists in the other groups.
+			self.install_build_requirements(of_session)
+		elif self.build:
+			groups["build requirements"] = self.applicable_requirements(self.config["build_dependencies"] or [])
+
+		groups = {name: requirements for name, requirements in groups.items() if requirements}
+
+		requirements_files = []
+		test_requirements_file = self.test_requirements_file
+		if test_requirements_file is not None:
+			requirements_files.append(test_requirements_file)
+
+		if not groups and not requirements_files:
+			return
+
+		names = list(groups)
+		if requirements_files:
+			names.append("test requirements")
+		self.report_installing(word_join(names))
+
+		requirements: Dict[str, "Requirement"] = {}
+		for group_requirements in groups.values():
+			for req in group_requirements:
+				requirements.setdefault(str(req), req)
+
+		try:
+			self._run_pip_install(of_session, requirements.values(), requirements_files)
+		except RuntimeError:
+			if test_requirements_file is not None:
+				test_requirements = read_requirements(test_requirements_file, include_invalid=True)[0]
+				groups["test requirements"] = sorted(test_requirements)
+			raise CombinedInstallError(groups, output=self.installer_backend.output.tail)
+
+	def install_locked_requirements(self, of_session: "Session") -> None:
+		"""
+		Install the versions of the project's requirements recorded in the lockfile.
 
-			self.install_requirements(
-					of_session,
-					*self.config["build_dependencies"],
+		The requirements are installed with ``pip install --no-deps``, as the lockfile already
+		includes every dependency, so pip's resolver doesn't need to run.
+
+		:param of_session:
+
+		:raises: :exc:`dom_toml.parser.BadConfigError` if the lockfile is missing or out of date,
+			or was created for a different interpreter or platform.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		requirements = self.locked_requirements()
+
+		if not requirements:
+			return
+
+		self.report_installing("locked requirements")
+
+		self._install_locked(
+				of_session.creator.exe,
+				requirements,
+				pip_wheel_env_run(of_session.seeder.extra_search_dir, of_session.seeder.app_data),
+				)
+
+	def locked_requirements(self) -> List[str]:
+		"""
+		Returns the pinned requirement lines from the lockfile for the selected groups of requirements.
+
+		:raises: :exc:`dom_toml.parser.BadConfigError` if the lockfile is missing or out of date,
+			or was created for a different interpreter or platform.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# 3rd party
+		from dom_toml.parser import BadConfigError
+
+		# this package
+		from pyproject_devenv.lock import (
+				LOCKFILE_NAME,
+				check_environment,
+				load_lockfile,
+				locked_requirements,
+				requirements_hash
+				)
+
+		lockfile_path = self.project_dir / LOCKFILE_NAME
+		lockfile = load_lockfile(lockfile_path)
+
+		if lockfile["requirements-hash"] != requirements_hash(self):
+			raise BadConfigError(
+					f"The lockfile {lockfile_path.as_posix()!r} is out of date. Run 'pyproject-devenv lock' to update it."
 					)
 
+		check_environment(lockfile, self.marker_environment)
+
+		return locked_requirements(
+				lockfile,
+				project=self.project,
+				extras=self.extras_to_install,
+				tests=self.test_requirements_file is not None,
+				build=self.build,
+				)
+
+	def _install_locked(self, executable: PathLike, requirements: List[str], env: Mapping[str, str]) -> None:
+		# this package
+		from pyproject_devenv.lock import LOCKFILE_NAME
+
+		with tempfile.TemporaryDirectory() as tmpdir:
+			requirements_file = PathPlus(tmpdir) / "requirements.txt"
+			requirements_file.write_lines(requirements)
+
+			# The lockfile already includes every dependency, so pip's resolver doesn't need to run.
+			try:
+				self._install(executable, ["-r", str(requirements_file)], ["--no-deps"], env)
+			except RuntimeError:  # pragma: no cover
+				raise InstallFromFileError(
+						self.project_dir / LOCKFILE_NAME,
+						output=self.installer_backend.output.tail,
+						)
+
+	def install_editable(self, executable: PathLike) -> None:
+		"""
+		Install the project itself in editable mode (:pep:`660`).
+
+		Its requirements are not installed, as they are installed separately.
+
+		:param executable: The devenv's Python executable.
+
+		:raises: :exc:`~.InstallError` if the project could not be installed.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		self.report_installing(f"{self.config['name']} in editable mode")
+
+		args = ["install", "--no-deps", "--editable", self.project_dir.as_posix()]
+		if not self.build_isolation:
+			args.append("--no-build-isolation")
+
+		try:
+			self._run_pip(executable, args, os.environ)
+		except RuntimeError:  # pragma: no cover
+			raise InstallError(f"-e {self.project_dir.as_posix()}", output=self.installer_backend.output.tail)
+
 	def report_installing(self, what: str) -> None:
 		"""
 		Report that a category of requirements is being installed.
@@ -292,8 +1240,8 @@ class _Devenv:
 
 	def install_requirements(
 			self,
-			session: Session,
-			*requirements: Union[str, Requirement],
+			session: "Session",
+			*requirements: Union[str, "Requirement"],
 			requirements_file: Optional[PathLike] = None,
 			) -> None:
 		r"""
@@ -309,55 +1257,371 @@ class _Devenv:
 		if requirements and requirements_file:
 			raise TypeError("'*requirements' and 'requirements_file' are mutually exclusive.")
 
-		cmd = [
+		try:
+			self._run_pip_install(session, requirements, [requirements_file] if requirements_file else [])
+		except RuntimeError:  # pragma: no cover
+			if requirements_file:
+				raise InstallFromFileError(requirements_file, output=self.installer_backend.output.tail)
+			else:
+				raise InstallError(*requirements, output=self.installer_backend.output.tail)
+
+	def _run_pip_install(
+			self,
+			session: "Session",
+			requirements: Iterable[Union[str, "Requirement"]],
+			requirements_files: Iterable[PathLike] = (),
+			) -> None:
+		"""
+		Run ``pip install`` in the virtualenv.
+
+		:param session:
+		:param requirements: The requirements to install.
+		:param requirements_files: Files to install requirements from, with ``pip install -r <filename>``.
+
+		:raises: :exc:`RuntimeError` if pip exits with a non-zero status.
+		"""
+
+		args = []
+
+		for requirements_file in requirements_files:
+			args.append("-r")
+			args.append(str(requirements_file))
+
+		args.extend(map(str, requirements))
+
+		self._install(
 				session.creator.exe,
-				"-m",
-				"pip",
-				"install",
-				"--disable-pip-version-check",
-				]
+				args,
+				self.install_options(),
+				pip_wheel_env_run(session.seeder.extra_search_dir, session.seeder.app_data),
+				)
 
-		if requirements_file:
-			cmd.append("-r")
-			cmd.append(str(requirements_file))
-		else:
-			cmd.extend(map(str, requirements))
+	def install_options(self) -> List[str]:
+		"""
+		Returns the options passed to ``pip install`` for every group of requirements.
+
+		.. versionadded:: 0.4.0
+		"""
 
-		if self.verbosity < 1:
-			cmd.append("--quiet")
-		elif self.verbosity > 1:
-			cmd.append("--verbose")
+		options = []
 
 		if self.upgrade:
-			cmd.append("--upgrade")
+			options.append("--upgrade")
+		if not self.build_isolation:
+			options.append("--no-build-isolation")
 
-		try:
-			session.seeder._execute(
-					[str(x) for x in cmd],
-					pip_wheel_env_run(session.seeder.extra_search_dir, session.seeder.app_data),
+		return options
+
+	def _install(
+			self,
+			executable: PathLike,
+			requirements: List[str],
+			options: List[str],
+			env: Mapping[str, str],
+			) -> None:
+		"""
+		Run ``pip install``, linking the distributions which are in the package store if ``store`` is :py:obj:`True`.
+
+		:param executable: The Python executable to run pip with.
+		:param requirements: The requirements to install, including ``-r <filename>`` arguments.
+		:param options: Other arguments for ``pip install``, such as ``--upgrade``.
+		:param env: The environment variables for the subprocess.
+
+		:raises: :exc:`RuntimeError` if pip exits with a non-zero status.
+		"""
+
+		if not self.store:
+			self._run_pip(executable, ["install", *requirements, *options], env)
+			return
+
+		# 3rd party
+		from packaging.utils import canonicalize_name
+
+		# this package
+		from pyproject_devenv.discovery import find_interpreter, interpreter_tag
+		from pyproject_devenv.requirements import inspect_venv
+		from pyproject_devenv.store import read_install_report
+
+		if self.installer_backend.name == "uv":
+			raise ValueError("The package store can't be used with the 'uv' installer.")
+
+		interpreter = find_interpreter(self.python)
+		tag = interpreter_tag(interpreter)
+
+		with tempfile.TemporaryDirectory() as tmpdir:
+			report_file = os.path.join(tmpdir, "report.json")
+			self._run_pip(
+					executable,
+					["install", "--dry-run", "--quiet", "--report", report_file, *requirements, *options],
+					env,
 					)
-		except RuntimeError:  # pragma: no cover
-			if requirements_file:
-				raise InstallFromFileError(requirements_file)
+			items = read_install_report(report_file)
+
+		hits = [item for item in items if item.sha256 is not None and self.package_store.has(tag, item.sha256)]
+		misses = [item for item in items if item not in hits]
+
+		if hits:
+			installed = inspect_venv(executable).distributions
+			outdated = [item.name for item in hits if canonicalize_name(item.name) in installed]
+			if outdated:
+				self._run_pip(executable, ["uninstall", "--yes", *outdated], env)
+
+			for item in hits:
+				self.package_store.link(tag, item.sha256, self.venv_dir, requested=item.requested)  # type: ignore[arg-type]
+
+			if self.verbosity:
+				click.echo(f"Linked {word_join([f'{item.name}-{item.version}' for item in hits])} from the package store")
+
+		if misses:
+			# The dependencies were resolved by the dry run.
+			self._run_pip(
+					executable,
+					["install", "--no-deps", *(item.requirement for item in misses), *options],
+					env,
+					)
+
+			site_packages = interpreter.install_path("purelib")
+			for item in misses:
+				if item.sha256 is not None:
+					self.package_store.add(tag, item.sha256, self.venv_dir, site_packages, item.name, item.version)
+
+	def _run_pip(self, executable: PathLike, args: List[str], env: Mapping[str, str]) -> None:
+		"""
+		Run pip, or the selected :attr:`~._Devenv.installer_backend`, with the given arguments.
+
+		:param executable: The Python executable to run pip with.
+		:param args: The arguments to pass to pip, starting with the command (e.g. ``install``).
+		:param env: The environment variables for the subprocess.
+
+		:raises: :exc:`RuntimeError` if pip exits with a non-zero status.
+		"""
+
+		returncode = self.installer_backend.run(executable, args, env)
+
+		if returncode != 0:  # pragma: no cover
+			raise RuntimeError(f"{self.installer_backend.name} exited with code {returncode}")
+
+	def sync(self) -> int:
+		"""
+		Bring an existing devenv in line with the configuration, installing only the requirements
+		which are missing or whose installed version doesn't satisfy the specifier.
+
+		Markers are evaluated against the devenv's interpreter.
+		If ``locked`` is :py:obj:`True` the versions recorded in the lockfile are installed
+		with ``pip install --no-deps``, as with :meth:`~._Devenv.install_locked_requirements`.
+		If the devenv doesn't exist yet it is created with :meth:`~._Devenv.create`.
+
+		:rtype:
+
+		.. versionadded:: 0.4.0
+		"""  # noqa: D400
+
+		if not (self.venv_dir / "pyvenv.cfg").is_file():
+			return self.create()
+
+		if not (self.force or self.upgrade):
+			with self.phase("fingerprint"):
+				up_to_date = self.is_up_to_date()
+
+			if up_to_date:
+				if self.verbosity:
+					click.echo(f"The devenv in {self.venv_dir.as_posix()!r} is already up to date.")
+				return 0
+
+		# 3rd party
+		from packaging.requirements import Requirement
+		from packaging.utils import canonicalize_name
+
+		# this package
+		from pyproject_devenv.requirements import inspect_venv, plan_sync
+
+		executable = self.venv_executable()
+
+		# Mapping of pinned requirements to their lines in the generated requirements file, with hashes.
+		locked_lines: Dict[str, str] = {}
+
+		if self.locked:
+			requirements: List[Requirement] = []
+			for line in self.locked_requirements():
+				requirement = Requirement(line.split(" --hash=", 1)[0])
+				locked_lines[str(requirement)] = line
+				requirements.append(requirement)
+		else:
+			self.check_requirements()
+			requirements = self.all_requirements()
+
+		project_name = canonicalize_name(self.config["name"])
+
+		extraneous: List[str]
+
+		if self.upgrade:
+			to_install = requirements
+			extraneous = []
+			project_installed = False
+		else:
+			with self.phase("inspect"):
+				venv_state = inspect_venv(executable)
+				to_install, extraneous = plan_sync(requirements, venv_state)
+				project_installed = project_name in venv_state.distributions
+
+		if self.editable:
+			# The project itself isn't one of the requirements.
+			extraneous = [name for name in extraneous if canonicalize_name(name) != project_name]
+
+		if to_install:
+			self.report_installing(f"{len(to_install)} missing requirement{'s' if len(to_install) > 1 else ''}")
+
+			if self.locked:
+				with self.phase("install:sync"):
+					self._install_locked(executable, [locked_lines[str(req)] for req in to_install], os.environ)
+			else:
+				try:
+					with self.phase("install:sync"):
+						self._install(executable, list(map(str, to_install)), self.install_options(), os.environ)
+				except RuntimeError:  # pragma: no cover
+					raise InstallError(*to_install, output=self.installer_backend.output.tail)
+
+		if self.prune and extraneous:
+			if self.verbosity:
+				click.echo()
+				click.echo(f" Removing {word_join(extraneous)} ".center(shutil.get_terminal_size().columns, '='))
+
+			with self.phase("uninstall"):
+				self._run_pip(executable, ["uninstall", "--yes", *extraneous], os.environ)
+
+		if self.editable and not project_installed:
+			with self.phase("install:editable"):
+				self.install_editable(executable)
+
+		if self.verbosity:
+			click.echo()
+
+		with self.phase("update_pyvenv"):
+			self.update_pyvenv()
+
+		return 0
+
+	def requirement_groups(self) -> Dict[str, List["ComparableRequirement"]]:
+		"""
+		Returns the groups of requirements which would be installed by :meth:`~._Devenv.create`.
+
+		The keys describe each group, e.g. ``"project requirements"`` or ``"extra 'doc'"``.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.lock import requirement_groups
+
+		groups = {}
+
+		for group, requirements in requirement_groups(self, selected=True).items():
+			if group.startswith("extras."):
+				groups[f"extra {group[7:]!r}"] = requirements
+			elif group == "tests":
+				groups["test requirements"] = requirements
 			else:
-				raise InstallError(*requirements)
+				groups[f"{group} requirements"] = requirements
+
+		return groups
+
+	def all_requirements(self) -> List["Requirement"]:
+		"""
+		Returns the requirements from every group which would be installed by :meth:`~._Devenv.create`.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		return [req for reqs in self.requirement_groups().values() for req in reqs]
+
+	def check_requirements(self) -> None:
+		"""
+		Check the requirements which would be installed for conflicts, before creating the devenv.
+
+		Markers are evaluated against the target interpreter,
+		so requirements for other platforms or versions of Python are ignored.
+
+		:raises: :exc:`~.ConflictError` if any of the requirements conflict.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		# this package
+		from pyproject_devenv.requirements import find_conflicts
+
+		groups = self.requirement_groups()
+
+		with self.phase("preflight"):
+			conflicts = find_conflicts(groups, self.marker_environment)
+
+		if conflicts:
+			raise ConflictError(conflicts)
+
+	def venv_executable(self) -> PathPlus:
+		"""
+		Returns the path to the devenv's Python executable.
+
+		.. versionadded:: 0.4.0
+		"""
+
+		if sys.platform == "win32":  # pragma: no cover (!Windows)
+			return self.venv_dir / "Scripts" / "python.exe"
+		else:  # pragma: no cover (Windows)
+			return self.venv_dir / "bin" / "python"
 
 	def update_pyvenv(self) -> None:
 		"""
 		Read and update the ``pyvenv.cfg`` file of the virtualenv.
 		"""
 
+		# 3rd party
+		from shippinglabel import read_pyvenv
+
 		pyvenv_config: Dict[str, str] = read_pyvenv(self.venv_dir)
 		pyvenv_config["pyproject-devenv"] = __version__
+		pyvenv_config["pyproject-devenv-fingerprint"] = self.fingerprint()
 
 		lf = '\n'
 		lfht = "\n\t"
 
-		with (self.venv_dir / "pyvenv.cfg").open('w') as fp:
+		# Replaced rather than modified in place, in case the file is shared with another virtualenv.
+		pyvenv_file = self.venv_dir / "pyvenv.cfg"
+		tmp_file = self.venv_dir / f".pyvenv.cfg.{os.getpid()}.tmp"
+
+		with tmp_file.open('w') as fp:
 			for key, value in pyvenv_config.items():
 				value = str(value)
 				fp.write(f"{key} = {value.replace(lf, lfht)}\n")
 
+		os.replace(tmp_file, pyvenv_file)
+
+
+def _interpreter_identity(python: Optional[str]) -> Dict[str, object]:
+	"""
+	Returns information identifying the given Python interpreter,
+	which changes if the interpreter is replaced or upgraded.
+
+	:param python: The ``--python`` argument, or :py:obj:`None` for the current interpreter.
+	"""  # noqa: D400
+
+	if python is None:
+		executable = sys.executable
+	elif os.path.exists(python):
+		executable = python
+	else:
+		# this package
+		from pyproject_devenv.discovery import find_interpreter
+
+		# Specifiers such as '3.9' are found in the same way as when creating the devenv.
+		try:
+			executable = find_interpreter(python).executable
+		except FileNotFoundError:
+			return {"spec": python}
+
+	executable = os.path.realpath(executable)
+	stat = os.stat(executable)
+	return {"spec": python, "executable": executable, "mtime": stat.st_mtime_ns, "size": stat.st_size}
+
 
 def mkdevenv(
 		project_dir: PathLike,
@@ -366,6 +1630,23 @@ def mkdevenv(
 		verbosity: int = 1,
 		upgrade: bool = False,
 		python: Optional[str] = None,
+		combine: bool = False,
+		force: bool = False,
+		sync: bool = False,
+		prune: bool = False,
+		locked: bool = False,
+		golden: bool = False,
+		timings: Optional["Timings"] = None,
+		installer: str = "pip",
+		seeder: str = "pip",
+		extras: Optional[Iterable[str]] = None,
+		project: bool = True,
+		tests: bool = True,
+		build: bool = True,
+		log_file: Optional[PathLike] = None,
+		watch: bool = False,
+		editable: bool = False,
+		store: bool = False,
 		) -> int:
 	"""
 	Create a "devenv".
@@ -375,10 +1656,100 @@ def mkdevenv(
 	:param verbosity: The verbosity of the function. ``0`` = quiet, ``2`` = very verbose.
 	:param upgrade: Whether to upgrade all specified packages to the newest available version.
 	:param python: Path to the Python interpreter to use (e.g. a version of CPython, PyPy, RustPython, GraalPython).
+	:param combine: Whether to install all groups of requirements with a single invocation of pip.
+	:param force: Recreate the devenv even if it is up to date.
+	:param sync: Update an existing devenv by installing only the missing or outdated requirements,
+		rather than recreating it.
+	:param prune: When ``sync`` is :py:obj:`True`, also uninstall distributions which are not required by the project.
+	:param locked: Install the exact versions recorded in the project's lockfile (see :mod:`pyproject_devenv.lock`)
+		with ``pip install --no-deps``, rather than resolving the requirements.
+	:param golden: Clone the devenv from a cached virtualenv with the same requirements and interpreter,
+		if there is one, and otherwise add the newly created devenv to the cache.
+		Ignored if ``upgrade`` is :py:obj:`True`.
+	:param timings: If given, the wall-clock and CPU time taken by each phase
+		(loading the configuration, finding the interpreter, seeding, installing each group of requirements, etc.)
+		are recorded in this :class:`~pyproject_devenv.timing.Timings` object.
+	:param installer: The installer backend to use. ``'pip'`` runs pip once for each group of requirements,
+		``'pip-worker'`` sends every group to a single long-lived pip process, avoiding repeated start-up costs,
+		and ``'uv'`` uses ``uv pip install``. ``'auto'`` uses uv if it is on :envvar:`PATH`, and pip otherwise.
+	:param seeder: How to install pip, setuptools and wheel into the new virtualenv.
+		``'pip'`` downloads and installs the latest versions. ``'app-data'`` links the versions bundled with
+		virtualenv from its app-data cache, which takes milliseconds once the cache is warm and needs no network
+		access. If that fails, the ``'pip'`` seeder is used instead.
+	:param extras: The extras to install. By default all of the project's extras are installed.
+	:param project: Whether to install the project's requirements.
+	:param tests: Whether to install the test requirements from ``tests/requirements.txt``.
+	:param build: Whether to install the build requirements.
+	:param log_file: If given, the full output of the installer is appended to this file.
+		Only the last few lines are kept in memory, and included in the message of any :exc:`~.BaseInstallError`.
+	:param watch: Keep running, and sync the devenv whenever ``pyproject.toml``, ``requirements.txt``
+		or ``tests/requirements.txt`` change (see :func:`pyproject_devenv.watch.watch_devenv`).
+		Implies ``sync``. Only returns when interrupted with :kbd:`Ctrl+C`.
+	:param editable: Install the project itself in editable mode (:pep:`660`), without its requirements.
+		If the build requirements are installed they are installed first, and sdists and the project are built
+		with them rather than in isolated build environments, which pip would otherwise create for each build.
+	:param store: Install distributions by linking them from a content-addressed store shared between devenvs,
+		rather than unpacking them again, and add distributions which aren't in the store to it
+		(see :mod:`pyproject_devenv.store`). Requires pip 22.2 or later in the devenv.
+
+	If the devenv already exists and was created from the same ``pyproject.toml``, requirements files,
+	interpreter and options it is left untouched, unless ``force`` or ``upgrade`` is :py:obj:`True`.
 
 	:rtype:
 
 	.. versionchanged:: 0.2.0  Added ``python`` keyword argument.
+	.. versionchanged:: 0.4.0
+
+		* Added the ``combine``, ``force``, ``sync``, ``prune``, ``locked``, ``golden``, ``timings``, ``installer``,
+		  ``seeder``, ``extras``, ``project``, ``tests``, ``build``, ``log_file``, ``watch``, ``editable``
+		  and ``store`` keyword arguments.
+		* Existing, up-to-date devenvs are no longer recreated.
+	"""
+
+	devenv = _Devenv(
+			project_dir,
+			venv_dir,
+			verbosity=verbosity,
+			upgrade=upgrade,
+			python=python,
+			combine=combine,
+			force=force,
+			prune=prune,
+			locked=locked,
+			golden=golden,
+			timings=timings,
+			installer=installer,
+			seeder=seeder,
+			extras=extras,
+			project=project,
+			tests=tests,
+			build=build,
+			log_file=log_file,
+			editable=editable,
+			store=store,
+			)
+
+	return _run_devenv(devenv, sync=sync, watch=watch)
+
+
+def _run_devenv(devenv: _Devenv, *, sync: bool = False, watch: bool = False) -> int:
+	"""
+	Create, sync or watch the devenv, as for :func:`~.mkdevenv`.
+
+	:returns: The exit code.
 	"""
 
-	return _Devenv(project_dir, venv_dir, verbosity=verbosity, upgrade=upgrade, python=python).create()
+	if watch:
+		# this package
+		from pyproject_devenv.watch import watch_devenv
+
+		try:
+			watch_devenv(devenv)
+		except KeyboardInterrupt:
+			pass
+
+		return 0
+	elif sync:
+		return devenv.sync()
+	else:
+		return devenv.create()
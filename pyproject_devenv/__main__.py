@@ -27,19 +27,51 @@ Create virtual environments using ``pyproject.toml`` metadata.
 #
 
 # stdlib
+import contextlib
 import sys
-from typing import Optional
+from textwrap import indent
+from typing import TYPE_CHECKING, Callable, Iterator, List, Optional, TypeVar
 
 # 3rd party
 import click
-from consolekit import click_command
-from consolekit.options import DescribedArgument, colour_option, flag_option, verbose_option, version_option
+from consolekit import click_group
+from consolekit.commands import SuggestionGroup
+from consolekit.options import (
+		DescribedArgument,
+		colour_option,
+		flag_option,
+		force_option,
+		verbose_option,
+		version_option
+		)
 from consolekit.terminal_colours import ColourTrilean, Fore, resolve_color_default
 from consolekit.tracebacks import handle_tracebacks, traceback_option
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.typing import PathLike
 
-__all__ = ("main", "version_callback")
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv import _Devenv
+	from pyproject_devenv.batch import BuildResult
+
+__all__ = (
+		"main",
+		"version_callback",
+		"create",
+		"lock",
+		"pack",
+		"unpack",
+		"cache",
+		"stats",
+		"prune",
+		"pool",
+		"fill",
+		"take",
+		"serve",
+		"DefaultCommandGroup",
+		)
+
+_C = TypeVar("_C", bound=click.Command)
 
 
 def version_callback(ctx: click.Context, param: click.Option, value: int) -> None:  # noqa: D103
@@ -47,7 +79,6 @@ def version_callback(ctx: click.Context, param: click.Option, value: int) -> Non
 		return
 
 	# 3rd party
-	import virtualenv  # type: ignore[import-untyped]
 	from domdf_python_tools.stringlist import DelimitedList
 
 	# this package
@@ -56,24 +87,172 @@ def version_callback(ctx: click.Context, param: click.Option, value: int) -> Non
 	parts = DelimitedList([f"pyproject-devenv version {pyproject_devenv.__version__}"])
 
 	if value > 1:
+		# 3rd party
+		import virtualenv  # type: ignore[import-untyped]
+
 		parts.append(f"virualenv {virtualenv.__version__}")
 
 	click.echo(f"{parts:, }", color=ctx.color)
 	ctx.exit()
 
 
+@contextlib.contextmanager
+def _handle_tracebacks(show_traceback: bool) -> Iterator[None]:
+	# Like handle_tracebacks(show_traceback, ConfigTracebackHandler),
+	# but the handler (and pyproject-parser's CLI module) is only imported if there is an error.
+
+	if show_traceback:
+		yield
+		return
+
+	try:
+		yield
+	except BaseException:
+		# this package
+		from pyproject_devenv.config import ConfigTracebackHandler
+
+		with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+			raise
+
+
+class DefaultCommandGroup(SuggestionGroup):
+	"""
+	:class:`click.Group` which invokes :attr:`~.DefaultCommandGroup.default_command`
+	if the first argument is not the name of a command.
+
+	This allows ``pyproject-devenv [DEST]`` to be used as a shorthand for ``pyproject-devenv create [DEST]``.
+
+	.. versionadded:: 0.4.0
+	"""  # noqa: D400
+
+	#: The name of the command to invoke if no other command was given.
+	default_command: str = "create"
+
+	def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:  # noqa: D102
+		if not args or (args[0] not in self.commands and args[0] not in {"-h", "--help", "--version"}):
+			args = [self.default_command, *args]
+
+		return super().parse_args(ctx, args)
+
+
 @version_option(callback=version_callback)
+@click_group(cls=DefaultCommandGroup)
+def main() -> None:
+	"""
+	Create virtual environments using pyproject.toml metadata.
+	"""
+
+
 @traceback_option()
 @colour_option()
 @verbose_option()
+@click.option(
+		"--log-file",
+		type=click.Path(dir_okay=False, writable=True),
+		default=None,
+		metavar="FILE",
+		help="Append the full output of the installer to FILE.",
+		)
+@click.option(
+		"--timings-json",
+		type=click.Path(dir_okay=False, writable=True),
+		default=None,
+		metavar="FILE",
+		help="Write the time taken by each phase to FILE as JSON.",
+		)
+@click.option(
+		"--seeder",
+		type=click.Choice(["pip", "app-data"]),
+		default="pip",
+		show_default=True,
+		help="How to install pip and setuptools. 'app-data' links them from virtualenv's cache, without network access.",
+		)
+@click.option(
+		"--installer",
+		type=click.Choice(["pip", "pip-worker", "uv", "auto"]),
+		default="pip",
+		show_default=True,
+		help="The installer to use. 'pip-worker' installs every group with a single pip process, "
+		"and 'auto' uses uv if it is on PATH.",
+		)
+@flag_option(
+		"--store",
+		help="Link installed packages from a store shared between virtualenvs, rather than unpacking them again.",
+		)
+@flag_option(
+		"-e",
+		"--editable",
+		help="Install the project itself in editable mode. "
+		"It and any sdists are built with the installed build requirements, without build isolation.",
+		)
+@flag_option(
+		"--no-build",
+		help="Don't install the build requirements.",
+		)
+@flag_option(
+		"--no-tests",
+		help="Don't install the test requirements.",
+		)
+@flag_option(
+		"--no-project",
+		help="Don't install the project's requirements.",
+		)
+@click.option(
+		"--extras",
+		default=None,
+		metavar="EXTRAS",
+		help="Comma-separated list of the extras to install. Defaults to all extras. Use '' to install none.",
+		)
+@flag_option(
+		"--timings",
+		help="Show the time taken by each phase of creating the virtualenv.",
+		)
 @flag_option(
 		"-U",
 		"--upgrade",
 		help="Upgrade all specified packages to the newest available version.",
 		)
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.INT,
+		default=None,
+		help="With --recursive, the number of virtualenvs to create at once. Defaults to the number of CPUs.",
+		)
+@flag_option(
+		"-r",
+		"--recursive",
+		help="Create a virtualenv for every project below the current directory, concurrently.",
+		)
+@flag_option(
+		"--golden",
+		help="Clone the virtualenv from a cached virtualenv with the same requirements, if there is one.",
+		)
+@flag_option(
+		"--locked",
+		help="Install the exact versions recorded in the lockfile, without resolving dependencies.",
+		)
+@flag_option(
+		"--prune",
+		help="With --sync, also uninstall packages which are not required by the project.",
+		)
+@flag_option(
+		"--watch",
+		help="Keep running, and sync the virtualenv whenever pyproject.toml or the requirements files change.",
+		)
+@flag_option(
+		"--sync",
+		help="Update an existing virtualenv, installing only missing or outdated requirements.",
+		)
+@force_option(help_text="Recreate the virtualenv even if it is already up to date.")
+@flag_option(
+		"--combine",
+		help="Install all groups of requirements with a single invocation of pip.",
+		)
 @click.option(
 		"--python",
-		help="Path to the Python interpreter to use (e.g. a version of CPython, PyPy, RustPython, GraalPython)",
+		help="Path to the Python interpreter to use (e.g. a version of CPython, PyPy, RustPython, GraalPython). "
+		"Give several, separated by commas, to create one virtualenv for each (e.g. venv-py39 and venv-py312).",
 		)
 @click.argument(
 		"dest",
@@ -82,25 +261,126 @@ def version_callback(ctx: click.Context, param: click.Option, value: int) -> Non
 		cls=DescribedArgument,
 		description="The directory to create the virtual environment in.",
 		)
-@click_command()
-def main(
+@main.command()
+def create(
 		dest: PathLike = "venv",
 		verbose: int = 0,
 		colour: ColourTrilean = None,
 		show_traceback: bool = False,
 		upgrade: bool = False,
 		python: Optional[str] = None,
+		combine: bool = False,
+		force: bool = False,
+		sync: bool = False,
+		watch: bool = False,
+		prune: bool = False,
+		locked: bool = False,
+		golden: bool = False,
+		recursive: bool = False,
+		jobs: Optional[int] = None,
+		timings: bool = False,
+		timings_json: Optional[str] = None,
+		installer: str = "pip",
+		seeder: str = "pip",
+		extras: Optional[str] = None,
+		no_project: bool = False,
+		no_tests: bool = False,
+		no_build: bool = False,
+		log_file: Optional[str] = None,
+		editable: bool = False,
+		store: bool = False,
 		) -> None:
 	"""
-	Create virtual environments using pyproject.toml metadata.
+	Create a virtual environment using pyproject.toml metadata.
+
+	This is the default command, and runs if no other command is given.
 	"""
 
 	# this package
-	from pyproject_devenv import mkdevenv
-	from pyproject_devenv.config import ConfigTracebackHandler
+	from pyproject_devenv import _Devenv, _run_devenv
+	from pyproject_devenv.timing import Timings
 
-	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
-		ret = mkdevenv(PathPlus.cwd(), dest, verbosity=verbose, upgrade=upgrade, python=python)
+	with _handle_tracebacks(show_traceback):
+		pythons = python.split(',') if python else []
+		selected_extras = None if extras is None else [e.strip() for e in extras.split(',') if e.strip()]
+
+		if recursive and len(pythons) > 1:
+			raise click.UsageError("--recursive cannot be used with more than one interpreter.")
+
+		if recursive or len(pythons) > 1:
+			if timings or timings_json:
+				raise click.UsageError("--timings cannot be used when creating more than one virtualenv.")
+			if log_file:
+				raise click.UsageError("--log-file cannot be used when creating more than one virtualenv.")
+			if watch:
+				raise click.UsageError("--watch cannot be used when creating more than one virtualenv.")
+
+			_create_many(
+					dest,
+					pythons=pythons if len(pythons) > 1 else None,
+					jobs=jobs,
+					sync=sync,
+					colour=colour,
+					verbosity=verbose,
+					upgrade=upgrade,
+					python=python if len(pythons) < 2 else None,
+					combine=combine,
+					force=force,
+					prune=prune,
+					locked=locked,
+					golden=golden,
+					installer=installer,
+					seeder=seeder,
+					extras=selected_extras,
+					project=not no_project,
+					tests=not no_tests,
+					build=not no_build,
+					editable=editable,
+					store=store,
+					)
+			return
+
+		phase_timings = Timings() if timings or timings_json else None
+
+		devenv = _Devenv(
+				PathPlus.cwd(),
+				dest,
+				verbosity=verbose,
+				upgrade=upgrade,
+				python=python,
+				combine=combine,
+				force=force,
+				prune=prune,
+				locked=locked,
+				golden=golden,
+				timings=phase_timings,
+				installer=installer,
+				seeder=seeder,
+				extras=selected_extras,
+				project=not no_project,
+				tests=not no_tests,
+				build=not no_build,
+				log_file=log_file,
+				editable=editable,
+				store=store,
+				)
+
+		if not (force or upgrade or watch) and devenv.is_up_to_date():
+			# Checked here too, so only the modules needed to compute the fingerprint are imported.
+			click.echo(f"The devenv in {devenv.venv_dir.as_posix()!r} is already up to date.")
+			return
+
+		ret = _run_devenv(devenv, sync=sync, watch=watch)
+
+		if watch:
+			return
+
+		if phase_timings is not None:
+			if timings:
+				click.echo(phase_timings.format_table())
+				click.echo()
+			if timings_json:
+				phase_timings.dump_json(timings_json)
 
 		if ret:
 			sys.exit(ret)  # pragma: no cover
@@ -111,5 +391,589 @@ def main(
 					)
 
 
+def _create_many(
+		dest: PathLike,
+		*,
+		pythons: Optional[List[str]],
+		jobs: Optional[int],
+		sync: bool,
+		colour: ColourTrilean,
+		**kwargs,
+		) -> None:
+	# this package
+	from pyproject_devenv.batch import BuildResult, mkdevenv_matrix, mkdevenv_recursive
+
+	colour = resolve_color_default(colour)
+	cwd = PathPlus.cwd()
+
+	def describe(result: BuildResult) -> str:
+		if pythons:
+			return result.venv_dir.relative_to(result.project_dir).as_posix()
+		else:
+			return result.project_dir.relative_to(cwd).as_posix()
+
+	def report(result: BuildResult) -> None:
+		name = describe(result)
+
+		if result.success:
+			click.echo(Fore.GREEN(f"==> {name}: created development virtualenv"), color=colour)
+		else:
+			click.echo(Fore.RED(f"==> {name}: failed"), color=colour)
+
+		if result.output and (kwargs["verbosity"] or not result.success):
+			click.echo(indent(result.output.rstrip(), "    "))
+		if result.error:
+			click.echo(indent(result.error.rstrip(), "    "))
+
+	if pythons:
+		results = mkdevenv_matrix(cwd, dest, pythons, jobs=jobs, sync=sync, callback=report, **kwargs)
+	else:
+		results = mkdevenv_recursive(cwd, dest, jobs=jobs, sync=sync, callback=report, **kwargs)
+
+	failures = [result for result in results if not result.success]
+
+	click.echo()
+
+	if failures:
+		click.echo(
+				Fore.RED(f"Failed to create {len(failures)} of {len(results)} development virtualenvs:"),
+				color=colour,
+				)
+		for result in failures:
+			click.echo(f"  {describe(result)}")
+		sys.exit(1)
+	else:
+		click.echo(Fore.GREEN(f"Successfully created {len(results)} development virtualenvs."), color=colour)
+
+
+@traceback_option()
+@verbose_option()
+@click.option(
+		"--python",
+		help="Path to the Python interpreter to resolve the requirements for.",
+		)
+@main.command()
+def lock(
+		verbose: int = 0,
+		show_traceback: bool = False,
+		python: Optional[str] = None,
+		) -> None:
+	"""
+	Resolve the requirements of every group and record the exact versions and hashes in a lockfile.
+
+	Use ``pyproject-devenv --locked`` to create a virtualenv from the lockfile.
+	"""
+
+	# this package
+	from pyproject_devenv import _Devenv
+	from pyproject_devenv.config import ConfigTracebackHandler
+	from pyproject_devenv.lock import create_lockfile
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		filename = create_lockfile(_Devenv(PathPlus.cwd(), verbosity=verbose, python=python))
+		click.echo(f"Wrote lockfile to {filename.as_posix()!r}")
+
+
+@traceback_option()
+@click.argument(
+		"dest",
+		type=click.STRING,
+		default="venv",
+		cls=DescribedArgument,
+		description="The directory containing the virtual environment.",
+		)
+@click.argument(
+		"archive_dir",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="The directory to write the archive to.",
+		)
+@main.command()
+def pack(
+		archive_dir: str,
+		dest: PathLike = "venv",
+		show_traceback: bool = False,
+		) -> None:
+	"""
+	Pack a virtual environment into a relocatable archive, named after the fingerprint of its configuration.
+
+	Use ``pyproject-devenv unpack`` to restore it, e.g. in a later CI job.
+	"""
+
+	# this package
+	from pyproject_devenv import _Devenv
+	from pyproject_devenv.config import ConfigTracebackHandler
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		archive = _Devenv(PathPlus.cwd(), dest).pack(archive_dir)
+		click.echo(f"Wrote archive to {archive.as_posix()!r}")
+
+
+@traceback_option()
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.INT,
+		default=None,
+		help="The number of threads to unpack the archive with.",
+		)
+@flag_option(
+		"-e",
+		"--editable",
+		help="Restore a virtual environment created with --editable.",
+		)
+@flag_option(
+		"--locked",
+		help="Restore a virtual environment created with --locked.",
+		)
+@flag_option(
+		"--no-build",
+		help="Restore a virtual environment created with --no-build.",
+		)
+@flag_option(
+		"--no-tests",
+		help="Restore a virtual environment created with --no-tests.",
+		)
+@flag_option(
+		"--no-project",
+		help="Restore a virtual environment created with --no-project.",
+		)
+@click.option(
+		"--extras",
+		default=None,
+		metavar="EXTRAS",
+		help="Restore a virtual environment created with these --extras.",
+		)
+@click.option(
+		"--python",
+		help="Restore a virtual environment created with this --python.",
+		)
+@click.argument(
+		"dest",
+		type=click.STRING,
+		default="venv",
+		cls=DescribedArgument,
+		description="The directory to restore the virtual environment into.",
+		)
+@click.argument(
+		"archive_dir",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="The directory containing archives written by 'pyproject-devenv pack'.",
+		)
+@main.command()
+def unpack(
+		archive_dir: str,
+		dest: PathLike = "venv",
+		show_traceback: bool = False,
+		python: Optional[str] = None,
+		extras: Optional[str] = None,
+		no_project: bool = False,
+		no_tests: bool = False,
+		no_build: bool = False,
+		locked: bool = False,
+		editable: bool = False,
+		jobs: Optional[int] = None,
+		) -> None:
+	"""
+	Restore a virtual environment from an archive written by 'pyproject-devenv pack'.
+
+	The archive must have been created from the same configuration, and the same options.
+	Exits with status 1 if there is no such archive, e.g. so CI can create the virtual environment instead.
+	"""
+
+	# this package
+	from pyproject_devenv import _Devenv
+	from pyproject_devenv.config import ConfigTracebackHandler
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		devenv = _Devenv(
+				PathPlus.cwd(),
+				dest,
+				python=python,
+				extras=None if extras is None else [e.strip() for e in extras.split(',') if e.strip()],
+				project=not no_project,
+				tests=not no_tests,
+				build=not no_build,
+				locked=locked,
+				editable=editable,
+				)
+
+		if devenv.is_up_to_date():
+			click.echo(f"The devenv in {devenv.venv_dir.as_posix()!r} is already up to date.")
+		elif devenv.unpack(archive_dir, jobs=jobs):
+			click.echo(f"Restored the devenv in {devenv.venv_dir.as_posix()!r}")
+		else:
+			click.echo(f"No archive found for the devenv in {PathPlus(archive_dir).as_posix()!r}", err=True)
+			sys.exit(1)
+
+
+@main.group(cls=SuggestionGroup)
+def cache() -> None:
+	"""
+	Inspect and prune the caches kept by pyproject-devenv.
+	"""
+
+
+@cache.command()
+def stats() -> None:
+	"""
+	Show the size of each cache, and when its entries were last used.
+	"""
+
+	# stdlib
+	import datetime
+
+	# this package
+	from pyproject_devenv.cache import CACHE_KINDS, cache_dir, cache_entries, format_size
+
+	entries = cache_entries()
+
+	def last_used(timestamps: List[float]) -> str:
+		if not timestamps:
+			return '-'
+		return datetime.datetime.fromtimestamp(max(timestamps)).strftime("%Y-%m-%d %H:%M")
+
+	rows = []
+	for kind in CACHE_KINDS:
+		kind_entries = [entry for entry in entries if entry.kind == kind]
+		rows.append((
+				kind,
+				str(len(kind_entries)),
+				format_size(sum(entry.size for entry in kind_entries)),
+				last_used([entry.last_used for entry in kind_entries]),
+				))
+
+	total = ("total", str(len(entries)), format_size(sum(entry.size for entry in entries)), '')
+
+	header = f"{'Cache':<12}  {'Entries':>7}  {'Size':>10}  Last used"
+	click.echo(header)
+	click.echo('-' * len(header))
+
+	for row in rows:
+		click.echo(f"{row[0]:<12}  {row[1]:>7}  {row[2]:>10}  {row[3]}")
+
+	click.echo('-' * len(header))
+	click.echo(f"{total[0]:<12}  {total[1]:>7}  {total[2]:>10}")
+	click.echo(f"\nLocation: {cache_dir().as_posix()}")
+
+
+@traceback_option()
+@flag_option(
+		"-n",
+		"--dry-run",
+		help="Show the entries which would be removed, without removing them.",
+		)
+@flag_option(
+		"--all",
+		"all_entries",
+		help="Remove every entry from the caches.",
+		)
+@click.option(
+		"--max-age",
+		default=None,
+		metavar="AGE",
+		help="Remove entries which haven't been used for longer than AGE, e.g. '30d', '12h' or '90m'.",
+		)
+@click.option(
+		"--max-size",
+		default=None,
+		metavar="SIZE",
+		help="Remove the least recently used entries until the caches total at most SIZE, e.g. '10G' or '500M'.",
+		)
+@cache.command()
+def prune(
+		max_size: Optional[str] = None,
+		max_age: Optional[str] = None,
+		all_entries: bool = False,
+		dry_run: bool = False,
+		show_traceback: bool = False,
+		) -> None:
+	"""
+	Remove old entries from the caches.
+
+	With neither --max-size nor --max-age the limits used after creating a devenv are applied
+	(10G and 30d unless set with $PYPROJECT_DEVENV_CACHE_MAX_SIZE and $PYPROJECT_DEVENV_CACHE_MAX_AGE).
+	Virtual environments created from the cached entries are not affected.
+	"""
+
+	# this package
+	from pyproject_devenv.cache import default_limits, format_size, parse_age, parse_size, prune_cache
+	from pyproject_devenv.config import ConfigTracebackHandler
+
+	if all_entries and (max_size is not None or max_age is not None):
+		raise click.UsageError("--all cannot be combined with --max-size or --max-age")
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		if all_entries:
+			removed = prune_cache(max_size=0, dry_run=dry_run)
+		elif max_size is None and max_age is None:
+			default_max_size, default_max_age = default_limits()
+			removed = prune_cache(max_size=default_max_size, max_age=default_max_age, dry_run=dry_run)
+		else:
+			removed = prune_cache(
+					max_size=None if max_size is None else parse_size(max_size),
+					max_age=None if max_age is None else parse_age(max_age),
+					dry_run=dry_run,
+					)
+
+		size = format_size(sum(entry.size for entry in removed))
+
+		if dry_run:
+			for entry in removed:
+				click.echo(f"Would remove {entry.path.as_posix()}")
+			click.echo(f"Would remove {len(removed)} entries ({size}).")
+		else:
+			click.echo(f"Removed {len(removed)} entries ({size}).")
+
+
+@main.group(cls=SuggestionGroup)
+def pool() -> None:
+	"""
+	Keep a pool of pre-built virtual environments, and hand them out to jobs.
+	"""
+
+
+def _pool_devenv_options(command: _C) -> _C:
+	# The options which affect the fingerprint, and so which pool a virtual environment is taken from.
+	options = [
+			click.option("--python", help="The Python interpreter to use."),
+			click.option(
+					"--extras",
+					default=None,
+					metavar="EXTRAS",
+					help="Comma-separated list of extras to install. By default all extras are installed.",
+					),
+			flag_option("--no-project", help="Don't install the project's runtime requirements."),
+			flag_option("--no-tests", help="Don't install the requirements from tests/requirements.txt."),
+			flag_option("--no-build", help="Don't install the project's build requirements."),
+			flag_option("--locked", help="Install the pinned requirements from the project's lockfile."),
+			flag_option("-e", "--editable", help="Install the project itself in editable mode."),
+			]
+
+	for option in options:
+		command = option(command)
+
+	return command
+
+
+def _pool_devenv(dest: PathLike = "venv", *, extras: Optional[str] = None, **kwargs) -> "_Devenv":
+	# this package
+	from pyproject_devenv import _Devenv
+
+	return _Devenv(
+			PathPlus.cwd(),
+			dest,
+			python=kwargs.pop("python"),
+			extras=None if extras is None else [e.strip() for e in extras.split(',') if e.strip()],
+			project=not kwargs.pop("no_project"),
+			tests=not kwargs.pop("no_tests"),
+			build=not kwargs.pop("no_build"),
+			**kwargs,
+			)
+
+
+def _report_pool_build(colour: ColourTrilean, verbosity: int) -> Callable[["BuildResult"], None]:
+	colour = resolve_color_default(colour)
+
+	def report(result: "BuildResult") -> None:
+		if result.success:
+			click.echo(Fore.GREEN(f"==> {result.project_dir.name}: added a devenv to the pool"), color=colour)
+		else:
+			click.echo(Fore.RED(f"==> {result.project_dir.name}: failed"), color=colour)
+
+		if result.output and (verbosity or not result.success):
+			click.echo(indent(result.output.rstrip(), "    "))
+		if result.error:
+			click.echo(indent(result.error.rstrip(), "    "))
+
+	return report
+
+
+@traceback_option()
+@colour_option()
+@verbose_option()
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.INT,
+		default=None,
+		help="The maximum number of virtual environments to create at once. Defaults to the number of CPUs.",
+		)
+@click.option(
+		"--size",
+		type=click.IntRange(min=0),
+		default=2,
+		show_default=True,
+		help="The number of ready virtual environments to keep.",
+		)
+@click.option(
+		"--seeder",
+		type=click.Choice(["pip", "app-data"]),
+		default="pip",
+		show_default=True,
+		help="How to install pip and setuptools. 'app-data' links them from virtualenv's cache, without network access.",
+		)
+@_pool_devenv_options
+@click.argument(
+		"pool_dir",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="The directory containing the pool.",
+		)
+@pool.command()
+def fill(
+		pool_dir: str,
+		size: int = 2,
+		jobs: Optional[int] = None,
+		verbose: int = 0,
+		colour: ColourTrilean = None,
+		show_traceback: bool = False,
+		**kwargs,
+		) -> None:
+	"""
+	Create virtual environments for the current project until the pool has SIZE ready.
+	"""
+
+	# this package
+	from pyproject_devenv.config import ConfigTracebackHandler
+	from pyproject_devenv.pool import DevenvPool
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		devenv = _pool_devenv(verbosity=verbose, **kwargs)
+		devenv_pool = DevenvPool(pool_dir)
+		results = devenv_pool.fill(devenv, size, jobs=jobs, callback=_report_pool_build(colour, verbose))
+
+		click.echo(f"The pool has {devenv_pool.available(devenv)} ready virtual environments.")
+
+		if not all(result.success for result in results):
+			sys.exit(1)
+
+
+@traceback_option()
+@_pool_devenv_options
+@click.argument(
+		"dest",
+		type=click.STRING,
+		default="venv",
+		cls=DescribedArgument,
+		description="The directory to move the virtual environment to.",
+		)
+@click.argument(
+		"pool_dir",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="The directory containing the pool.",
+		)
+@pool.command()
+def take(
+		pool_dir: str,
+		dest: PathLike = "venv",
+		show_traceback: bool = False,
+		**kwargs,
+		) -> None:
+	"""
+	Move a ready virtual environment for the current project out of the pool.
+
+	Exits with status 1 if the pool has none, e.g. so CI can create the virtual environment instead.
+	"""
+
+	# this package
+	from pyproject_devenv.config import ConfigTracebackHandler
+	from pyproject_devenv.pool import DevenvPool
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		devenv = _pool_devenv(dest, **kwargs)
+
+		if DevenvPool(pool_dir).take(devenv):
+			click.echo(f"Took the devenv in {devenv.venv_dir.as_posix()!r} from the pool")
+		else:
+			click.echo(f"No ready devenv found in {PathPlus(pool_dir).as_posix()!r}", err=True)
+			sys.exit(1)
+
+
+@traceback_option()
+@colour_option()
+@verbose_option()
+@click.option(
+		"-j",
+		"--jobs",
+		type=click.INT,
+		default=None,
+		help="The maximum number of virtual environments to create at once. Defaults to the number of CPUs.",
+		)
+@click.option(
+		"--poll-interval",
+		type=click.FLOAT,
+		default=5.0,
+		show_default=True,
+		help="How often to check for virtual environments which have been taken, in seconds.",
+		)
+@click.option(
+		"--size",
+		type=click.IntRange(min=0),
+		default=2,
+		show_default=True,
+		help="The number of ready virtual environments to keep for projects which don't set a size.",
+		)
+@click.option(
+		"--seeder",
+		type=click.Choice(["pip", "app-data"]),
+		default="pip",
+		show_default=True,
+		help="How to install pip and setuptools. 'app-data' links them from virtualenv's cache, without network access.",
+		)
+@click.argument(
+		"config",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="TOML file listing the projects to keep virtual environments for.",
+		)
+@click.argument(
+		"pool_dir",
+		type=click.STRING,
+		cls=DescribedArgument,
+		description="The directory containing the pool.",
+		)
+@pool.command()
+def serve(
+		pool_dir: str,
+		config: str,
+		seeder: str = "pip",
+		size: int = 2,
+		poll_interval: float = 5.0,
+		jobs: Optional[int] = None,
+		verbose: int = 0,
+		colour: ColourTrilean = None,
+		show_traceback: bool = False,
+		) -> None:
+	"""
+	Keep the pool filled with virtual environments for the projects listed in CONFIG, until interrupted.
+
+	Each project is given in a [[project]] table, with its 'path' and optionally
+	the 'size' of its pool, the 'python' interpreters to use and the 'extras' to install.
+	"""
+
+	# this package
+	from pyproject_devenv.config import ConfigTracebackHandler
+	from pyproject_devenv.pool import DevenvPool, read_pool_config, serve_pool
+
+	with handle_tracebacks(show_traceback, ConfigTracebackHandler):
+		click.echo(f"Filling the pool in {PathPlus(pool_dir).as_posix()!r}. Press Ctrl+C to stop.")
+
+		try:
+			serve_pool(
+					DevenvPool(pool_dir),
+					lambda: read_pool_config(config, default_size=size),
+					poll_interval=poll_interval,
+					jobs=jobs,
+					callback=_report_pool_build(colour, verbose),
+					verbosity=verbose,
+					seeder=seeder,
+					)
+		except KeyboardInterrupt:
+			pass
+
+
 if __name__ == "__main__":
 	sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+#
+#  batch.py
+"""
+Create devenvs for several projects concurrently.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import copy
+import multiprocessing
+import os
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Iterable, List, NamedTuple, Optional, Sequence, Type
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv import _Devenv
+
+__all__ = (
+		"BuildResult",
+		"discover_projects",
+		"build_devenvs",
+		"mkdevenv_recursive",
+		"mkdevenv_matrix",
+		"EXCLUDE_DIRS",
+		)
+
+#: Directories which are never searched for projects.
+EXCLUDE_DIRS = frozenset({"node_modules", "__pycache__", "build", "dist", "site-packages"})
+
+
+class BuildResult(NamedTuple):
+	"""
+	The outcome of creating a devenv with :func:`~.build_devenvs`.
+	"""
+
+	#: The root of the project.
+	project_dir: PathPlus
+
+	#: The directory the devenv was created in.
+	venv_dir: PathPlus
+
+	#: The return code of :meth:`_Devenv.create() <pyproject_devenv._Devenv.create>`, or ``1`` if it raised an exception.
+	returncode: int
+
+	#: The traceback of the exception raised while creating the devenv, if any.
+	error: Optional[str]
+
+	#: Everything written to stdout and stderr while creating the devenv, including by pip.
+	output: str
+
+	@property
+	def success(self) -> bool:
+		"""
+		Whether the devenv was created successfully.
+		"""
+
+		return self.returncode == 0 and self.error is None
+
+
+def discover_projects(root: PathLike) -> List[PathPlus]:
+	"""
+	Returns the directories under ``root`` which contain a ``pyproject.toml`` file.
+
+	Hidden directories, virtualenvs and directories in :py:data:`~.EXCLUDE_DIRS` are not searched.
+
+	:param root:
+	"""
+
+	projects = []
+
+	for dirpath, dirnames, filenames in os.walk(os.fspath(root)):
+		dirnames[:] = sorted(
+				name for name in dirnames if not name.startswith('.') and name not in EXCLUDE_DIRS
+				and not os.path.isfile(os.path.join(dirpath, name, "pyvenv.cfg"))
+				)
+
+		if "pyproject.toml" in filenames:
+			projects.append(PathPlus(dirpath))
+
+	return projects
+
+
+def _build(devenv: "_Devenv", sync: bool) -> BuildResult:
+	"""
+	Create the devenv in a worker process, capturing everything written to stdout and stderr.
+
+	:param devenv:
+	:param sync: Whether to call :meth:`~._Devenv.sync` rather than :meth:`~._Devenv.create`.
+	"""
+
+	error: Optional[str] = None
+	returncode = 1
+
+	sys.stdout.flush()
+	sys.stderr.flush()
+	saved_fds = os.dup(1), os.dup(2)
+
+	with tempfile.TemporaryFile() as log:
+		# Redirect at the file descriptor level so the output of subprocesses (e.g. pip) is captured too.
+		os.dup2(log.fileno(), 1)
+		os.dup2(log.fileno(), 2)
+
+		try:
+			returncode = devenv.sync() if sync else devenv.create()
+		except BaseException:
+			error = traceback.format_exc()
+		finally:
+			sys.stdout.flush()
+			sys.stderr.flush()
+			os.dup2(saved_fds[0], 1)
+			os.dup2(saved_fds[1], 2)
+			os.close(saved_fds[0])
+			os.close(saved_fds[1])
+
+		log.seek(0)
+		output = log.read().decode("UTF-8", errors="replace")
+
+	return BuildResult(devenv.project_dir, devenv.venv_dir, returncode, error, output)
+
+
+def build_devenvs(
+		devenvs: Iterable["_Devenv"],
+		*,
+		jobs: Optional[int] = None,
+		sync: bool = False,
+		callback: Optional[Callable[[BuildResult], None]] = None,
+		) -> List[BuildResult]:
+	"""
+	Create several devenvs concurrently, each in its own worker process.
+
+	The output of each build is captured separately and returned in its :class:`~.BuildResult`.
+	A failure in one build does not stop the others.
+
+	:param devenvs:
+	:param jobs: The maximum number of devenvs to create at once. Defaults to the number of CPUs.
+	:param sync: Whether to call :meth:`~._Devenv.sync` rather than :meth:`~._Devenv.create`.
+	:param callback: Function called with the result of each build as soon as it finishes.
+
+	:returns: The results, in the order the devenvs were given.
+	"""
+
+	devenvs = list(devenvs)
+	results: List[Optional[BuildResult]] = [None] * len(devenvs)
+
+	if not devenvs:
+		return []
+
+	# Workers are spawned, not forked, as forking a process with running threads is unsafe.
+	context = multiprocessing.get_context("spawn")
+	max_workers = min(jobs or os.cpu_count() or 1, len(devenvs))
+
+	with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+		futures = {executor.submit(_build, devenv, sync): idx for idx, devenv in enumerate(devenvs)}
+
+		for future in as_completed(futures):
+			idx = futures[future]
+
+			try:
+				result = future.result()
+			except BaseException:  # pragma: no cover
+				# e.g. the worker process died
+				devenv = devenvs[idx]
+				result = BuildResult(devenv.project_dir, devenv.venv_dir, 1, traceback.format_exc(), '')
+
+			results[idx] = result
+
+			if callback is not None:
+				callback(result)
+
+	return [result for result in results if result is not None]
+
+
+def mkdevenv_recursive(
+		root: PathLike,
+		venv_dir: PathLike = "venv",
+		*,
+		jobs: Optional[int] = None,
+		sync: bool = False,
+		callback: Optional[Callable[[BuildResult], None]] = None,
+		devenv_class: Optional[Type["_Devenv"]] = None,
+		**kwargs,
+		) -> List[BuildResult]:
+	r"""
+	Create a devenv for every project under ``root`` concurrently.
+
+	:param root: The directory to search for projects, with :func:`~.discover_projects`.
+	:param venv_dir: The directory to create each devenv in, relative to its project.
+	:param jobs: The maximum number of devenvs to create at once. Defaults to the number of CPUs.
+	:param sync: Whether to update existing devenvs with :meth:`~._Devenv.sync`.
+	:param callback: Function called with the result of each build as soon as it finishes.
+	:param devenv_class: The :class:`~._Devenv` subclass to use.
+	:param \*\*kwargs: Keyword arguments passed to ``devenv_class``, e.g. ``verbosity``.
+	"""
+
+	if devenv_class is None:
+		# this package
+		from pyproject_devenv import _Devenv
+		devenv_class = _Devenv
+
+	devenvs: Sequence["_Devenv"] = [
+			devenv_class(project_dir, venv_dir, **kwargs) for project_dir in discover_projects(root)
+			]
+
+	return build_devenvs(devenvs, jobs=jobs, sync=sync, callback=callback)
+
+
+def mkdevenv_matrix(
+		project_dir: PathLike,
+		venv_dir: PathLike = "venv",
+		pythons: Sequence[str] = (),
+		*,
+		jobs: Optional[int] = None,
+		sync: bool = False,
+		callback: Optional[Callable[[BuildResult], None]] = None,
+		devenv_class: Optional[Type["_Devenv"]] = None,
+		**kwargs,
+		) -> List[BuildResult]:
+	r"""
+	Create a devenv for each of the given Python interpreters concurrently.
+
+	Each devenv is created in ``<venv_dir>-<tag>``, where ``tag`` identifies the interpreter
+	(e.g. ``venv-py39`` and ``venv-pypy310``).
+	The project's configuration is only loaded once, and the builds share a pip cache directory
+	so wheels downloaded or built for one interpreter are reused by the others.
+
+	:param project_dir: The root of the project to create the devenvs for.
+	:param venv_dir: The base name of the directories to create the devenvs in, relative to ``project_dir``.
+	:param pythons: The Python interpreters to create devenvs for, as paths or specifiers such as ``python3.9``.
+	:param jobs: The maximum number of devenvs to create at once. Defaults to the number of interpreters.
+	:param sync: Whether to update existing devenvs with :meth:`~._Devenv.sync`.
+	:param callback: Function called with the result of each build as soon as it finishes.
+	:param devenv_class: The :class:`~._Devenv` subclass to use.
+	:param \*\*kwargs: Keyword arguments passed to ``devenv_class``, e.g. ``verbosity``.
+
+	:raises: :exc:`FileNotFoundError` if one of the interpreters could not be found.
+	"""
+
+	# this package
+	from pyproject_devenv.cache import cache_dir
+	from pyproject_devenv.discovery import find_interpreter, interpreter_tag
+
+	if devenv_class is None:
+		# this package
+		from pyproject_devenv import _Devenv
+		devenv_class = _Devenv
+
+	kwargs.setdefault("pip_cache_dir", cache_dir() / "pip")
+	template = devenv_class(project_dir, venv_dir, **kwargs)
+
+	# Load the configuration now, so it is only done once rather than in every worker.
+	config = template.config
+
+	devenvs = []
+	tags = set()
+
+	for python in pythons:
+		tag = interpreter_tag(find_interpreter(python))
+		if tag in tags:
+			raise ValueError(f"More than one of the given interpreters is {tag!r}")
+		tags.add(tag)
+
+		devenv = copy.copy(template)
+		devenv.python = python
+		devenv.venv_dir = template.venv_dir.with_name(f"{template.venv_dir.name}-{tag}")
+		devenv.config = config
+		devenv._fingerprint = None
+		devenvs.append(devenv)
+
+	return build_devenvs(devenvs, jobs=jobs or len(devenvs), sync=sync, callback=callback)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+#
+#  cache.py
+"""
+Locations of the caches kept by ``pyproject-devenv``, and the eviction of old entries from them.
+
+Each cache entry's modification time records when it was last used,
+so the least recently used entries can be removed when the caches grow too large.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import os
+import re
+import shutil
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = (
+		"AUTO_PRUNE_INTERVAL",
+		"CACHE_KINDS",
+		"DEFAULT_MAX_AGE",
+		"DEFAULT_MAX_SIZE",
+		"CacheEntry",
+		"auto_prune",
+		"auto_prune_due",
+		"cache_dir",
+		"cache_entries",
+		"default_limits",
+		"format_size",
+		"parse_age",
+		"parse_size",
+		"prune_cache",
+		"touch",
+		)
+
+#: The kinds of cache entry, which are kept in subdirectories of :func:`~.cache_dir` with the same names.
+CACHE_KINDS = ("config", "interpreters", "golden", "store", "pip")
+
+#: The default maximum total size of the caches for :func:`~.auto_prune` and ``pyproject-devenv cache prune``.
+DEFAULT_MAX_SIZE = "10G"
+
+#: The default maximum time since a cache entry was last used for :func:`~.auto_prune`
+#: and ``pyproject-devenv cache prune``.
+DEFAULT_MAX_AGE = "30d"
+
+#: The minimum time, in seconds, between runs of :func:`~.auto_prune`.
+AUTO_PRUNE_INTERVAL = 60 * 60
+
+_SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3, 't': 1024**4}
+_AGE_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60, 'w': 7 * 24 * 60 * 60}
+
+
+def cache_dir() -> PathPlus:
+	"""
+	Returns the directory in which ``pyproject-devenv`` keeps its caches.
+
+	The location can be set with the :envvar:`PYPROJECT_DEVENV_CACHE_DIR` environment variable.
+	Otherwise the platform's user cache directory is used, e.g. :file:`~/.cache/pyproject-devenv` on Linux.
+	"""
+
+	if os.environ.get("PYPROJECT_DEVENV_CACHE_DIR"):
+		return PathPlus(os.environ["PYPROJECT_DEVENV_CACHE_DIR"])
+	elif sys.platform == "win32":  # pragma: no cover (!Windows)
+		base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+		return PathPlus(base) / "pyproject-devenv" / "Cache"
+	elif sys.platform == "darwin":  # pragma: no cover (!Darwin)
+		return PathPlus.home() / "Library" / "Caches" / "pyproject-devenv"
+	else:  # pragma: no cover (!Linux)
+		base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+		return PathPlus(base) / "pyproject-devenv"
+
+
+class CacheEntry(NamedTuple):
+	"""
+	An entry in one of the caches, such as a golden virtualenv or a parsed configuration file.
+	"""
+
+	#: The kind of entry. One of :data:`~.CACHE_KINDS`.
+	kind: str
+
+	#: The file or directory containing the entry.
+	path: PathPlus
+
+	#: The total size of the entry's files, in bytes.
+	size: int
+
+	#: The time the entry was last used, in seconds since the epoch.
+	last_used: float
+
+
+def touch(path: PathLike) -> None:
+	"""
+	Record that the cache entry at ``path`` has just been used.
+
+	Errors are ignored, as the entry may have been removed by another process.
+
+	:param path:
+	"""
+
+	try:
+		os.utime(path)
+	except OSError:  # pragma: no cover
+		pass
+
+
+def _tree_size(path: str) -> int:
+	size = 0
+
+	for dirpath, dirnames, filenames in os.walk(path):
+		for name in filenames:
+			try:
+				size += os.lstat(os.path.join(dirpath, name)).st_size
+			except OSError:  # pragma: no cover
+				pass
+
+	return size
+
+
+def _entry(kind: str, path: str) -> Optional[CacheEntry]:
+	try:
+		stat = os.lstat(path)
+	except OSError:  # pragma: no cover
+		return None
+
+	if os.path.isdir(path):
+		size = _tree_size(path)
+		last_used = stat.st_mtime
+	else:
+		size = stat.st_size
+		# pip doesn't record when it uses its cache, but the access time may be updated.
+		last_used = max(stat.st_mtime, stat.st_atime) if kind == "pip" else stat.st_mtime
+
+	return CacheEntry(kind, PathPlus(path), size, last_used)
+
+
+def _entry_paths(kind: str, directory: str) -> Iterator[str]:
+	if not os.path.isdir(directory):
+		return
+
+	if kind == "store":
+		# store/<interpreter tag>/<first two characters of hash>/<hash>
+		for tag in os.scandir(directory):
+			if tag.is_dir():
+				for prefix in os.scandir(tag.path):
+					if prefix.is_dir():
+						yield from _complete_entries(prefix.path)
+	elif kind == "pip":
+		# Each file in pip's cache is independent.
+		for dirpath, dirnames, filenames in os.walk(directory):
+			yield from (os.path.join(dirpath, name) for name in filenames)
+	else:
+		yield from _complete_entries(directory)
+
+
+def _complete_entries(directory: str) -> Iterator[str]:
+	for entry in os.scandir(directory):
+		# Entries are written to temporary files and directories, and then moved into place.
+		if not (entry.name.startswith('.') or entry.name.endswith(".tmp")):
+			yield entry.path
+
+
+def cache_entries(root: Optional[PathLike] = None) -> List[CacheEntry]:
+	"""
+	Returns the entries in the caches.
+
+	:param root: The cache directory. Defaults to :func:`~.cache_dir`.
+	"""
+
+	root = cache_dir() if root is None else PathPlus(root)
+	entries = []
+
+	for kind in CACHE_KINDS:
+		for path in _entry_paths(kind, os.path.join(root, kind)):
+			entry = _entry(kind, path)
+			if entry is not None:
+				entries.append(entry)
+
+	return entries
+
+
+def _remove(path: PathPlus) -> None:
+	try:
+		if path.is_dir() and not path.is_symlink():
+			# Moved aside first, so other processes never see a partially removed entry.
+			deleting = path.parent / f".{path.name}.deleting-{os.getpid()}"
+			os.rename(path, deleting)
+			shutil.rmtree(deleting, ignore_errors=True)
+		else:
+			path.unlink()
+	except OSError:  # pragma: no cover
+		# Removed by another process.
+		pass
+
+
+def prune_cache(
+		*,
+		max_size: Optional[int] = None,
+		max_age: Optional[float] = None,
+		root: Optional[PathLike] = None,
+		dry_run: bool = False,
+		) -> List[CacheEntry]:
+	"""
+	Remove cache entries which have not been used for ``max_age`` seconds,
+	and then the least recently used entries until the caches total at most ``max_size`` bytes.
+
+	Virtualenvs which were created from or linked to a removed entry are not affected.
+
+	:param max_size: The maximum total size of the caches, in bytes.
+	:param max_age: The maximum time since an entry was last used, in seconds.
+	:param root: The cache directory. Defaults to :func:`~.cache_dir`.
+	:param dry_run: Only return the entries which would be removed.
+
+	:returns: The removed entries.
+	"""  # noqa: D400
+
+	entries = sorted(cache_entries(root), key=lambda entry: entry.last_used)
+	now = time.time()
+	removed = []
+
+	if max_age is not None:
+		removed = [entry for entry in entries if now - entry.last_used > max_age]
+		entries = [entry for entry in entries if now - entry.last_used <= max_age]
+
+	if max_size is not None:
+		total = sum(entry.size for entry in entries)
+		for entry in entries:
+			if total <= max_size:
+				break
+			removed.append(entry)
+			total -= entry.size
+
+	if not dry_run:
+		for entry in removed:
+			_remove(entry.path)
+
+	return removed
+
+
+_L = TypeVar("_L", int, float)
+
+
+def _limit_from_env(name: str, default: str, parser: Callable[[str], _L]) -> Optional[_L]:
+	value = os.environ.get(name) or default
+	if value.strip().lower() == "none":
+		return None
+	return parser(value)
+
+
+def default_limits() -> Tuple[Optional[int], Optional[float]]:
+	"""
+	Returns the maximum total size of the caches, in bytes, and the maximum time since an entry was last used,
+	in seconds, which are used by :func:`~.auto_prune`.
+
+	The limits are taken from the :envvar:`PYPROJECT_DEVENV_CACHE_MAX_SIZE` and
+	:envvar:`PYPROJECT_DEVENV_CACHE_MAX_AGE` environment variables (see :func:`~.parse_size`
+	and :func:`~.parse_age`), and default to :data:`~.DEFAULT_MAX_SIZE` and :data:`~.DEFAULT_MAX_AGE`.
+	Set either to ``none`` to disable that limit.
+	"""  # noqa: D400
+
+	return (
+			_limit_from_env("PYPROJECT_DEVENV_CACHE_MAX_SIZE", DEFAULT_MAX_SIZE, parse_size),
+			_limit_from_env("PYPROJECT_DEVENV_CACHE_MAX_AGE", DEFAULT_MAX_AGE, parse_age),
+			)
+
+
+def auto_prune_due(root: Optional[PathLike] = None) -> bool:
+	"""
+	Returns whether :func:`~.auto_prune` would prune the caches,
+	i.e. whether it last did so more than :data:`~.AUTO_PRUNE_INTERVAL` seconds ago.
+
+	:param root: The cache directory. Defaults to :func:`~.cache_dir`.
+	"""  # noqa: D400
+
+	root = cache_dir() if root is None else PathPlus(root)
+
+	try:
+		return time.time() - os.stat(root / ".last-prune").st_mtime > AUTO_PRUNE_INTERVAL
+	except FileNotFoundError:
+		return root.is_dir()
+
+
+def auto_prune(root: Optional[PathLike] = None) -> Optional[List[CacheEntry]]:
+	"""
+	Prune the caches if they were last pruned more than :data:`~.AUTO_PRUNE_INTERVAL` seconds ago.
+
+	The limits are given by :func:`~.default_limits`.
+
+	This is called after each devenv is created.
+
+	:param root: The cache directory. Defaults to :func:`~.cache_dir`.
+
+	:returns: The removed entries, or :py:obj:`None` if the caches were pruned recently.
+	"""
+
+	root = cache_dir() if root is None else PathPlus(root)
+
+	if not auto_prune_due(root):
+		return None
+
+	# Recorded first, so other processes don't prune at the same time.
+	(root / ".last-prune").touch()
+
+	max_size, max_age = default_limits()
+	return prune_cache(max_size=max_size, max_age=max_age, root=root)
+
+
+def _parse_quantity(value: str, units: Dict[str, int], what: str) -> float:
+	match = re.fullmatch(r"\s*(\d+(?:\.\d*)?)\s*([a-z]?)b?\s*", value.lower())
+	if match is None or match.group(2) not in units:
+		raise ValueError(f"Invalid {what} {value!r}")
+	return float(match.group(1)) * units[match.group(2)]
+
+
+def parse_size(value: str) -> int:
+	"""
+	Parse a size such as ``500M``, ``10G`` or ``1.5GB`` into a number of bytes.
+
+	The suffixes ``K``, ``M``, ``G`` and ``T`` are powers of 1024.
+	A plain number, or one followed by ``B``, is a number of bytes.
+
+	:param value:
+
+	:raises: :exc:`ValueError` if the size is invalid.
+	"""
+
+	return int(_parse_quantity(value, _SIZE_UNITS, "size"))
+
+
+def parse_age(value: str) -> float:
+	"""
+	Parse an age such as ``30d``, ``12h`` or ``90m`` into a number of seconds.
+
+	The suffixes are ``s``, ``m`` (minutes), ``h``, ``d`` and ``w``. A plain number is a number of seconds.
+
+	:param value:
+
+	:raises: :exc:`ValueError` if the age is invalid.
+	"""
+
+	return _parse_quantity(value, _AGE_UNITS, "age")
+
+
+def format_size(size: float) -> str:
+	"""
+	Format a number of bytes for display, e.g. ``1.5 GiB``.
+
+	:param size:
+	"""
+
+	for unit in ("B", "KiB", "MiB", "GiB"):
+		if size < 1024:
+			return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+		size /= 1024
+
+	return f"{size:.1f} TiB"
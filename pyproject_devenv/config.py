@@ -27,11 +27,15 @@ Read the ``pyproject-devenv`` config from ``pyproject.toml``.
 #
 
 # stdlib
-from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, List, Optional, TypeVar, cast
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, List, Optional, Tuple, Type, TypeVar, cast
 
 # 3rd party
-import pyproject_parser.cli
-from consolekit.utils import abort
+import pyproject_parser.parsers
 from dom_toml.parser import TOML_TYPES, BadConfigError
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.typing import PathLike
@@ -40,11 +44,16 @@ from shippinglabel.requirements import ComparableRequirement, combine_requiremen
 from typing_extensions import TypedDict
 
 if TYPE_CHECKING:
+	# 3rd party
+	from consolekit.tracebacks import TracebackHandler
+	from pyproject_parser.cli import ConfigTracebackHandler  # Created on first use by __getattr__
+
 	# this package
 	from pyproject_devenv import BaseInstallError
 
 __all__ = (
 		"load_toml",
+		"clear_config_cache",
 		"ConfigTracebackHandler",
 		"ConfigDict",
 		"PEP621Parser",
@@ -123,16 +132,225 @@ class ConfigDict(TypedDict):
 	build_dependencies: Optional[List[ComparableRequirement]]
 
 
-def load_toml(filename: PathLike) -> ConfigDict:
+# The state of an input file: its path, modification time, size and SHA256 hash.
+_InputState = Tuple[str, int, int, str]
+
+# Files modified this recently (in seconds) before their state was recorded might have been modified again
+# without their modification time changing, so their hash is checked as well.
+_RACY_INTERVAL = 2
+
+# Mapping of paths to ``pyproject.toml`` files to the state of the inputs and the parsed configuration.
+_memory_cache: Dict[str, Tuple[float, List[_InputState], ConfigDict]] = {}
+
+# Requirements parsed from the on-disk cache, shared between all configurations loaded by this process.
+_requirements_cache: Dict[str, ComparableRequirement] = {}
+
+
+def load_toml(filename: PathLike, *, use_cache: bool = True) -> ConfigDict:
 	"""
 	Load the ``pyproject-devenv`` configuration mapping from the given TOML file.
 
+	The result is cached both in memory and on disk (see :func:`~pyproject_devenv.cache.cache_dir`),
+	keyed by the modification time, size and hash of ``pyproject.toml`` and ``requirements.txt``.
+	It is only parsed again when one of them changes.
+
 	:param filename:
+	:param use_cache: Whether to use the cached configuration, if there is one, and to update the cache.
+
+	.. versionchanged:: 0.4.0  Added the ``use_cache`` keyword argument.
 	"""
 
 	filename = PathPlus(filename)
 
-	devenv_config = _DevenvConfig.load(filename, set_defaults=True)
+	if not use_cache:
+		return _parse_toml(filename)
+
+	path = filename.abspath()
+	key = path.as_posix()
+	inputs = [path, path.parent / "requirements.txt"]
+
+	if key in _memory_cache:
+		recorded_at, state, config = _memory_cache[key]
+		if _is_fresh(inputs, recorded_at, state):
+			return _copy_config(config)
+
+	cache_file = _config_cache_file(path)
+	cached = _read_config_cache(cache_file)
+
+	if cached is not None and _is_fresh(inputs, cached["recorded-at"], cached["inputs"]):
+		recorded_at, state = cached["recorded-at"], cached["inputs"]
+		config = _config_from_json(cached["config"])
+	else:
+		# Record the state of the inputs before parsing them, in case they are modified in the meantime.
+		recorded_at, state = time.time(), _input_state(inputs)
+		config = _parse_toml(filename)
+		_write_config_cache(cache_file, recorded_at, state, config)
+
+	_memory_cache[key] = (recorded_at, state, config)
+	return _copy_config(config)
+
+
+def clear_config_cache() -> None:
+	"""
+	Clear the in-memory cache of configuration loaded by :func:`~.load_toml`.
+
+	.. versionadded:: 0.4.0
+	"""
+
+	_memory_cache.clear()
+	_requirements_cache.clear()
+
+
+def _input_state(inputs: List[PathPlus]) -> List[_InputState]:
+	state = []
+
+	for path in inputs:
+		try:
+			stat = os.stat(path)
+		except FileNotFoundError:
+			state.append((path.as_posix(), -1, -1, ''))
+		else:
+			digest = hashlib.sha256(path.read_bytes()).hexdigest()
+			state.append((path.as_posix(), stat.st_mtime_ns, stat.st_size, digest))
+
+	return state
+
+
+def _is_fresh(inputs: List[PathPlus], recorded_at: float, state: List[_InputState]) -> bool:
+	"""
+	Returns whether the input files are unchanged since their state was recorded.
+
+	Files whose modification time and size are unchanged are assumed to be unchanged too,
+	unless they were modified just before the state was recorded. Otherwise their hashes are compared.
+	"""
+
+	if [path.as_posix() for path in inputs] != [entry[0] for entry in state]:
+		return False
+
+	for path, (_, mtime, size, digest) in zip(inputs, state):
+		try:
+			stat = os.stat(path)
+		except FileNotFoundError:
+			if size != -1:
+				return False
+			continue
+
+		if size == -1 or stat.st_size != size:
+			return False
+		elif stat.st_mtime_ns == mtime and mtime / 1e9 < recorded_at - _RACY_INTERVAL:
+			continue
+		elif hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+			return False
+
+	return True
+
+
+def _copy_config(config: ConfigDict) -> ConfigDict:
+	# The lists are copied so callers can't modify the cached configuration, but the requirements are shared.
+	return {
+			"name": config["name"],
+			"dependencies": list(config["dependencies"]),
+			"optional_dependencies": {extra: list(reqs) for extra, reqs in config["optional_dependencies"].items()},
+			"build_dependencies": None if config["build_dependencies"] is None else list(config["build_dependencies"]),
+			}
+
+
+def _requirement(requirement: str) -> ComparableRequirement:
+	if requirement not in _requirements_cache:
+		_requirements_cache[requirement] = ComparableRequirement(requirement)
+
+	return _requirements_cache[requirement]
+
+
+def _config_to_json(config: ConfigDict) -> Dict[str, Any]:
+	build_dependencies = config["build_dependencies"]
+
+	return {
+			"name": config["name"],
+			"dependencies": list(map(str, config["dependencies"])),
+			"optional_dependencies": {
+					extra: list(map(str, reqs))
+					for extra, reqs in config["optional_dependencies"].items()
+					},
+			"build_dependencies": None if build_dependencies is None else list(map(str, build_dependencies)),
+			}
+
+
+def _config_from_json(data: Dict[str, Any]) -> ConfigDict:
+	build_dependencies = data["build_dependencies"]
+
+	return {
+			"name": data["name"],
+			"dependencies": list(map(_requirement, data["dependencies"])),
+			"optional_dependencies": {
+					extra: list(map(_requirement, reqs))
+					for extra, reqs in data["optional_dependencies"].items()
+					},
+			"build_dependencies": None if build_dependencies is None else list(map(_requirement, build_dependencies)),
+			}
+
+
+def _config_cache_file(filename: PathPlus) -> PathPlus:
+	# this package
+	from pyproject_devenv.cache import cache_dir
+
+	return cache_dir() / "config" / f"{hashlib.sha256(filename.as_posix().encode('UTF-8')).hexdigest()}.json"
+
+
+def _read_config_cache(cache_file: PathPlus) -> Optional[Dict[str, Any]]:
+	# this package
+	from pyproject_devenv import __version__
+	from pyproject_devenv.cache import touch
+
+	try:
+		cached = json.loads(cache_file.read_text())
+	except (OSError, ValueError):
+		return None
+
+	if cached.get("pyproject-devenv") != __version__:
+		return None
+
+	touch(cache_file)
+	cached["inputs"] = [tuple(entry) for entry in cached["inputs"]]
+	return cached
+
+
+def _write_config_cache(
+		cache_file: PathPlus,
+		recorded_at: float,
+		state: List[_InputState],
+		config: ConfigDict,
+		) -> None:
+	# this package
+	from pyproject_devenv import __version__
+
+	data = {
+			"pyproject-devenv": __version__,
+			"recorded-at": recorded_at,
+			"inputs": state,
+			"config": _config_to_json(config),
+			}
+
+	try:
+		cache_file.parent.maybe_make(parents=True)
+		fd, tmp_file = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+		with os.fdopen(fd, 'w', encoding="UTF-8") as fp:
+			json.dump(data, fp)
+		os.replace(tmp_file, cache_file)
+	except OSError:  # pragma: no cover
+		# The cache is only an optimisation.
+		pass
+
+
+def _parse_toml(filename: PathPlus) -> ConfigDict:
+
+	try:
+		devenv_config = _DevenvConfig.load(filename, set_defaults=True)
+	except BadConfigError:
+		raise
+	except (TypeError, ValueError) as e:
+		# Invalid TOML, fields of the wrong type, and invalid requirements.
+		raise BadConfigError(f"Could not load {filename.as_posix()!r}: {e}") from e
 
 	if devenv_config.project is None:
 		raise BadConfigError(f"The '[project]' table was not found in {filename.as_posix()!r}")
@@ -161,11 +379,35 @@ def load_toml(filename: PathLike) -> ConfigDict:
 			}
 
 
-class ConfigTracebackHandler(pyproject_parser.cli.ConfigTracebackHandler):
-	"""
-	:class:`consolekit.tracebacks.TracebackHandler` which handles
-	:exc:`dom_toml.parser.BadConfigError` and :exc:`~.BaseInstallError`.
-	"""  # noqa: D400
+_traceback_handler: Optional[Type["TracebackHandler"]] = None
+
+
+def _make_traceback_handler() -> Type["TracebackHandler"]:
+	# 3rd party
+	import pyproject_parser.cli
+	from consolekit.utils import abort
+
+	class ConfigTracebackHandler(pyproject_parser.cli.ConfigTracebackHandler):
+		"""
+		:class:`consolekit.tracebacks.TracebackHandler` which handles
+		:exc:`dom_toml.parser.BadConfigError` and :exc:`~.BaseInstallError`.
+		"""  # noqa: D400
+
+		def handle_BaseInstallError(self, e: "BaseInstallError") -> bool:  # noqa: D102  # pragma: no cover
+			raise abort(f"Error: {e}", colour=False)
+
+	ConfigTracebackHandler.__module__ = __name__
+	ConfigTracebackHandler.__qualname__ = "ConfigTracebackHandler"
+	return ConfigTracebackHandler
+
+
+def __getattr__(name: str) -> Any:
+	# ConfigTracebackHandler is created on first use, as pyproject_parser.cli is slow to import.
+	global _traceback_handler
+
+	if name == "ConfigTracebackHandler":
+		if _traceback_handler is None:
+			_traceback_handler = _make_traceback_handler()
+		return _traceback_handler
 
-	def handle_BaseInstallError(self, e: "BaseInstallError") -> bool:  # noqa: D102  # pragma: no cover
-		raise abort(f"Error: {e}", colour=False)
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
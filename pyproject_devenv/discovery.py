@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+#
+#  discovery.py
+"""
+Find Python interpreters with virtualenv's discovery mechanism.
+
+The results are cached on disk (see :func:`~pyproject_devenv.cache.cache_dir`),
+so interpreters don't have to be searched for and started again on every run.
+
+.. versionadded:: 0.4.0
+"""  # noqa: D400
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, cast
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+if TYPE_CHECKING:
+	# 3rd party
+	from virtualenv.discovery.py_info import PythonInfo  # type: ignore[import-untyped]
+
+__all__ = ("find_interpreter", "interpreter_tag", "marker_environment", "clear_interpreter_cache")
+
+# Mapping of cache keys to the interpreters found this run, with the state of the files they were found from.
+_memory_cache: Dict[str, Tuple[Dict[str, Any], "PythonInfo"]] = {}
+
+
+def find_interpreter(spec: Optional[str] = None, *, use_cache: bool = True) -> "PythonInfo":
+	"""
+	Find the Python interpreter matching ``spec``, in the same way as virtualenv's ``--python`` option.
+
+	The result is cached in memory and on disk. The cache entry is keyed by ``spec`` and :envvar:`PATH`,
+	and is used until the interpreter's executable changes (its modification time or size),
+	or, for specifiers which are not paths, one of the directories on :envvar:`PATH` is modified.
+
+	The cached interpreter is also given to virtualenv, so when its executable is passed to
+	virtualenv's ``--python`` option virtualenv doesn't start the interpreter again to inspect it.
+
+	:param spec: A path to an interpreter, or a specifier such as ``python3.9`` or ``pypy3``.
+		If :py:obj:`None` the interpreter running ``pyproject-devenv`` is used.
+	:param use_cache: Whether to use the cached interpreter, if there is one, and to update the cache.
+
+	:raises: :exc:`FileNotFoundError` if no matching interpreter could be found.
+	"""
+
+	if not use_cache:
+		return _find_interpreter(spec)
+
+	key = _cache_key(spec)
+
+	if key in _memory_cache:
+		state, interpreter = _memory_cache[key]
+		if _is_fresh(state):
+			_share_with_virtualenv(interpreter)
+			return interpreter
+
+	cache_file = _interpreter_cache_file(key)
+	cached = _read_interpreter_cache(cache_file)
+
+	if cached is not None and _is_fresh(cached["state"]):
+		state, interpreter = cached["state"], cached["interpreter"]
+	else:
+		path_state = _path_state(spec)
+		interpreter = _find_interpreter(spec)
+		state = {"executable": _executable_state(interpreter.executable), "path": path_state}
+		_write_interpreter_cache(cache_file, state, interpreter)
+
+	_memory_cache[key] = (state, interpreter)
+	_share_with_virtualenv(interpreter)
+	return interpreter
+
+
+def clear_interpreter_cache() -> None:
+	"""
+	Clear the in-memory cache of interpreters found by :func:`~.find_interpreter`.
+	"""
+
+	_memory_cache.clear()
+
+
+def _share_with_virtualenv(interpreter: "PythonInfo") -> None:
+	# 3rd party
+	from virtualenv.discovery import cached_py_info  # type: ignore[import-untyped]
+
+	# virtualenv keeps its own in-memory cache of interpreters, keyed by executable,
+	# which is otherwise only filled by starting the interpreter (or from its app-data directory).
+	virtualenv_cache = getattr(cached_py_info, "_CACHE", None)
+	if isinstance(virtualenv_cache, dict):
+		virtualenv_cache.setdefault(Path(interpreter.executable), interpreter)
+
+
+def _find_interpreter(spec: Optional[str]) -> "PythonInfo":
+	# 3rd party
+	from virtualenv.discovery.builtin import get_interpreter  # type: ignore[import-untyped]
+	from virtualenv.discovery.py_info import PythonInfo
+
+	if spec is None:
+		return PythonInfo.current_system()
+
+	interpreter = get_interpreter(spec, [], env=os.environ)
+
+	if interpreter is None:
+		raise FileNotFoundError(f"Could not find a Python interpreter matching {spec!r}")
+
+	return interpreter
+
+
+def _is_path(spec: Optional[str]) -> bool:
+	return spec is None or os.sep in spec or (os.altsep is not None and os.altsep in spec)
+
+
+def _cache_key(spec: Optional[str]) -> str:
+	if spec is None:
+		return json.dumps([None, sys.executable])
+	elif _is_path(spec):
+		return json.dumps([os.path.abspath(spec)])
+	else:
+		return json.dumps([spec, os.environ.get("PATH", '')])
+
+
+def _executable_state(executable: str) -> List[Any]:
+	try:
+		stat = os.stat(executable)
+	except OSError:
+		return [executable, -1, -1]
+	else:
+		return [executable, stat.st_mtime_ns, stat.st_size]
+
+
+def _path_state(spec: Optional[str]) -> List[List[Any]]:
+	"""
+	Returns the modification times of the directories on :envvar:`PATH`, which change when interpreters
+	are added or removed, or an empty list if ``spec`` is a path and :envvar:`PATH` isn't searched.
+	"""  # noqa: D400
+
+	if _is_path(spec):
+		return []
+
+	return [_executable_state(directory) for directory in os.environ.get("PATH", '').split(os.pathsep) if directory]
+
+
+def _is_fresh(state: Dict[str, Any]) -> bool:
+	executable = state["executable"]
+
+	if executable[1] == -1 or _executable_state(executable[0]) != executable:
+		return False
+
+	return all(_executable_state(directory[0]) == directory for directory in state["path"])
+
+
+def _interpreter_cache_file(key: str) -> PathPlus:
+	# this package
+	from pyproject_devenv.cache import cache_dir
+
+	return cache_dir() / "interpreters" / f"{hashlib.sha256(key.encode('UTF-8')).hexdigest()}.json"
+
+
+def _cache_version() -> str:
+	# 3rd party
+	import virtualenv  # type: ignore[import-untyped]
+
+	# this package
+	from pyproject_devenv import __version__
+
+	# The interpreter information is stored in virtualenv's format, which may change between versions.
+	return f"{__version__}/{virtualenv.__version__}"
+
+
+def _read_interpreter_cache(cache_file: PathPlus) -> Optional[Dict[str, Any]]:
+	# 3rd party
+	from virtualenv.discovery.py_info import PythonInfo
+
+	# this package
+	from pyproject_devenv.cache import touch
+
+	try:
+		cached = json.loads(cache_file.read_text())
+	except (OSError, ValueError):
+		return None
+
+	if cached.get("version") != _cache_version():
+		return None
+
+	try:
+		cached["interpreter"] = PythonInfo._from_dict(cached["interpreter"])
+	except Exception:  # pylint: disable=broad-except  # pragma: no cover
+		return None
+
+	touch(cache_file)
+	return cached
+
+
+def _write_interpreter_cache(cache_file: PathPlus, state: Dict[str, Any], interpreter: "PythonInfo") -> None:
+	data = {
+			"version": _cache_version(),
+			"state": state,
+			"interpreter": interpreter._to_dict(),
+			}
+
+	try:
+		cache_file.parent.maybe_make(parents=True)
+		fd, tmp_file = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+		with os.fdopen(fd, 'w', encoding="UTF-8") as fp:
+			json.dump(data, fp)
+		os.replace(tmp_file, cache_file)
+	except (OSError, TypeError, ValueError):  # pragma: no cover
+		# The cache is only an optimisation.
+		pass
+
+
+def interpreter_tag(interpreter: "PythonInfo") -> str:
+	"""
+	Returns a short tag identifying the implementation and version of the interpreter,
+	such as ``py39`` for CPython 3.9 or ``pypy310`` for PyPy 3.10.
+
+	:param interpreter:
+	"""  # noqa: D400
+
+	version = f"{interpreter.version_info.major}{interpreter.version_info.minor}"
+
+	if interpreter.implementation == "CPython":
+		return f"py{version}"
+	else:
+		return f"{interpreter.implementation.lower()}{version}"
+
+
+def marker_environment(interpreter: "PythonInfo") -> Dict[str, str]:
+	"""
+	Returns the environment used to evaluate :pep:`508` markers for the given interpreter,
+	without starting it.
+
+	Values which describe the interpreter are taken from ``interpreter``,
+	and those which describe the machine (e.g. ``platform_machine``) from the current interpreter.
+
+	:param interpreter:
+	"""  # noqa: D400
+
+	# 3rd party
+	from packaging.markers import default_environment
+
+	version_info = interpreter.version_info
+	full_version = f"{version_info.major}.{version_info.minor}.{version_info.micro}"
+	if version_info.releaselevel != "final":
+		full_version += f"{version_info.releaselevel[0]}{version_info.serial}"
+
+	environment = cast(Dict[str, str], dict(default_environment()))
+	environment.update({
+			"implementation_name": interpreter.implementation.lower(),
+			"os_name": interpreter.os,
+			"platform_python_implementation": interpreter.implementation,
+			"python_full_version": full_version,
+			"python_version": f"{version_info.major}.{version_info.minor}",
+			"sys_platform": interpreter.platform,
+			})
+
+	if interpreter.implementation == "CPython":
+		environment["implementation_version"] = full_version
+
+	return environment
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+#
+#  installers.py
+"""
+Backends which install requirements into a devenv.
+
+Each backend runs pip-style commands (``install`` and ``uninstall``) against a virtualenv's interpreter.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterator, List, Mapping, Optional, Sequence, Type
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+# this package
+from pyproject_devenv.output import StreamedOutput, run_streamed
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv.pip_worker import PipWorker
+
+__all__ = (
+		"Installer",
+		"PipInstaller",
+		"PipWorkerInstaller",
+		"UvInstaller",
+		"installers",
+		"get_installer",
+		)
+
+
+class Installer:
+	"""
+	Base class for installer backends.
+
+	:param verbosity: The verbosity of the installer. ``0`` = quiet, ``2`` = very verbose.
+	:param cache_dir: The installer's cache directory, if not its default.
+	:param output: Streams the installer's output to the terminal, keeping the last few lines for error messages.
+
+	.. versionchanged:: 0.4.0  Added the ``output`` keyword argument.
+	"""
+
+	#: The name of the backend, as given to ``--installer``.
+	name: ClassVar[str]
+
+	def __init__(
+			self,
+			*,
+			verbosity: int = 1,
+			cache_dir: Optional[PathLike] = None,
+			output: Optional[StreamedOutput] = None,
+			):
+		self.verbosity: int = int(verbosity)
+		self.cache_dir: Optional[PathLike] = cache_dir
+		self.output: StreamedOutput = StreamedOutput() if output is None else output
+
+	@classmethod
+	def is_available(cls) -> bool:
+		"""
+		Returns whether the backend can be used on this system.
+		"""
+
+		return True
+
+	@contextmanager
+	def session(self, executable: PathLike, env: Mapping[str, str]) -> Iterator[None]:
+		"""
+		Context manager wrapping all the commands run while creating a devenv.
+
+		Backends may use it to start and stop helper processes.
+
+		:param executable: The virtualenv's Python executable.
+		:param env: The environment variables for the installer.
+		"""
+
+		yield
+
+	def command(self, executable: PathLike, args: Sequence[str]) -> List[str]:
+		"""
+		Returns the command line for running the given pip-style command.
+
+		:param executable: The Python executable of the environment to install into.
+		:param args: The arguments, starting with the command (e.g. ``install``).
+		"""
+
+		raise NotImplementedError
+
+	def run(self, executable: PathLike, args: Sequence[str], env: Mapping[str, str]) -> int:
+		"""
+		Run the given pip-style command, and return its exit status.
+
+		The output is streamed through :attr:`~.Installer.output`.
+
+		:param executable: The Python executable of the environment to install into.
+		:param args: The arguments, starting with the command (e.g. ``install``).
+		:param env: The environment variables for the installer.
+		"""
+
+		return run_streamed(self.command(executable, args), env, self.output)
+
+
+class PipInstaller(Installer):
+	"""
+	Installs requirements by running ``python -m pip`` for each command.
+	"""
+
+	name: ClassVar[str] = "pip"
+
+	def command(self, executable: PathLike, args: Sequence[str]) -> List[str]:  # noqa: D102
+		cmd = [os.fspath(executable), "-m", "pip", *args, "--disable-pip-version-check"]
+
+		if self.cache_dir is not None:
+			cmd.append("--cache-dir")
+			cmd.append(os.fspath(self.cache_dir))
+
+		if self.verbosity < 1:
+			cmd.append("--quiet")
+		elif self.verbosity > 1:
+			cmd.append("--verbose")
+
+		return cmd
+
+
+class PipWorkerInstaller(PipInstaller):
+	"""
+	Installs requirements by sending each pip command to a :class:`~pyproject_devenv.pip_worker.PipWorker`
+	started when the devenv is created.
+
+	On Windows, and for commands outside of :meth:`~.Installer.session`, pip is run directly instead.
+	"""  # noqa: D400
+
+	name: ClassVar[str] = "pip-worker"
+
+	def __init__(
+			self,
+			*,
+			verbosity: int = 1,
+			cache_dir: Optional[PathLike] = None,
+			output: Optional[StreamedOutput] = None,
+			):
+		super().__init__(verbosity=verbosity, cache_dir=cache_dir, output=output)
+		self._worker: Optional["PipWorker"] = None
+
+	@contextmanager
+	def session(self, executable: PathLike, env: Mapping[str, str]) -> Iterator[None]:  # noqa: D102
+		if self._worker is not None or sys.platform == "win32":
+			yield
+			return
+
+		# this package
+		from pyproject_devenv.pip_worker import PipWorker
+
+		with PipWorker(executable, env, output=self.output) as worker:
+			self._worker = worker
+			try:
+				yield
+			finally:
+				self._worker = None
+
+	def run(self, executable: PathLike, args: Sequence[str], env: Mapping[str, str]) -> int:  # noqa: D102
+		if self._worker is not None and os.fspath(executable) == self._worker.executable:
+			return self._worker.run(self.command(executable, args)[3:]).returncode
+		else:
+			return super().run(executable, args, env)
+
+
+class UvInstaller(Installer):
+	"""
+	Installs requirements with `uv <https://docs.astral.sh/uv/>`_'s ``uv pip`` interface,
+	which must be on :envvar:`PATH`.
+
+	``cache_dir`` is passed to uv as ``--cache-dir``.
+	"""  # noqa: D400
+
+	name: ClassVar[str] = "uv"
+
+	@classmethod
+	def is_available(cls) -> bool:  # noqa: D102
+		return shutil.which("uv") is not None
+
+	def command(self, executable: PathLike, args: Sequence[str]) -> List[str]:  # noqa: D102
+		uv = shutil.which("uv")
+
+		if uv is None:
+			raise FileNotFoundError("Could not find 'uv' on PATH.")
+
+		command, *options = args
+
+		if command == "uninstall":
+			# uv doesn't ask for confirmation.
+			options = [option for option in options if option not in {"--yes", "-y"}]
+
+		cmd = [uv, "pip", command, "--python", os.fspath(executable), *options]
+
+		if self.cache_dir is not None:
+			cmd.append("--cache-dir")
+			cmd.append(os.fspath(self.cache_dir))
+
+		if self.verbosity < 1:
+			cmd.append("--quiet")
+		elif self.verbosity > 1:
+			cmd.append("--verbose")
+
+		return cmd
+
+
+#: Mapping of names to installer backends.
+installers: Dict[str, Type[Installer]] = {
+		PipInstaller.name: PipInstaller,
+		PipWorkerInstaller.name: PipWorkerInstaller,
+		UvInstaller.name: UvInstaller,
+		}
+
+
+def get_installer(
+		name: str,
+		*,
+		verbosity: int = 1,
+		cache_dir: Optional[PathLike] = None,
+		output: Optional[StreamedOutput] = None,
+		) -> Installer:
+	"""
+	Returns the installer backend with the given name.
+
+	:param name: The name of a backend in :data:`~.installers`, or ``'auto'`` to use uv if it is available
+		and pip otherwise.
+	:param verbosity: The verbosity of the installer. ``0`` = quiet, ``2`` = very verbose.
+	:param cache_dir: The installer's cache directory, if not its default.
+	:param output: Streams the installer's output to the terminal, keeping the last few lines for error messages.
+
+	:raises: :exc:`ValueError` if there is no backend with the given name.
+	"""
+
+	if name == "auto":
+		name = UvInstaller.name if UvInstaller.is_available() else PipInstaller.name
+
+	if name not in installers:
+		raise ValueError(f"Unknown installer {name!r}")
+
+	return installers[name](verbosity=verbosity, cache_dir=cache_dir, output=output)
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+#
+#  lock.py
+"""
+Resolve a project's requirements once and record the result in a lockfile.
+
+The lockfile (``pyproject-devenv.lock``, next to ``pyproject.toml``) records the exact version
+and artifact hashes of every distribution needed by each group of requirements.
+Devenvs can then be created from the lockfile with ``pip install --no-deps``, skipping pip's resolver.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Mapping, Set
+
+# 3rd party
+import dom_toml
+from dom_toml.parser import BadConfigError
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+from shippinglabel.requirements import ComparableRequirement, read_requirements
+
+# this package
+from pyproject_devenv.requirements import evaluate_marker
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv import _Devenv
+
+__all__ = (
+		"LOCKFILE_NAME",
+		"LOCK_VERSION",
+		"ENVIRONMENT_MARKERS",
+		"check_environment",
+		"create_lockfile",
+		"dump_lockfile",
+		"load_lockfile",
+		"locked_requirements",
+		"requirement_groups",
+		"requirements_hash",
+		)
+
+#: The name of the lockfile, which is written next to ``pyproject.toml``.
+LOCKFILE_NAME = "pyproject-devenv.lock"
+
+#: The version of the lockfile format.
+LOCK_VERSION = 1
+
+#: The markers which must be the same for the interpreter the lockfile was created with
+#: and the one it is installed into.
+ENVIRONMENT_MARKERS = ("implementation_name", "python_version", "sys_platform", "platform_machine")
+
+
+def requirement_groups(devenv: "_Devenv", *, selected: bool = False) -> Dict[str, List[ComparableRequirement]]:
+	"""
+	Returns the project's requirements, split into groups.
+
+	The keys are ``project``, ``build``, ``tests`` and ``extras.<name>`` for each extra.
+
+	:param devenv:
+	:param selected: Only return the groups which are selected to be installed into ``devenv``,
+		rather than every group the project has.
+	"""
+
+	config = devenv.config
+	groups: Dict[str, List[ComparableRequirement]] = {}
+
+	if devenv.project or not selected:
+		groups["project"] = list(config["dependencies"])
+
+	extras = devenv.extras_to_install if selected else sorted(config["optional_dependencies"])
+	for extra in extras:
+		groups[f"extras.{extra}"] = list(config["optional_dependencies"][extra])
+
+	if selected:
+		test_requirements_file = devenv.test_requirements_file
+	else:
+		test_requirements_file = devenv.project_dir / "tests" / "requirements.txt"
+
+	if test_requirements_file is not None and test_requirements_file.is_file():
+		groups["tests"] = sorted(read_requirements(test_requirements_file)[0])
+
+	if not selected:
+		groups["build"] = list(config["build_dependencies"] or [])
+	elif devenv.build and config["build_dependencies"]:
+		groups["build"] = list(config["build_dependencies"])
+
+	return groups
+
+
+def requirements_hash(devenv: "_Devenv") -> str:
+	"""
+	Returns a hash of the project's requirements, used to determine whether the lockfile is up to date.
+
+	:param devenv:
+	"""
+
+	groups = {name: sorted(map(str, reqs)) for name, reqs in requirement_groups(devenv).items()}
+	return hashlib.sha256(json.dumps(groups, sort_keys=True).encode("UTF-8")).hexdigest()
+
+
+def _resolve(devenv: "_Devenv", requirements: Iterable[Requirement]) -> Dict[str, Any]:
+	"""
+	Resolve the given requirements with ``pip install --dry-run --report``, without installing anything.
+
+	:param devenv:
+	:param requirements:
+	"""
+
+	# 3rd party
+	from virtualenv.app_data import make_app_data  # type: ignore[import-untyped]
+
+	# this package
+	from pyproject_devenv import pip_wheel_env_run
+	from pyproject_devenv.discovery import find_interpreter
+	from pyproject_devenv.installers import PipInstaller
+
+	# Found in the same way as when creating the devenv, so specifiers such as '3.9' work too.
+	executable = sys.executable if devenv.python is None else find_interpreter(devenv.python).executable
+
+	app_data = make_app_data(None, read_only=False, env=os.environ)
+	env = pip_wheel_env_run([], app_data)
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		report_file = PathPlus(tmpdir) / "report.json"
+
+		args = [
+				"install",
+				"--dry-run",
+				"--ignore-installed",
+				"--report",
+				str(report_file),
+				*map(str, requirements),
+				]
+
+		# Only pip can produce an installation report.
+		pip = PipInstaller(verbosity=devenv.verbosity, cache_dir=devenv.pip_cache_dir)
+		returncode = pip.run(executable, args, env)
+
+		if returncode != 0:  # pragma: no cover
+			raise RuntimeError(f"pip exited with code {returncode}")
+
+		return json.loads(report_file.read_text())
+
+
+def _closure(
+		requirements: Iterable[Requirement],
+		resolved: Mapping[str, Dict[str, Any]],
+		environment: Dict[str, str],
+		) -> List[str]:
+	"""
+	Returns the normalized names of the given requirements and all of their dependencies.
+
+	:param requirements:
+	:param resolved: Mapping of normalized names to entries in pip's installation report.
+	:param environment: The environment to evaluate markers in.
+	"""
+
+	queue: Deque[Requirement] = deque(req for req in requirements if evaluate_marker(req, environment))
+	names: Set[str] = set()
+	seen: Set[str] = set()
+
+	while queue:
+		requirement = queue.popleft()
+		name = canonicalize_name(requirement.name)
+		names.add(name)
+
+		key = f"{name}[{','.join(sorted(requirement.extras))}]"
+		if key in seen or name not in resolved:
+			continue
+		seen.add(key)
+
+		for requirement_string in resolved[name]["metadata"].get("requires_dist", []):
+			try:
+				dependency = Requirement(requirement_string)
+			except InvalidRequirement:  # pragma: no cover
+				continue
+
+			if any(evaluate_marker(dependency, environment, extra) for extra in ('', *requirement.extras)):
+				queue.append(dependency)
+
+	return sorted(names & set(resolved))
+
+
+def _package_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+	download_info = item.get("download_info", {})
+	entry: Dict[str, Any] = {"version": item["metadata"]["version"]}
+
+	if "archive_info" in download_info and not item.get("is_direct", False):
+		archive_info = download_info["archive_info"]
+		hashes = archive_info.get("hashes")
+		if not hashes and "hash" in archive_info:
+			algorithm, digest = archive_info["hash"].split('=', 1)
+			hashes = {algorithm: digest}
+		entry["hashes"] = [f"{algorithm}:{digest}" for algorithm, digest in sorted((hashes or {}).items())]
+	else:
+		# Local directories, VCS checkouts and direct URLs are installed from where they were found.
+		entry["url"] = download_info["url"]
+
+	return entry
+
+
+def create_lockfile(devenv: "_Devenv") -> PathPlus:
+	"""
+	Resolve every group of requirements for the project at once, and write the lockfile.
+
+	:param devenv:
+
+	:returns: The path to the lockfile.
+	"""
+
+	groups = requirement_groups(devenv)
+
+	all_requirements: Dict[str, Requirement] = {}
+	for requirements in groups.values():
+		for req in requirements:
+			all_requirements.setdefault(str(req), req)
+
+	report = _resolve(devenv, all_requirements.values())
+	environment = report["environment"]
+	resolved: Dict[str, Dict[str, Any]] = {
+			canonicalize_name(item["metadata"]["name"]): item
+			for item in report["install"]
+			}
+
+	lockfile: Dict[str, Any] = {
+			"lock-version": LOCK_VERSION,
+			"requirements-hash": requirements_hash(devenv),
+			"environment": environment,
+			"packages": {name: _package_entry(item) for name, item in sorted(resolved.items())},
+			"groups": {"extras": {}},
+			}
+
+	for group, requirements in groups.items():
+		names = _closure(requirements, resolved, environment)
+		if group.startswith("extras."):
+			lockfile["groups"]["extras"][group[7:]] = names
+		else:
+			lockfile["groups"][group] = names
+
+	filename = devenv.project_dir / LOCKFILE_NAME
+	dump_lockfile(lockfile, filename)
+	return filename
+
+
+def dump_lockfile(lockfile: Mapping[str, Any], filename: PathLike) -> None:
+	"""
+	Write the lockfile to the given file.
+
+	:param lockfile:
+	:param filename:
+	"""
+
+	header = "# This file was generated by pyproject-devenv. Do not edit it by hand.\n"
+	PathPlus(filename).write_clean(header + dom_toml.dumps(lockfile))
+
+
+def load_lockfile(filename: PathLike) -> Dict[str, Any]:
+	"""
+	Load the lockfile from the given file.
+
+	:param filename:
+	"""
+
+	filename = PathPlus(filename)
+
+	if not filename.is_file():
+		raise BadConfigError(f"The lockfile {filename.as_posix()!r} was not found. Run 'pyproject-devenv lock' first.")
+
+	lockfile = dom_toml.load(filename)
+
+	if lockfile.get("lock-version") != LOCK_VERSION:
+		raise BadConfigError(f"Unsupported lockfile version {lockfile.get('lock-version')!r}")
+
+	return lockfile
+
+
+def check_environment(lockfile: Mapping[str, Any], environment: Mapping[str, str]) -> None:
+	"""
+	Check the lockfile was created for an interpreter and platform matching the given environment.
+
+	The versions recorded in the lockfile were resolved for that interpreter,
+	and may not be installable in (or may be missing dependencies for) any other.
+
+	:param lockfile:
+	:param environment: The environment used to evaluate markers for the interpreter being installed into.
+
+	:raises: :exc:`dom_toml.parser.BadConfigError` if the environments differ.
+	"""
+
+	locked_environment = lockfile.get("environment", {})
+
+	mismatches = [
+			f"{marker} {locked_environment.get(marker)!r} != {environment.get(marker)!r}"
+			for marker in ENVIRONMENT_MARKERS
+			if locked_environment.get(marker) != environment.get(marker)
+			]
+
+	if mismatches:
+		raise BadConfigError(
+				"The lockfile was created for a different interpreter or platform "
+				f"({', '.join(mismatches)}). Run 'pyproject-devenv lock' with this interpreter to update it."
+				)
+
+
+def locked_requirements(
+		lockfile: Mapping[str, Any],
+		*,
+		project: bool = True,
+		extras: Iterable[str] = (),
+		tests: bool = True,
+		build: bool = True,
+		) -> List[str]:
+	"""
+	Returns pinned requirement lines for the given groups, for use in a requirements file.
+
+	:param lockfile:
+	:param project: Whether to include the project's requirements.
+	:param extras: The extras to include.
+	:param tests: Whether to include the test requirements.
+	:param build: Whether to include the build requirements.
+	"""
+
+	groups = lockfile["groups"]
+	names: Set[str] = set()
+
+	if project:
+		names.update(groups.get("project", []))
+	if tests:
+		names.update(groups.get("tests", []))
+	if build:
+		names.update(groups.get("build", []))
+	for extra in extras:
+		names.update(groups["extras"].get(extra, []))
+
+	packages = [(name, lockfile["packages"][name]) for name in sorted(names)]
+
+	# pip requires hashes for every requirement or none of them.
+	use_hashes = all("url" not in package and package.get("hashes") for name, package in packages)
+
+	lines = []
+	for name, package in packages:
+		if "url" in package:
+			lines.append(f"{name} @ {package['url']}")
+		elif use_hashes:
+			hashes = ' '.join(f"--hash={h}" for h in package["hashes"])
+			lines.append(f"{name}=={package['version']} {hashes}")
+		else:
+			lines.append(f"{name}=={package['version']}")
+
+	return lines
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+#
+#  output.py
+"""
+Stream the output of installers to the terminal as it is produced,
+keeping only the last few lines in memory.
+
+.. versionadded:: 0.4.0
+"""  # noqa: D400
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import os
+import subprocess
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import IO, Deque, Iterator, List, Mapping, Optional, Sequence
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = ("DEFAULT_TAIL_LINES", "StreamedOutput", "run_streamed", "stream_stderr")
+
+#: The number of lines of output kept by :class:`~.StreamedOutput` by default.
+DEFAULT_TAIL_LINES = 40
+
+# Longer lines are read in chunks of this size, so a single huge line can't exhaust memory.
+_CHUNK_SIZE = 64 * 1024
+
+
+class StreamedOutput:
+	"""
+	Copies the output of subprocesses to this process's stdout and stderr line by line,
+	keeping the last ``max_lines`` lines for error messages.
+
+	The output is written to the file descriptors directly, as if the subprocess had inherited them.
+
+	:param max_lines: The number of lines to keep.
+	:param log_file: If given, all output is also appended to this file.
+	:param echo: Whether to write the output to stdout and stderr.
+	"""  # noqa: D400
+
+	def __init__(
+			self,
+			*,
+			max_lines: int = DEFAULT_TAIL_LINES,
+			log_file: Optional[PathLike] = None,
+			echo: bool = True,
+			):
+		self.log_file: Optional[PathPlus] = None if log_file is None else PathPlus(log_file)
+		self.echo: bool = echo
+		self._tail: Deque[str] = deque(maxlen=max_lines)
+
+	@property
+	def tail(self) -> List[str]:
+		"""
+		The last lines of output since :meth:`~.StreamedOutput.clear` was last called, without line endings.
+		"""
+
+		return list(self._tail)
+
+	def clear(self) -> None:
+		"""
+		Forget the lines kept so far, e.g. before running another command.
+		"""
+
+		self._tail.clear()
+
+	def stream(self, stream: IO[bytes], until: Optional[bytes] = None, *, stderr: bool = False) -> bool:
+		"""
+		Copy lines from ``stream`` until it is closed.
+
+		:param stream:
+		:param until: Stop after a line ending with this marker, which is not copied.
+		:param stderr: Whether ``stream`` is the subprocess's stderr, and should be copied to stderr.
+
+		:returns: Whether the marker was found.
+		"""
+
+		log = None if self.log_file is None else self.log_file.open("ab")
+		previous = b''
+
+		try:
+			while True:
+				line = stream.readline(_CHUNK_SIZE)
+				if not line:
+					return False
+
+				found = until is not None and (previous + line).endswith(until)
+				if found:
+					line = line[:max(len(line) - len(until or b''), 0)]
+
+				if line:
+					self._write(line, log, sys.stderr if stderr else sys.stdout, 2 if stderr else 1)
+
+				if found:
+					return True
+
+				previous = line[-len(until):] if until is not None and not line.endswith(b'\n') else b''
+		finally:
+			if log is not None:
+				log.close()
+
+	def _write(self, line: bytes, log: Optional[IO[bytes]], echo_to: IO[str], fd: int) -> None:
+		if log is not None:
+			log.write(line)
+			log.flush()
+
+		if self.echo:
+			# Anything already written by this process comes first.
+			echo_to.flush()
+			view = memoryview(line)
+			while view:
+				view = view[os.write(fd, view):]
+
+		self._tail.append(line.decode("UTF-8", errors="replace").rstrip("\r\n"))
+
+
+def run_streamed(command: Sequence[str], env: Mapping[str, str], output: StreamedOutput) -> int:
+	"""
+	Run the command, streaming its stdout and stderr through ``output``, and return its exit status.
+
+	:param command:
+	:param env: The environment variables for the subprocess.
+	:param output:
+	"""
+
+	output.clear()
+
+	with subprocess.Popen(
+			list(command),
+			# Otherwise Python buffers stdout, but not stderr, when writing to a pipe, so the lines are out of order.
+			env={**env, "PYTHONUNBUFFERED": '1'},
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			) as process:
+		assert process.stdout is not None
+		assert process.stderr is not None
+
+		with stream_stderr(output, process.stderr):
+			output.stream(process.stdout)
+
+		return process.wait()
+
+
+@contextmanager
+def stream_stderr(output: StreamedOutput, stream: IO[bytes], until: Optional[bytes] = None) -> Iterator[None]:
+	"""
+	Context manager which copies lines from ``stream`` to :data:`sys.stderr` in a background thread,
+	while the body of the ``with`` block reads the subprocess's stdout.
+
+	The context manager waits for the thread to finish on exit.
+
+	:param output:
+	:param stream: The subprocess's stderr.
+	:param until: Stop after a line ending with this marker, which is not copied.
+	"""  # noqa: D400
+
+	thread = threading.Thread(target=output.stream, args=(stream, until), kwargs={"stderr": True}, daemon=True)
+	thread.start()
+
+	try:
+		yield
+	finally:
+		thread.join()
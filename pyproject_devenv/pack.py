@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+#
+#  pack.py
+"""
+Pack virtualenvs into relocatable archives, e.g. to cache them between CI jobs, and unpack them elsewhere.
+
+Archives are ZIP files, so their members can be decompressed in parallel when unpacking.
+The absolute paths in :file:`pyvenv.cfg`, activation scripts, console script shebangs,
+``.pth`` files and symlinks are rewritten for the virtualenv's new location.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import posixpath
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PureWindowsPath
+from typing import Any, Dict, Iterable, List, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from pyproject_devenv.relocate import _needs_rewrite
+
+__all__ = ("MANIFEST_NAME", "PACK_VERSION", "pack_venv", "read_manifest", "unpack_venv")
+
+#: The name of the archive member which describes the packed virtualenv.
+MANIFEST_NAME = "pyproject-devenv-pack.json"
+
+#: The version of the archive format.
+PACK_VERSION = 1
+
+# Files are copied out of the archive in chunks of this size.
+_CHUNK_SIZE = 1024 * 1024
+
+
+def pack_venv(
+		venv_dir: PathLike,
+		archive: PathLike,
+		*,
+		fingerprint: Optional[str] = None,
+		compresslevel: int = 6,
+		) -> PathPlus:
+	"""
+	Pack the virtualenv at ``venv_dir`` into a relocatable archive.
+
+	The archive is written to a temporary file first and then moved into place,
+	replacing any existing archive.
+
+	:param venv_dir:
+	:param archive: The filename of the archive.
+	:param fingerprint: The fingerprint of the inputs the virtualenv was created from,
+		which is recorded in the archive's manifest.
+	:param compresslevel: The DEFLATE compression level, from ``0`` (fastest) to ``9`` (smallest).
+
+	:returns: The path to the archive.
+	"""
+
+	venv_dir = PathPlus(os.path.abspath(venv_dir))
+	archive = PathPlus(os.path.abspath(archive))
+
+	if not (venv_dir / "pyvenv.cfg").is_file():
+		raise FileNotFoundError(f"No virtualenv found at {venv_dir.as_posix()!r}")
+
+	manifest: Dict[str, Any] = {
+			"version": PACK_VERSION,
+			"prefix": os.fspath(venv_dir),
+			"fingerprint": fingerprint,
+			"directories": [],
+			"symlinks": {},
+			# Zip files only record modification times to the nearest two seconds.
+			# The exact times are needed so that bytecode caches stay valid.
+			"mtimes": {},
+			}
+
+	tmp_file = archive.parent / f".{archive.name}.{os.getpid()}"
+
+	try:
+		with zipfile.ZipFile(tmp_file, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+			for dirpath, dirnames, filenames in os.walk(venv_dir):
+				relative_dir = os.path.relpath(dirpath, venv_dir)
+
+				for name in sorted(dirnames + filenames):
+					path = os.path.join(dirpath, name)
+					relative_path = os.path.normpath(os.path.join(relative_dir, name)).replace(os.sep, '/')
+
+					if os.path.islink(path):
+						manifest["symlinks"][relative_path] = os.readlink(path)
+						if name in dirnames:
+							dirnames.remove(name)
+					elif name in dirnames:
+						manifest["directories"].append(relative_path)
+					else:
+						zf.write(path, relative_path)
+						manifest["mtimes"][relative_path] = os.stat(path).st_mtime_ns
+
+			zf.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+		os.replace(tmp_file, archive)
+	finally:
+		if tmp_file.exists():
+			tmp_file.unlink()
+
+	return archive
+
+
+def read_manifest(archive: PathLike) -> Dict[str, Any]:
+	"""
+	Returns the manifest of an archive created by :func:`~.pack_venv`.
+
+	:param archive:
+
+	:raises: :exc:`ValueError` if the file is not such an archive, or was created by an incompatible version.
+	"""
+
+	try:
+		with zipfile.ZipFile(archive) as zf:
+			manifest = json.loads(zf.read(MANIFEST_NAME))
+	except (zipfile.BadZipFile, KeyError):
+		raise ValueError(f"{os.fspath(archive)!r} is not a packed virtualenv.")
+
+	if manifest.get("version") != PACK_VERSION:
+		raise ValueError(f"The packed virtualenv {os.fspath(archive)!r} is from an incompatible version.")
+
+	return manifest
+
+
+def _check_paths(archive: PathLike, paths: Iterable[str], symlinks: Dict[str, str]) -> None:
+	"""
+	Check the paths in an archive are all inside the virtualenv,
+	so a malicious archive can't overwrite files elsewhere.
+
+	Symlinks may point to absolute paths, as the interpreter is linked to from outside the virtualenv,
+	but relative links may not point outside it.
+
+	:param archive:
+	:param paths: The relative paths of the files and directories in the archive.
+	:param symlinks: Mapping of the relative paths of symlinks to their targets.
+
+	:raises: :exc:`ValueError` if any path is outside the virtualenv.
+	"""  # noqa: D400
+
+	def is_outside(path: str) -> bool:
+		# Checked with Windows' rules too, which also treat backslashes as separators and allow drive letters.
+		windows_path = PureWindowsPath(path)
+		return posixpath.isabs(path) or bool(windows_path.anchor) or ".." in windows_path.parts
+
+	for path in [*paths, *symlinks]:
+		if not path or is_outside(path):
+			raise ValueError(f"The packed virtualenv {os.fspath(archive)!r} contains the unsafe path {path!r}.")
+
+	for path, target in symlinks.items():
+		if posixpath.isabs(target) or PureWindowsPath(target).anchor:
+			continue
+
+		if is_outside(posixpath.normpath(posixpath.join(posixpath.dirname(path), target.replace('\\', '/')))):
+			raise ValueError(
+					f"The packed virtualenv {os.fspath(archive)!r} contains a symlink {path!r} "
+					f"pointing outside it to {target!r}."
+					)
+
+
+def unpack_venv(archive: PathLike, venv_dir: PathLike, *, jobs: Optional[int] = None) -> Dict[str, Any]:
+	"""
+	Unpack an archive created by :func:`~.pack_venv` into ``venv_dir``, rewriting paths for the new location.
+
+	Files are decompressed by several threads at once.
+	The virtualenv is unpacked into a temporary directory next to ``venv_dir`` and then moved into place,
+	replacing any existing virtualenv.
+
+	:param archive:
+	:param venv_dir:
+	:param jobs: The number of threads to use.
+		By default the same number as :class:`~concurrent.futures.ThreadPoolExecutor` uses.
+
+	:returns: The archive's manifest.
+
+	:raises: :exc:`ValueError` if the archive contains paths outside of the virtualenv.
+	"""
+
+	manifest = read_manifest(archive)
+
+	with zipfile.ZipFile(archive) as zf:
+		members = [info for info in zf.infolist() if info.filename != MANIFEST_NAME]
+
+	_check_paths(archive, [*manifest["directories"], *(info.filename for info in members)], manifest["symlinks"])
+
+	venv_dir = PathPlus(os.path.abspath(venv_dir))
+	old_prefix = os.fsencode(manifest["prefix"])
+	new_prefix = os.fsencode(venv_dir)
+
+	tmp_dir = venv_dir.parent / f".{venv_dir.name}.pyproject-devenv-tmp"
+	if tmp_dir.exists():  # pragma: no cover
+		shutil.rmtree(tmp_dir)
+
+	tmp_dir.mkdir(parents=True)
+
+	for directory in manifest["directories"]:
+		(tmp_dir / directory).mkdir(parents=True, exist_ok=True)
+
+	# Each thread reads the archive through its own file object.
+	local = threading.local()
+	handles: List[zipfile.ZipFile] = []
+	handles_lock = threading.Lock()
+
+	def extract(info: zipfile.ZipInfo) -> None:
+		zf = getattr(local, "zipfile", None)
+		if zf is None:
+			zf = local.zipfile = zipfile.ZipFile(archive)
+			with handles_lock:
+				handles.append(zf)
+
+		target = os.path.join(tmp_dir, info.filename)
+
+		with zf.open(info) as src, open(target, "wb") as dst:
+			if _needs_rewrite(info.filename):
+				dst.write(src.read().replace(old_prefix, new_prefix))
+			else:
+				shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+
+		mode = (info.external_attr >> 16) & 0o7777
+		if mode:
+			os.chmod(target, mode)
+
+		mtime = manifest["mtimes"].get(info.filename)
+		if mtime is not None:
+			os.utime(target, ns=(mtime, mtime))
+
+	try:
+		# The largest files first, so one isn't left decompressing on its own at the end.
+		members.sort(key=lambda info: info.file_size, reverse=True)
+
+		with ThreadPoolExecutor(jobs) as executor:
+			for _ in executor.map(extract, members):
+				pass
+
+		for relative_path, target in manifest["symlinks"].items():
+			target_bytes = os.fsencode(target)
+			if target_bytes.startswith(old_prefix):
+				target = os.fsdecode(new_prefix + target_bytes[len(old_prefix):])
+			os.symlink(target, tmp_dir / relative_path)
+
+	except BaseException:
+		shutil.rmtree(tmp_dir)
+		raise
+
+	finally:
+		for handle in handles:
+			handle.close()
+
+	if venv_dir.exists():
+		old_dir = venv_dir.parent / f".{venv_dir.name}.pyproject-devenv-old"
+		os.replace(venv_dir, old_dir)
+		os.replace(tmp_dir, venv_dir)
+		shutil.rmtree(old_dir)
+	else:
+		os.replace(tmp_dir, venv_dir)
+
+	return manifest
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+#
+#  pip_worker.py
+"""
+A long-lived pip process which installs several groups of requirements.
+
+Starting an interpreter and importing pip takes around a second, which is paid for every group of
+requirements when pip is run once per group. The worker is started once inside the virtualenv and imports pip
+and the modules used by ``pip install`` up front. It receives each ``pip`` command line over a pipe,
+runs it in a forked copy of itself, and reports the outcome of each one.
+
+Forking means each command starts from the same warmed-up state, and any state left behind by a command
+(such as the import audit hook installed by ``pip install`` in recent versions of pip) doesn't affect the next.
+The worker is therefore only available on platforms which support :func:`os.fork`.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import subprocess
+from typing import TYPE_CHECKING, IO, List, Mapping, NamedTuple, Optional, Sequence
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv.output import StreamedOutput
+
+__all__ = ("PipJobResult", "PipWorker")
+
+_WORKER_SCRIPT = """
+import importlib, json, os, sys, time, traceback
+
+results = os.fdopen(int(os.environ.pop("PYPROJECT_DEVENV_WORKER_FD")), "w")
+end_marker = bytes.fromhex(os.environ.pop("PYPROJECT_DEVENV_WORKER_END_MARKER", ""))
+
+from pip._internal.cli.main import main
+
+# Import the modules used by most commands once, rather than in every job.
+for module in (
+		"pip._internal.commands.install",
+		"pip._internal.commands.uninstall",
+		"pip._internal.operations.install.wheel",
+		"pip._internal.resolution.resolvelib.resolver",
+		"pip._internal.network.session",
+		"pip._internal.index.package_finder",
+		"pip._vendor.packaging._manylinux",
+		"pip._vendor.packaging._musllinux",
+		"pip._vendor.rich.console",
+		):
+	try:
+		importlib.import_module(module)
+	except ImportError:
+		pass
+
+def run(args):
+	try:
+		return main(args) or 0
+	except SystemExit as e:
+		return e.code if isinstance(e.code, int) else int(e.code is not None)
+
+for line in sys.stdin:
+	job = json.loads(line)
+	error = None
+	start = time.perf_counter()
+
+	pid = os.fork()
+	if pid == 0:
+		try:
+			returncode = run(job["args"])
+		except BaseException:
+			traceback.print_exc()
+			returncode = 1
+		sys.stdout.flush()
+		sys.stderr.flush()
+		os._exit(returncode)
+
+	_, status = os.waitpid(pid, 0)
+	if os.WIFEXITED(status):
+		returncode = os.WEXITSTATUS(status)
+	else:
+		returncode = 1
+		error = "pip was terminated by signal {}".format(os.WTERMSIG(status))
+
+	if end_marker:
+		os.write(1, end_marker)
+		os.write(2, end_marker)
+
+	result = {"returncode": returncode, "duration": time.perf_counter() - start, "error": error}
+	results.write(json.dumps(result) + "\\n")
+	results.flush()
+"""
+
+
+# Written to the worker's stdout after each command, so the output of one command can be told from the next.
+_END_MARKER = b"\x00pyproject-devenv-pip-worker-end\n"
+
+
+class PipJobResult(NamedTuple):
+	"""
+	The outcome of a single pip command run by a :class:`~.PipWorker`.
+	"""
+
+	#: The arguments passed to pip, e.g. ``["install", "click"]``.
+	args: List[str]
+
+	#: pip's exit status.
+	returncode: int
+
+	#: The time taken to run the command, in seconds.
+	duration: float
+
+	#: A description of the error, if pip didn't exit normally.
+	error: Optional[str]
+
+
+class PipWorker:
+	"""
+	Runs pip commands from a single, long-lived Python process.
+
+	Not supported on Windows.
+
+	:param executable: The Python executable to run pip with, usually the virtualenv's.
+	:param env: The environment variables for the worker process.
+		``PYTHONPATH`` may be used to point to a copy of pip outside the virtualenv.
+	:param output: Streams pip's output while each command runs. If not given,
+		the worker process's output is not captured, so pip's output is shown as usual.
+
+	.. versionchanged:: 0.4.0  Added the ``output`` keyword argument.
+	"""
+
+	def __init__(
+			self,
+			executable: PathLike,
+			env: Optional[Mapping[str, str]] = None,
+			*,
+			output: Optional["StreamedOutput"] = None,
+			):
+		self.executable: str = os.fspath(executable)
+		self.output: Optional["StreamedOutput"] = output
+
+		#: The results of the commands run so far.
+		self.results: List[PipJobResult] = []
+
+		read_fd, write_fd = os.pipe()
+		env = dict(os.environ if env is None else env)
+		env["PYPROJECT_DEVENV_WORKER_FD"] = str(write_fd)
+
+		if output is not None:
+			env["PYPROJECT_DEVENV_WORKER_END_MARKER"] = _END_MARKER.hex()
+			env["PYTHONUNBUFFERED"] = '1'
+
+		try:
+			self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+				[self.executable, "-c", _WORKER_SCRIPT],
+				stdin=subprocess.PIPE,
+				stdout=None if output is None else subprocess.PIPE,
+				stderr=None if output is None else subprocess.PIPE,
+				env=env,
+				pass_fds=(write_fd, ),
+				)
+		finally:
+			os.close(write_fd)
+
+		self._results: IO[str] = os.fdopen(read_fd, encoding="UTF-8")
+
+	def run(self, args: Sequence[str]) -> PipJobResult:
+		"""
+		Run pip with the given arguments, and wait for it to finish.
+
+		:param args: The arguments to pass to pip, starting with the command (e.g. ``install``).
+
+		:raises: :exc:`RuntimeError` if the worker process has exited.
+		"""
+
+		assert self._process.stdin is not None
+
+		try:
+			self._process.stdin.write(json.dumps({"args": list(args)}).encode("UTF-8") + b'\n')
+			self._process.stdin.flush()
+		except OSError:
+			raise RuntimeError("The pip worker process exited unexpectedly.")
+
+		if self.output is not None:
+			# this package
+			from pyproject_devenv.output import stream_stderr
+
+			assert self._process.stdout is not None
+			assert self._process.stderr is not None
+			self.output.clear()
+
+			# The worker writes the marker to stdout and stderr once the command has finished, after all of its output.
+			with stream_stderr(self.output, self._process.stderr, until=_END_MARKER):
+				self.output.stream(self._process.stdout, until=_END_MARKER)
+
+		line = self._results.readline()
+
+		if not line:
+			raise RuntimeError("The pip worker process exited unexpectedly.")
+
+		data = json.loads(line)
+		result = PipJobResult(list(args), data["returncode"], data["duration"], data["error"])
+		self.results.append(result)
+		return result
+
+	def close(self) -> None:
+		"""
+		Stop the worker process.
+		"""
+
+		if self._process.stdin is not None and not self._process.stdin.closed:
+			self._process.stdin.close()
+
+		try:
+			self._process.wait(timeout=30)
+		except subprocess.TimeoutExpired:  # pragma: no cover
+			self._process.kill()
+			self._process.wait()
+
+		self._results.close()
+
+		for stream in (self._process.stdout, self._process.stderr):
+			if stream is not None:
+				stream.close()
+
+	def __enter__(self) -> "PipWorker":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
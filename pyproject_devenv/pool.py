@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+#
+#  pool.py
+"""
+A pool of pre-built devenvs, handed out to short-lived jobs (e.g. CI workers) which need them straight away.
+
+The pool keeps a number of ready-to-use devenvs for each fingerprint
+(see :meth:`_Devenv.fingerprint() <pyproject_devenv._Devenv.fingerprint>`),
+which covers the project's requirements and the interpreter.
+A devenv is handed out by renaming it into the job's virtualenv directory and updating the few files
+which contain its path, so the pool must be on the same filesystem as the jobs' virtualenvs for this to be fast.
+Otherwise it is copied.
+
+The pool directory is laid out as follows:
+
+.. code-block:: text
+
+	<pool>/<fingerprint>/building/<slot>  # devenvs being created
+	<pool>/<fingerprint>/ready/<slot>     # devenvs which can be handed out
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import copy
+import errno
+import os
+import shutil
+import sys
+import time
+import uuid
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv import _Devenv
+	from pyproject_devenv.batch import BuildResult
+
+__all__ = ("DevenvPool", "PoolProject", "read_pool_config", "serve_pool")
+
+
+class PoolProject(NamedTuple):
+	"""
+	A project whose devenvs are kept in a :class:`~.DevenvPool` by :func:`~.serve_pool`.
+	"""
+
+	#: The root of the project.
+	project_dir: PathPlus
+
+	#: The number of ready devenvs to keep for each interpreter.
+	size: int
+
+	#: The Python interpreters to keep devenvs for, as paths or specifiers such as ``python3.9``.
+	#: :py:obj:`None` means the interpreter ``pyproject-devenv`` is running under.
+	pythons: Sequence[Optional[str]] = (None, )
+
+	#: The extras to install. :py:obj:`None` means all of them.
+	extras: Optional[List[str]] = None
+
+
+def read_pool_config(filename: PathLike, *, default_size: int = 2) -> List[PoolProject]:
+	"""
+	Read the projects to keep devenvs for from a TOML file.
+
+	Each project is given in a ``[[project]]`` table:
+
+	.. code-block:: toml
+
+		[[project]]
+		path = "../my-project"  # relative to the configuration file
+		size = 4  # optional
+		python = ["3.11", "3.12"]  # optional
+		extras = ["docs"]  # optional
+
+	:param filename:
+	:param default_size: The number of ready devenvs to keep for projects which don't specify a ``size``.
+
+	:raises: :exc:`dom_toml.parser.BadConfigError` if the configuration is invalid.
+	"""
+
+	# 3rd party
+	import dom_toml
+	from dom_toml.parser import BadConfigError
+
+	filename = PathPlus(filename)
+	config = dom_toml.load(filename)
+	projects = []
+
+	tables = config.get("project", [])
+	if not isinstance(tables, list):
+		raise BadConfigError(f"Invalid type for 'project' in {filename.as_posix()!r}: expected an array of tables")
+
+	for table in tables:
+		if not isinstance(table, dict) or not isinstance(table.get("path"), str):
+			raise BadConfigError(f"Each [[project]] in {filename.as_posix()!r} must have a 'path'.")
+
+		size = table.get("size", default_size)
+		if not isinstance(size, int) or isinstance(size, bool) or size < 0:
+			raise BadConfigError(f"Invalid 'size' for project {table['path']!r}: expected a non-negative integer.")
+
+		pythons = table.get("python", [None])
+		if isinstance(pythons, str):
+			pythons = [pythons]
+
+		extras = table.get("extras")
+		if extras is not None and not isinstance(extras, list):
+			raise BadConfigError(f"Invalid 'extras' for project {table['path']!r}: expected a list of strings.")
+
+		projects.append(PoolProject((filename.parent / table["path"]).abspath(), size, pythons, extras))
+
+	return projects
+
+
+def _pid_alive(pid: int) -> bool:
+	if sys.platform == "win32":  # pragma: no cover (!Windows)
+		# The slot can't be proven abandoned.
+		return True
+
+	try:
+		os.kill(pid, 0)
+	except ProcessLookupError:
+		return False
+	except PermissionError:  # pragma: no cover
+		return True
+
+	return True
+
+
+def _remove_dir(path: PathPlus) -> None:
+	# Moved aside first, so the pool never contains a partially removed devenv.
+	deleting = path.parent / f".{path.name}.deleting-{os.getpid()}"
+
+	try:
+		os.rename(path, deleting)
+	except FileNotFoundError:  # pragma: no cover
+		return
+
+	shutil.rmtree(deleting, ignore_errors=True)
+
+
+class DevenvPool:
+	"""
+	A pool of pre-built devenvs.
+
+	:param pool_dir: The directory containing the pool.
+	"""
+
+	def __init__(self, pool_dir: PathLike):
+		#: The directory containing the pool.
+		self.pool_dir: PathPlus = PathPlus(os.path.abspath(pool_dir))
+
+	def ready_dir(self, fingerprint: str) -> PathPlus:
+		"""
+		Returns the directory containing the ready devenvs with the given fingerprint.
+
+		:param fingerprint:
+		"""
+
+		return self.pool_dir / fingerprint / "ready"
+
+	def building_dir(self, fingerprint: str) -> PathPlus:
+		"""
+		Returns the directory containing the devenvs with the given fingerprint which are being created.
+
+		A devenv is created in this directory, and moved to :meth:`~.DevenvPool.ready_dir` once it is complete.
+
+		:param fingerprint:
+		"""
+
+		return self.pool_dir / fingerprint / "building"
+
+	@staticmethod
+	def _slots(directory: PathPlus) -> List[PathPlus]:
+		if not directory.is_dir():
+			return []
+
+		return sorted(path for path in directory.iterdir() if not path.name.startswith('.'))
+
+	def available(self, devenv: "_Devenv") -> int:
+		"""
+		Returns the number of ready devenvs in the pool which could be handed out for ``devenv``.
+
+		:param devenv:
+		"""
+
+		return len(self._slots(self.ready_dir(devenv.fingerprint())))
+
+	def building(self, devenv: "_Devenv") -> int:
+		"""
+		Returns the number of devenvs for ``devenv`` which are being created, e.g. by another process.
+
+		Devenvs left behind by processes which have since exited are removed.
+
+		:param devenv:
+		"""
+
+		count = 0
+
+		for slot in self._slots(self.building_dir(devenv.fingerprint())):
+			pid = slot.name.partition('-')[0]
+
+			if pid.isdigit() and not _pid_alive(int(pid)):
+				_remove_dir(slot)
+			else:
+				count += 1
+
+		return count
+
+	def take(self, devenv: "_Devenv") -> bool:
+		"""
+		Hand out a ready devenv from the pool into ``devenv.venv_dir``, replacing any existing virtualenv there.
+
+		The devenv is claimed by renaming it, so each one is only handed out once
+		even when several processes take from the pool at the same time.
+
+		:param devenv:
+
+		:returns: Whether there was a ready devenv in the pool.
+		"""
+
+		fingerprint = devenv.fingerprint()
+		venv_dir = PathPlus(os.path.abspath(devenv.venv_dir))
+		venv_dir.parent.maybe_make(parents=True)
+
+		tmp_dir = venv_dir.parent / f".{venv_dir.name}.pyproject-devenv-tmp"
+		if tmp_dir.exists():  # pragma: no cover
+			shutil.rmtree(tmp_dir)
+
+		for slot in self._slots(self.ready_dir(fingerprint)):
+			if self._claim(slot, tmp_dir, venv_dir):
+				break
+		else:
+			return False
+
+		if venv_dir.exists():
+			old_dir = venv_dir.parent / f".{venv_dir.name}.pyproject-devenv-old"
+			os.replace(venv_dir, old_dir)
+			os.replace(tmp_dir, venv_dir)
+			shutil.rmtree(old_dir)
+		else:
+			os.replace(tmp_dir, venv_dir)
+
+		return True
+
+	def _claim(self, slot: PathPlus, tmp_dir: PathPlus, venv_dir: PathPlus) -> bool:
+		"""
+		Move the devenv in ``slot`` to ``tmp_dir``, updating it for its eventual location ``venv_dir``.
+
+		:returns: :py:obj:`False` if another process claimed it first.
+		"""
+
+		# this package
+		from pyproject_devenv.relocate import Linker, clone_venv, relocate_venv
+
+		old_prefix = self.building_dir(slot.parent.parent.name) / slot.name
+
+		try:
+			os.rename(slot, tmp_dir)
+		except FileNotFoundError:
+			return False
+		except OSError as e:
+			if e.errno != errno.EXDEV:
+				raise
+		else:
+			relocate_venv(tmp_dir, old_prefix, new_prefix=venv_dir)
+			return True
+
+		# The pool is on a different filesystem, so the devenv is copied.
+		claimed = slot.parent / f".{slot.name}.claimed-{os.getpid()}"
+
+		try:
+			os.rename(slot, claimed)
+		except FileNotFoundError:
+			return False
+
+		try:
+			clone_venv(claimed, tmp_dir, linker=Linker(["copy"]), old_prefix=old_prefix, new_prefix=venv_dir)
+		finally:
+			shutil.rmtree(claimed, ignore_errors=True)
+
+		return True
+
+	def fill(
+			self,
+			devenv: "_Devenv",
+			size: int,
+			*,
+			jobs: Optional[int] = None,
+			callback: Optional[Callable[["BuildResult"], None]] = None,
+			) -> List["BuildResult"]:
+		"""
+		Create devenvs until the pool has ``size`` ready (or being created) for ``devenv``.
+
+		The devenvs are created concurrently with :func:`~.build_devenvs`,
+		using :meth:`_Devenv.create() <pyproject_devenv._Devenv.create>`.
+
+		:param devenv: The devenv to create copies of. Its ``venv_dir`` is ignored.
+		:param size: The number of ready devenvs to keep.
+		:param jobs: The maximum number of devenvs to create at once. Defaults to the number of CPUs.
+		:param callback: Function called with the result of each build as soon as it finishes.
+
+		:returns: The results of the builds.
+		"""
+
+		# this package
+		from pyproject_devenv.batch import build_devenvs
+
+		fingerprint = devenv.fingerprint()
+		needed = size - self.available(devenv) - self.building(devenv)
+
+		if needed <= 0:
+			return []
+
+		building_dir = self.building_dir(fingerprint)
+		building_dir.maybe_make(parents=True)
+		self.ready_dir(fingerprint).maybe_make(parents=True)
+
+		# Load the configuration now, so it is only done once rather than in every worker.
+		config = devenv.config
+
+		devenvs = []
+		for _ in range(needed):
+			slot_devenv = copy.copy(devenv)
+			slot_devenv.venv_dir = building_dir / f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+			slot_devenv.config = config
+			devenvs.append(slot_devenv)
+
+		try:
+			results = build_devenvs(devenvs, jobs=jobs, callback=callback)
+		except BaseException:
+			for slot_devenv in devenvs:
+				if slot_devenv.venv_dir.exists():
+					_remove_dir(slot_devenv.venv_dir)
+			raise
+
+		for result in results:
+			if result.success:
+				os.rename(result.venv_dir, self.ready_dir(fingerprint) / result.venv_dir.name)
+			elif result.venv_dir.exists():
+				_remove_dir(result.venv_dir)
+
+		return results
+
+	def remove_unused(self, fingerprints: Sequence[str]) -> List[str]:
+		"""
+		Remove the devenvs whose fingerprints are not in ``fingerprints``,
+		e.g. because the project's requirements have changed since they were created.
+
+		:param fingerprints: The fingerprints of the devenvs to keep.
+
+		:returns: The fingerprints which were removed.
+		"""  # noqa: D400
+
+		if not self.pool_dir.is_dir():
+			return []
+
+		removed = []
+
+		for directory in sorted(self.pool_dir.iterdir()):
+			if directory.name.startswith('.') or directory.name in fingerprints:
+				continue
+			elif any(
+					not slot.name.partition('-')[0].isdigit() or _pid_alive(int(slot.name.partition('-')[0]))
+					for slot in self._slots(directory / "building")
+					):
+				# Still being created by another process.
+				continue
+
+			_remove_dir(directory)
+			removed.append(directory.name)
+
+		return removed
+
+
+def serve_pool(
+		pool: DevenvPool,
+		projects: Callable[[], Sequence[PoolProject]],
+		*,
+		poll_interval: float = 5.0,
+		jobs: Optional[int] = None,
+		callback: Optional[Callable[["BuildResult"], None]] = None,
+		max_rounds: Optional[int] = None,
+		**kwargs,
+		) -> None:
+	r"""
+	Keep the pool filled with devenvs for the given projects, until interrupted.
+
+	Every ``poll_interval`` seconds the devenvs which have been handed out are replaced,
+	and devenvs whose project's requirements have changed are discarded.
+
+	:param pool:
+	:param projects: Function returning the projects to keep devenvs for.
+		It is called before each round, so changes to the configuration take effect without a restart.
+	:param poll_interval: The time to wait between rounds, in seconds.
+	:param jobs: The maximum number of devenvs to create at once. Defaults to the number of CPUs.
+	:param callback: Function called with the result of each build as soon as it finishes.
+	:param max_rounds: Stop after this many rounds. Mainly for testing.
+	:param \*\*kwargs: Keyword arguments passed to :class:`~pyproject_devenv._Devenv`, e.g. ``verbosity``.
+	"""
+
+	# this package
+	from pyproject_devenv import _Devenv
+
+	rounds = 0
+
+	while True:
+		fingerprints: Dict[str, None] = {}
+
+		for project in projects():
+			for python in project.pythons:
+				devenv = _Devenv(project.project_dir, python=python, extras=project.extras, **kwargs)
+				fingerprints[devenv.fingerprint()] = None
+				pool.fill(devenv, project.size, jobs=jobs, callback=callback)
+
+		pool.remove_unused(list(fingerprints))
+
+		rounds += 1
+		if max_rounds is not None and rounds >= max_rounds:
+			return
+
+		time.sleep(poll_interval)
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+#
+#  relocate.py
+"""
+Copy and move virtualenvs, fixing up the absolute paths they contain.
+
+Files are linked rather than copied where possible, using reflinks (copy-on-write clones)
+where the filesystem supports them and hardlinks otherwise.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+
+# stdlib
+import os
+import shutil
+import sys
+from typing import Callable, List, Optional
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = ("Linker", "clone_venv", "relocate_venv")
+
+# From linux/fs.h
+_FICLONE = 0x40049409
+
+
+def _reflink_linux(src: str, dst: str) -> None:  # pragma: no cover (!Linux)
+	# stdlib
+	import fcntl
+
+	with open(src, "rb") as src_fp, open(dst, "wb") as dst_fp:
+		try:
+			fcntl.ioctl(dst_fp.fileno(), _FICLONE, src_fp.fileno())
+		except OSError:
+			dst_fp.close()
+			os.unlink(dst)
+			raise
+
+	shutil.copymode(src, dst)
+
+
+def _reflink_darwin(src: str, dst: str) -> None:  # pragma: no cover (!Darwin)
+	# stdlib
+	import ctypes
+
+	libc = ctypes.CDLL(None, use_errno=True)
+	if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+		errno = ctypes.get_errno()
+		raise OSError(errno, os.strerror(errno), src)
+
+
+class Linker:
+	"""
+	Creates files which share their contents with an existing file.
+
+	The first method which works is remembered, so unsupported methods are only attempted once.
+
+	:param methods: The methods to try, in order. Any of ``"reflink"``, ``"hardlink"`` and ``"copy"``.
+	"""
+
+	def __init__(self, methods: Optional[List[str]] = None):
+		if methods is None:
+			methods = ["reflink", "hardlink", "copy"]
+
+		self.methods: List[str] = list(methods)
+
+	def _method(self, name: str) -> Callable[[str, str], object]:
+		if name == "reflink":
+			if sys.platform == "linux":  # pragma: no cover (!Linux)
+				return _reflink_linux
+			elif sys.platform == "darwin":  # pragma: no cover (!Darwin)
+				return _reflink_darwin
+			else:  # pragma: no cover (Linux or Darwin)
+				raise OSError("Reflinks are not supported on this platform.")
+		elif name == "hardlink":
+			return os.link
+		else:
+			return shutil.copy2
+
+	def link(self, src: PathLike, dst: PathLike) -> str:
+		"""
+		Create ``dst`` with the same contents as ``src``.
+
+		:param src:
+		:param dst:
+
+		:returns: The name of the method used.
+		"""
+
+		while True:
+			method = self.methods[0]
+
+			try:
+				self._method(method)(os.fspath(src), os.fspath(dst))
+				return method
+			except OSError:
+				if len(self.methods) == 1:
+					raise
+				self.methods.pop(0)
+
+
+def _needs_rewrite(relative_path: str) -> bool:
+	"""
+	Returns whether the file at the given path (relative to the root of the virtualenv)
+	may contain the virtualenv's absolute path.
+
+	:param relative_path:
+	"""  # noqa: D400
+
+	parts = os.path.normpath(relative_path).replace(os.sep, '/').split('/')
+
+	if parts == ["pyvenv.cfg"]:
+		return True
+	elif len(parts) == 2 and parts[0] in {"bin", "Scripts"}:
+		# Activation scripts, and console scripts with a shebang.
+		return not parts[1].endswith((".exe", ".dll"))
+	elif parts[-1].endswith(".pth"):
+		return True
+	else:
+		return False
+
+
+def _rewrite(src: str, dst: str, old_prefix: bytes, new_prefix: bytes) -> bool:
+	"""
+	Copy ``src`` to ``dst``, replacing ``old_prefix`` with ``new_prefix``.
+
+	:returns: :py:obj:`False` if ``src`` does not contain ``old_prefix``, in which case ``dst`` is not created.
+	"""
+
+	with open(src, "rb") as fp:
+		content = fp.read()
+
+	if old_prefix not in content:
+		return False
+
+	with open(dst, "wb") as fp:
+		fp.write(content.replace(old_prefix, new_prefix))
+
+	shutil.copymode(src, dst)
+	return True
+
+
+def clone_venv(
+		src: PathLike,
+		dst: PathLike,
+		*,
+		linker: Optional[Linker] = None,
+		old_prefix: Optional[PathLike] = None,
+		new_prefix: Optional[PathLike] = None,
+		) -> PathPlus:
+	"""
+	Clone the virtualenv at ``src`` into ``dst``.
+
+	Files which may contain the absolute path to the virtualenv (:file:`pyvenv.cfg`, activation scripts,
+	console script shebangs and ``.pth`` files) are always copied, and updated for the new location.
+	All other files are linked with ``linker``.
+
+	.. attention::
+
+		If ``linker`` uses hardlinks the two virtualenvs share files,
+		so modifying a file in place in one affects the other.
+		pip replaces files rather than modifying them.
+
+	:param src:
+	:param dst: The directory to clone the virtualenv into. Must not exist.
+	:param linker: The :class:`~.Linker` used to link files. By default reflinks are used where supported,
+		then hardlinks.
+	:param old_prefix: The absolute path the virtualenv was created at, if different from ``src``.
+	:param new_prefix: The absolute path the clone will be used at, if different from ``dst``
+		(e.g. if it will be moved into place afterwards).
+
+	:returns: The path to the new virtualenv.
+	"""
+
+	if linker is None:
+		linker = Linker()
+
+	src = os.path.abspath(src)
+	dst = PathPlus(os.path.abspath(dst))
+	old_prefix_bytes = os.fsencode(os.path.abspath(old_prefix or src))
+	new_prefix_bytes = os.fsencode(os.path.abspath(new_prefix or dst))
+
+	os.makedirs(dst)
+
+	for dirpath, dirnames, filenames in os.walk(src):
+		relative_dir = os.path.relpath(dirpath, src)
+		target_dir = os.path.normpath(os.path.join(dst, relative_dir))
+
+		for name in dirnames + filenames:
+			src_path = os.path.join(dirpath, name)
+			dst_path = os.path.join(target_dir, name)
+
+			if os.path.islink(src_path):
+				target = os.readlink(src_path)
+				target_bytes = os.fsencode(target)
+				if target_bytes.startswith(old_prefix_bytes):
+					target = os.fsdecode(new_prefix_bytes + target_bytes[len(old_prefix_bytes):])
+				os.symlink(target, dst_path)
+				if name in dirnames:
+					dirnames.remove(name)
+			elif name in dirnames:
+				os.mkdir(dst_path)
+				shutil.copymode(src_path, dst_path)
+			elif _needs_rewrite(os.path.join(relative_dir, name)):
+				if not _rewrite(src_path, dst_path, old_prefix_bytes, new_prefix_bytes):
+					# Never linked, even without the prefix, as these files may be modified in place later
+					# (e.g. pyvenv.cfg, which doesn't contain the path but has the fingerprint written to it).
+					shutil.copy2(src_path, dst_path)
+			else:
+				linker.link(src_path, dst_path)
+
+	return dst
+
+
+def relocate_venv(venv_dir: PathLike, old_prefix: PathLike, *, new_prefix: Optional[PathLike] = None) -> PathPlus:
+	"""
+	Update the virtualenv at ``venv_dir``, which has been moved from ``old_prefix``, for its new location.
+
+	As with :func:`~.clone_venv`, :file:`pyvenv.cfg`, activation scripts, console script shebangs,
+	``.pth`` files and symlinks are updated. Each file is replaced atomically.
+
+	:param venv_dir:
+	:param old_prefix: The absolute path the virtualenv was created at.
+	:param new_prefix: The absolute path the virtualenv will be used at, if different from ``venv_dir``
+		(e.g. if it will be moved into place afterwards).
+
+	:returns: The path to the virtualenv.
+	"""
+
+	venv_dir = PathPlus(os.path.abspath(venv_dir))
+	old_prefix_bytes = os.fsencode(os.path.abspath(old_prefix))
+	new_prefix_bytes = os.fsencode(os.path.abspath(new_prefix or venv_dir))
+
+	if old_prefix_bytes == new_prefix_bytes:
+		return venv_dir
+
+	for dirpath, dirnames, filenames in os.walk(venv_dir):
+		relative_dir = os.path.relpath(dirpath, venv_dir)
+
+		for name in dirnames + filenames:
+			path = os.path.join(dirpath, name)
+			tmp_path = os.path.join(dirpath, f".{name}.pyproject-devenv-tmp")
+
+			if os.path.islink(path):
+				target_bytes = os.fsencode(os.readlink(path))
+				if target_bytes.startswith(old_prefix_bytes):
+					os.symlink(os.fsdecode(new_prefix_bytes + target_bytes[len(old_prefix_bytes):]), tmp_path)
+					os.replace(tmp_path, path)
+				if name in dirnames:
+					dirnames.remove(name)
+			elif name in filenames and _needs_rewrite(os.path.join(relative_dir, name)):
+				if _rewrite(path, tmp_path, old_prefix_bytes, new_prefix_bytes):
+					os.replace(tmp_path, path)
+
+	return venv_dir
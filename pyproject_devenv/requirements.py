@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+#
+#  requirements.py
+"""
+Compare the requirements of a project with the distributions installed in a virtualenv,
+and check them for conflicts before anything is installed.
+
+.. versionadded:: 0.4.0
+"""  # noqa: D400
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import subprocess
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+# 3rd party
+from domdf_python_tools.typing import PathLike
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.specifiers import SpecifierSet
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+__all__ = (
+		"InstalledDistribution",
+		"VenvState",
+		"SyncPlan",
+		"RequirementConflict",
+		"inspect_venv",
+		"evaluate_marker",
+		"plan_sync",
+		"is_satisfiable",
+		"find_conflicts",
+		"SEED_PACKAGES",
+		)
+
+#: Distributions which are installed into every virtualenv and are never removed when pruning.
+SEED_PACKAGES = frozenset({"pip", "setuptools", "wheel"})
+
+_INSPECT_SCRIPT = """
+import json, os, platform, sys
+
+def format_full_version(info):
+	version = "{0.major}.{0.minor}.{0.micro}".format(info)
+	if info.releaselevel != "final":
+		version += info.releaselevel[0] + str(info.serial)
+	return version
+
+environment = {
+	"implementation_name": sys.implementation.name,
+	"implementation_version": format_full_version(sys.implementation.version),
+	"os_name": os.name,
+	"platform_machine": platform.machine(),
+	"platform_release": platform.release(),
+	"platform_system": platform.system(),
+	"platform_version": platform.version(),
+	"python_full_version": platform.python_version(),
+	"platform_python_implementation": platform.python_implementation(),
+	"python_version": ".".join(platform.python_version_tuple()[:2]),
+	"sys_platform": sys.platform,
+}
+
+distributions = {}
+
+try:
+	from importlib.metadata import distributions as iter_distributions
+except ImportError:
+	import pkg_resources
+	for dist in pkg_resources.working_set:
+		distributions[dist.project_name] = {"version": dist.version, "requires": []}
+else:
+	for dist in iter_distributions():
+		name = dist.metadata["Name"]
+		if name and name not in distributions:
+			distributions[name] = {"version": dist.version, "requires": dist.requires or []}
+
+print(json.dumps({"environment": environment, "distributions": distributions}))
+"""
+
+
+class InstalledDistribution(NamedTuple):
+	"""
+	A distribution installed in a virtualenv.
+	"""
+
+	#: The name of the distribution.
+	name: str
+
+	#: The installed version.
+	version: str
+
+	#: The distribution's requirements, including those for extras.
+	requires: List[str]
+
+
+class VenvState(NamedTuple):
+	"""
+	The state of a virtualenv, as returned by :func:`~.inspect_venv`.
+	"""
+
+	#: The environment used to evaluate markers, from the virtualenv's interpreter.
+	environment: Dict[str, str]
+
+	#: Mapping of normalized names to the distributions installed in the virtualenv.
+	distributions: Dict[str, InstalledDistribution]
+
+
+class SyncPlan(NamedTuple):
+	"""
+	The changes required to bring a virtualenv in line with a set of requirements,
+	as returned by :func:`~.plan_sync`.
+	"""  # noqa: D400
+
+	#: Requirements which are not installed, or whose installed version does not satisfy the specifier.
+	install: List[Requirement]
+
+	#: The names of installed distributions which are not required by anything.
+	extraneous: List[str]
+
+
+class RequirementConflict(NamedTuple):
+	"""
+	Requirements on the same distribution which cannot all be satisfied,
+	as returned by :func:`~.find_conflicts`.
+	"""  # noqa: D400
+
+	#: The normalized name of the distribution.
+	name: str
+
+	#: Mapping of group names (e.g. ``"extra 'doc'"``) to the conflicting requirements in that group.
+	requirements: Dict[str, List[str]]
+
+	#: Why the requirements conflict.
+	reason: str
+
+
+def inspect_venv(executable: PathLike) -> VenvState:
+	"""
+	Returns the marker environment and installed distributions of a virtualenv.
+
+	:param executable: The virtualenv's Python executable.
+	"""
+
+	process = subprocess.run(
+			[str(executable), "-c", _INSPECT_SCRIPT],
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+
+	data = json.loads(process.stdout.decode("UTF-8"))
+
+	distributions: Dict[str, InstalledDistribution] = {}
+	for name, dist in data["distributions"].items():
+		distributions[canonicalize_name(name)] = InstalledDistribution(name, dist["version"], dist["requires"])
+
+	return VenvState(data["environment"], distributions)
+
+
+def evaluate_marker(requirement: Requirement, environment: Dict[str, str], extra: str = '') -> bool:
+	"""
+	Returns whether the requirement applies to the given environment.
+
+	:param requirement:
+	:param environment: The environment used to evaluate markers, e.g. :attr:`VenvState.environment`.
+	:param extra: The extra the requirement was requested through, if any.
+	"""
+
+	if requirement.marker is None:
+		return True
+
+	return requirement.marker.evaluate({**environment, "extra": extra})
+
+
+def _is_satisfied(requirement: Requirement, installed: Dict[str, InstalledDistribution]) -> bool:
+	name = canonicalize_name(requirement.name)
+
+	if name not in installed:
+		return False
+	elif requirement.url:
+		# Can't tell which version a URL refers to; assume it's the installed one.
+		return True
+	else:
+		return requirement.specifier.contains(installed[name].version, prereleases=True)
+
+
+def _dependencies(
+		dist: InstalledDistribution,
+		extras: Iterable[str],
+		environment: Dict[str, str],
+		) -> List[Requirement]:
+	dependencies = []
+
+	for requirement_string in dist.requires:
+		try:
+			requirement = Requirement(requirement_string)
+		except InvalidRequirement:  # pragma: no cover
+			continue
+
+		if any(evaluate_marker(requirement, environment, extra) for extra in ('', *extras)):
+			# The marker has been evaluated, and would exclude requirements for extras if passed on to pip.
+			requirement.marker = None
+			dependencies.append(requirement)
+
+	return dependencies
+
+
+def plan_sync(requirements: Iterable[Requirement], state: VenvState) -> SyncPlan:
+	"""
+	Determine which requirements must be installed for the virtualenv to satisfy ``requirements``,
+	and which installed distributions are not needed.
+
+	Markers are evaluated against the virtualenv's interpreter, and the dependencies of installed
+	distributions are followed so missing transitive dependencies are also reported.
+	The dependencies of distributions which are to be reinstalled are also considered to be needed.
+
+	:param requirements:
+	:param state: The state of the virtualenv, from :func:`~.inspect_venv`.
+	"""  # noqa: D400
+
+	queue: Deque[Requirement] = deque(req for req in requirements if evaluate_marker(req, state.environment))
+	install: Dict[str, Requirement] = {}
+	seen: Set[str] = set()
+	needed: Set[str] = set()
+
+	while queue:
+		requirement = queue.popleft()
+		name = canonicalize_name(requirement.name)
+		needed.add(name)
+
+		if not _is_satisfied(requirement, state.distributions):
+			install.setdefault(str(requirement), requirement)
+
+			if name not in state.distributions:
+				continue
+
+			# The reinstalled version's dependencies aren't known until it is installed;
+			# keep those of the installed version so they aren't removed as extraneous.
+
+		key = f"{name}[{','.join(sorted(requirement.extras))}]"
+		if key in seen:
+			continue
+		seen.add(key)
+
+		dist = state.distributions[name]
+		queue.extend(_dependencies(dist, requirement.extras, state.environment))
+
+	extraneous = sorted(
+			dist.name for name, dist in state.distributions.items() if name not in needed | SEED_PACKAGES
+			)
+
+	return SyncPlan(list(install.values()), extraneous)
+
+
+def _next_release(version: str) -> Version:
+	"""
+	Returns the first version after every version starting with ``version``, e.g. ``1.5`` for ``1.4``.
+	"""
+
+	release = Version(version).release
+	return Version('.'.join(map(str, (*release[:-1], release[-1] + 1))))
+
+
+def _bounds(specifier: SpecifierSet) -> Tuple[Optional[Version], bool, Optional[Version], bool]:
+	"""
+	Returns the lower and upper bounds of the specifier, and whether each is inclusive.
+	"""
+
+	lower: Optional[Version] = None
+	lower_inclusive = True
+	upper: Optional[Version] = None
+	upper_inclusive = True
+
+	def raise_lower(version: Version, inclusive: bool) -> None:
+		nonlocal lower, lower_inclusive
+		if lower is None or version > lower or (version == lower and not inclusive):
+			lower, lower_inclusive = version, inclusive
+
+	def lower_upper(version: Version, inclusive: bool) -> None:
+		nonlocal upper, upper_inclusive
+		if upper is None or version < upper or (version == upper and not inclusive):
+			upper, upper_inclusive = version, inclusive
+
+	for spec in specifier:
+		if spec.operator == ">=":
+			raise_lower(Version(spec.version), True)
+		elif spec.operator == '>':
+			raise_lower(Version(spec.version), False)
+		elif spec.operator == "<=":
+			lower_upper(Version(spec.version), True)
+		elif spec.operator == '<':
+			lower_upper(Version(spec.version), False)
+		elif spec.operator == "~=":
+			raise_lower(Version(spec.version), True)
+			lower_upper(_next_release(spec.version.rsplit('.', 1)[0]), False)
+		elif spec.operator == "==" and spec.version.endswith(".*"):
+			raise_lower(Version(spec.version[:-2]), True)
+			lower_upper(_next_release(spec.version[:-2]), False)
+
+	return lower, lower_inclusive, upper, upper_inclusive
+
+
+def is_satisfiable(specifier: SpecifierSet) -> bool:
+	"""
+	Returns whether any version could satisfy the specifier, without looking at which versions exist.
+
+	The check is conservative: it only returns :py:obj:`False` if no version can satisfy the specifier,
+	such as for ``==1.0,==2.0`` or ``>=2,<1.5``.
+
+	:param specifier:
+	"""
+
+	pins = [spec.version for spec in specifier if spec.operator == "===" or (
+			spec.operator == "==" and not spec.version.endswith(".*")
+			)]
+
+	if pins:
+		return any(specifier.contains(pin, prereleases=True) for pin in pins)
+
+	try:
+		lower, lower_inclusive, upper, upper_inclusive = _bounds(specifier)
+	except InvalidVersion:  # pragma: no cover
+		return True
+
+	if lower is None or upper is None or lower < upper:
+		return True
+	elif lower == upper and lower_inclusive and upper_inclusive:
+		return specifier.contains(str(lower), prereleases=True)
+	else:
+		return False
+
+
+def find_conflicts(
+		groups: Mapping[str, Iterable[Requirement]],
+		environment: Dict[str, str],
+		) -> List[RequirementConflict]:
+	"""
+	Find requirements on the same distribution, in one or more groups, which cannot all be satisfied.
+
+	Requirements whose markers don't apply to ``environment`` are ignored.
+	The specifiers of the remaining requirements on each distribution are combined with
+	:func:`shippinglabel.requirements.combine_requirements` and checked with :func:`~.is_satisfiable`.
+	Requirements for the same distribution from different URLs also conflict.
+
+	Contradictory pins, such as ``foo==1.0`` and ``foo==2.0``, conflict even if their markers differ,
+	provided both markers apply to ``environment``. Pins for other platforms or versions of Python
+	are not reported, as they cannot conflict in the devenv being created.
+
+	:param groups: Mapping of group names (e.g. ``"extra 'doc'"``) to the requirements in that group.
+	:param environment: The environment used to evaluate markers, from the target interpreter.
+	"""
+
+	# 3rd party
+	from shippinglabel.requirements import ComparableRequirement, combine_requirements
+
+	# Mapping of normalized names to group names to the applicable requirements in that group.
+	by_name: Dict[str, Dict[str, List[Requirement]]] = {}
+
+	for group, requirements in groups.items():
+		for requirement in requirements:
+			if evaluate_marker(requirement, environment):
+				by_name.setdefault(canonicalize_name(requirement.name), {}).setdefault(group, []).append(requirement)
+
+	conflicts = []
+
+	for name, requirements_by_group in sorted(by_name.items()):
+		requirements = []
+		for req in (req for reqs in requirements_by_group.values() for req in reqs):
+			# The markers have been evaluated, and would stop the requirements being combined if they differ.
+			requirement = ComparableRequirement(str(req))
+			requirement.marker = None
+			requirements.append(requirement)
+
+		if len(requirements) < 2:
+			continue
+
+		urls = {req.url for req in requirements if req.url}
+		combined = combine_requirements(requirements, normalize_func=canonicalize_name)
+
+		if len(urls) > 1:
+			reason = "they are from different URLs"
+		elif not all(is_satisfiable(req.specifier) for req in combined):
+			reason = "no version satisfies all of them"
+		else:
+			continue
+
+		conflicts.append(
+				RequirementConflict(
+						name,
+						{group: list(map(str, reqs)) for group, reqs in requirements_by_group.items()},
+						reason,
+						)
+				)
+
+	return conflicts
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+#
+#  store.py
+"""
+A content-addressed store of installed distributions, shared between devenvs.
+
+Each distribution is installed by pip once, and its files are then added to the store,
+keyed by the interpreter and the SHA256 hash of the wheel or sdist it was installed from.
+Other devenvs which need the same distribution have its files linked into their site-packages,
+using reflinks where the filesystem supports them and hardlinks otherwise.
+
+Files which contain the virtualenv's path (e.g. console scripts) are copied and updated instead,
+and the distribution's ``RECORD`` file is rewritten to match.
+
+.. attention::
+
+	If hardlinks are used the devenvs share the files with the store,
+	so modifying an installed file in place affects every devenv using it.
+	pip replaces files rather than modifying them.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import base64
+import csv
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version
+
+# this package
+from pyproject_devenv.cache import touch
+from pyproject_devenv.relocate import Linker, _needs_rewrite
+
+__all__ = ("InstallItem", "PackageStore", "read_install_report", "record_hash")
+
+
+class InstallItem(NamedTuple):
+	"""
+	A distribution which pip would install, from its installation report.
+	"""
+
+	#: The name of the distribution.
+	name: str
+
+	#: The version of the distribution.
+	version: str
+
+	#: The requirement which installs exactly this distribution, e.g. ``six==1.16.0``.
+	requirement: str
+
+	#: The SHA256 hash of the wheel or sdist, if it is known.
+	sha256: Optional[str]
+
+	#: Whether the distribution was requested, rather than being a dependency of one.
+	requested: bool
+
+
+def read_install_report(filename: PathLike) -> List[InstallItem]:
+	"""
+	Returns the distributions which would be installed, from the report written by
+	``pip install --dry-run --report <filename>``.
+
+	Distributions installed from local directories or version control have no hash.
+
+	:param filename:
+	"""  # noqa: D400
+
+	report = json.loads(PathPlus(filename).read_text())
+	items = []
+
+	for item in report["install"]:
+		name = item["metadata"]["name"]
+		version = item["metadata"]["version"]
+		download_info = item["download_info"]
+		archive_info = download_info.get("archive_info")
+		sha256 = None
+
+		if archive_info is not None:
+			sha256 = archive_info.get("hashes", {}).get("sha256")
+			if sha256 is None and archive_info.get("hash", '').startswith("sha256="):
+				sha256 = archive_info["hash"][len("sha256="):]
+
+		if item.get("is_direct"):
+			requirement = f"{name} @ {download_info['url']}"
+		else:
+			requirement = f"{name}=={version}"
+
+		items.append(InstallItem(name, version, requirement, sha256, bool(item.get("requested"))))
+
+	return items
+
+
+def record_hash(content: bytes) -> str:
+	"""
+	Returns the hash of a file in the format used by ``RECORD`` files, e.g. ``sha256=47DEQp...``.
+
+	:param content:
+	"""
+
+	digest = base64.urlsafe_b64encode(hashlib.sha256(content).digest()).rstrip(b'=')
+	return f"sha256={digest.decode('ASCII')}"
+
+
+def _find_dist_info(site_packages: PathPlus, name: str, version: str) -> Optional[PathPlus]:
+	"""
+	Returns the ``.dist-info`` directory of the given distribution, if it is installed.
+	"""
+
+	if not site_packages.is_dir():
+		return None
+
+	for directory in site_packages.iterdir():
+		if not directory.name.endswith(".dist-info"):
+			continue
+
+		dist_name, _, dist_version = directory.name[:-len(".dist-info")].rpartition('-')
+
+		try:
+			if canonicalize_name(dist_name) == canonicalize_name(name) and Version(dist_version) == Version(version):
+				return directory
+		except InvalidVersion:  # pragma: no cover
+			continue
+
+	return None
+
+
+def _read_record(filename: PathPlus) -> List[Tuple[str, str, str]]:
+	with filename.open(newline='') as fp:
+		return [(row[0], row[1], row[2]) for row in csv.reader(fp) if row]
+
+
+class PackageStore:
+	"""
+	A content-addressed store of installed distributions.
+
+	:param root: The directory containing the store.
+	:param linker: The :class:`~.Linker` used to link files into and out of the store.
+		By default reflinks are used where supported, then hardlinks, then copies.
+	"""
+
+	def __init__(self, root: PathLike, *, linker: Optional[Linker] = None):
+		#: The directory containing the store.
+		self.root: PathPlus = PathPlus(root)
+		self.linker: Linker = Linker() if linker is None else linker
+
+	def entry_dir(self, tag: str, sha256: str) -> PathPlus:
+		"""
+		Returns the directory in which the given distribution is stored.
+
+		:param tag: Identifies the interpreter, e.g. ``py312``. See :func:`~.interpreter_tag`.
+		:param sha256: The hash of the wheel or sdist the distribution was installed from.
+		"""
+
+		return self.root / tag / sha256[:2] / sha256
+
+	def has(self, tag: str, sha256: str) -> bool:
+		"""
+		Returns whether the given distribution is in the store.
+
+		:param tag: Identifies the interpreter, e.g. ``py312``. See :func:`~.interpreter_tag`.
+		:param sha256: The hash of the wheel or sdist the distribution was installed from.
+		"""
+
+		return (self.entry_dir(tag, sha256) / "entry.json").is_file()
+
+	def add(
+			self,
+			tag: str,
+			sha256: str,
+			venv_dir: PathLike,
+			site_packages: str,
+			name: str,
+			version: str,
+			) -> bool:
+		"""
+		Add a distribution installed in a virtualenv to the store.
+
+		The files listed in the distribution's ``RECORD`` are linked into the store.
+
+		:param tag: Identifies the interpreter, e.g. ``py312``. See :func:`~.interpreter_tag`.
+		:param sha256: The hash of the wheel or sdist the distribution was installed from.
+		:param venv_dir: The virtualenv the distribution is installed in.
+		:param site_packages: The path to the virtualenv's site-packages directory, relative to ``venv_dir``.
+		:param name: The name of the distribution.
+		:param version: The version of the distribution.
+
+		:returns: Whether the distribution is now in the store. Distributions which aren't installed,
+			or which have files outside the virtualenv, can't be added.
+		"""
+
+		entry_dir = self.entry_dir(tag, sha256)
+		if self.has(tag, sha256):
+			return True
+
+		venv_dir = PathPlus(os.path.abspath(venv_dir))
+		site_packages_dir = venv_dir / site_packages
+		dist_info = _find_dist_info(site_packages_dir, name, version)
+
+		if dist_info is None:
+			return False
+
+		prefix = os.fsencode(venv_dir)
+		record = []
+		files = []
+		rewrite = []
+
+		tmp_dir = entry_dir.parent / f".{entry_dir.name}.{os.getpid()}"
+		if tmp_dir.exists():  # pragma: no cover
+			shutil.rmtree(tmp_dir)
+
+		try:
+			for path, file_hash, size in _read_record(dist_info / "RECORD"):
+				absolute_path = os.path.normpath(os.path.join(site_packages_dir, path))
+				relative_path = os.path.relpath(absolute_path, venv_dir).replace(os.sep, '/')
+
+				if relative_path.startswith("../"):
+					shutil.rmtree(tmp_dir, ignore_errors=True)
+					return False
+				elif absolute_path in {os.fspath(dist_info / "RECORD"), os.fspath(dist_info / "REQUESTED")}:
+					# These are written when the distribution is linked.
+					continue
+
+				record.append((path, file_hash, size))
+
+				if not os.path.isfile(absolute_path):
+					continue
+
+				target = tmp_dir / "files" / relative_path
+				target.parent.maybe_make(parents=True)
+
+				with open(absolute_path, "rb") as fp:
+					contains_prefix = _needs_rewrite(relative_path) and prefix in fp.read()
+
+				if contains_prefix:
+					shutil.copy2(absolute_path, target)
+					rewrite.append(relative_path)
+				else:
+					self.linker.link(absolute_path, target)
+
+				files.append(relative_path)
+
+			entry = {
+					"name": name,
+					"version": version,
+					"prefix": os.fspath(venv_dir),
+					"site_packages": site_packages,
+					"dist_info": dist_info.name,
+					"files": files,
+					"rewrite": rewrite,
+					"record": record,
+					}
+
+			(tmp_dir / "entry.json").write_clean(json.dumps(entry))
+			os.rename(tmp_dir, entry_dir)
+
+		except OSError:
+			shutil.rmtree(tmp_dir, ignore_errors=True)
+
+			if not self.has(tag, sha256):  # pragma: no cover
+				raise
+			# Otherwise another process got there first.
+
+		except BaseException:
+			shutil.rmtree(tmp_dir, ignore_errors=True)
+			raise
+
+		return True
+
+	def link(self, tag: str, sha256: str, venv_dir: PathLike, *, requested: bool = False) -> None:
+		"""
+		Install a distribution from the store into a virtualenv with the same interpreter.
+
+		Any existing version of the distribution must be uninstalled first.
+
+		:param tag: Identifies the interpreter, e.g. ``py312``. See :func:`~.interpreter_tag`.
+		:param sha256: The hash of the wheel or sdist the distribution was installed from.
+		:param venv_dir:
+		:param requested: Whether the distribution was requested, rather than being a dependency of one.
+		"""
+
+		entry_dir = self.entry_dir(tag, sha256)
+		entry: Dict[str, Any] = json.loads((entry_dir / "entry.json").read_text())
+
+		venv_dir = PathPlus(os.path.abspath(venv_dir))
+		old_prefix = os.fsencode(entry["prefix"])
+		new_prefix = os.fsencode(venv_dir)
+		rewrite = set(entry["rewrite"])
+		new_hashes: Dict[str, Tuple[str, str]] = {}
+
+		for relative_path in entry["files"]:
+			src = entry_dir / "files" / relative_path
+			dst = venv_dir / relative_path
+			dst.parent.maybe_make(parents=True)
+
+			if os.path.lexists(dst):
+				os.unlink(dst)
+
+			if relative_path in rewrite:
+				content = src.read_bytes().replace(old_prefix, new_prefix)
+				dst.write_bytes(content)
+				shutil.copymode(src, dst)
+				new_hashes[relative_path] = (record_hash(content), str(len(content)))
+			else:
+				self.linker.link(src, dst)
+
+		site_packages_dir = venv_dir / entry["site_packages"]
+		dist_info = site_packages_dir / entry["dist_info"]
+		record = []
+
+		for path, file_hash, size in entry["record"]:
+			absolute_path = os.path.normpath(os.path.join(site_packages_dir, path))
+			relative_path = os.path.relpath(absolute_path, venv_dir).replace(os.sep, '/')
+			file_hash, size = new_hashes.get(relative_path, (file_hash, size))
+			record.append((path, file_hash, size))
+
+		if requested:
+			(dist_info / "REQUESTED").write_bytes(b'')
+			record.append((f"{dist_info.name}/REQUESTED", record_hash(b''), '0'))
+
+		record.append((f"{dist_info.name}/RECORD", '', ''))
+
+		with (dist_info / "RECORD").open('w', newline='') as fp:
+			csv.writer(fp, lineterminator='\n').writerows(record)
+
+		touch(entry_dir)
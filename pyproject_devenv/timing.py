@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+#
+#  timing.py
+"""
+Measure how long each phase of creating a devenv takes.
+
+.. versionadded:: 0.4.0
+"""
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+__all__ = ("PhaseTiming", "Timings")
+
+
+class PhaseTiming(NamedTuple):
+	"""
+	The time taken by a single phase, as recorded by :meth:`Timings.phase`.
+	"""
+
+	#: The name of the phase, e.g. ``seed`` or ``install:project``.
+	name: str
+
+	#: The elapsed wall-clock time, in seconds.
+	wall: float
+
+	#: The CPU time used, in seconds, including that of subprocesses such as pip.
+	cpu: float
+
+
+def _cpu_time() -> float:
+	times = os.times()
+	return times.user + times.system + times.children_user + times.children_system
+
+
+class Timings:
+	"""
+	Records the wall-clock and CPU time taken by each phase of creating a devenv.
+
+	Pass an instance to :func:`~pyproject_devenv.mkdevenv` and inspect it afterwards.
+	Phases may be nested, e.g. loading the configuration while looking for a golden virtualenv.
+	"""
+
+	def __init__(self):
+		#: The phases recorded so far, in the order they finished.
+		self.phases: List[PhaseTiming] = []
+
+		self._start: Optional[Tuple[float, float]] = None
+		self._end: Tuple[float, float] = (0.0, 0.0)
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		"""
+		Context manager which records the time taken by the code in its body.
+
+		The phase is recorded even if the body raises an exception.
+
+		:param name:
+		"""
+
+		wall_start = time.perf_counter()
+		cpu_start = _cpu_time()
+
+		if self._start is None:
+			self._start = (wall_start, cpu_start)
+
+		try:
+			yield
+		finally:
+			self._end = (time.perf_counter(), _cpu_time())
+			self.phases.append(PhaseTiming(name, self._end[0] - wall_start, self._end[1] - cpu_start))
+
+	@property
+	def total(self) -> PhaseTiming:
+		"""
+		The time from the start of the first phase to the end of the last one.
+		"""
+
+		if self._start is None:
+			return PhaseTiming("total", 0.0, 0.0)
+
+		return PhaseTiming("total", self._end[0] - self._start[0], self._end[1] - self._start[1])
+
+	def to_dict(self) -> Dict[str, Any]:
+		"""
+		Returns the timings as a JSON-serializable dictionary.
+		"""
+
+		return {
+				"phases": [phase._asdict() for phase in self.phases],
+				"total": self.total._asdict(),
+				}
+
+	def dump_json(self, filename: PathLike) -> None:
+		"""
+		Write the timings to the given file as JSON.
+
+		:param filename:
+		"""
+
+		PathPlus(filename).write_clean(json.dumps(self.to_dict(), indent=2))
+
+	def format_table(self) -> str:
+		"""
+		Returns the timings formatted as a table, for display on the terminal.
+		"""
+
+		rows = [*self.phases, self.total]
+		width = max(len("Phase"), *(len(row.name) for row in rows))
+
+		lines = [f"{'Phase':<{width}}  {'Wall (s)':>9}  {'CPU (s)':>9}"]
+		lines.append('-' * len(lines[0]))
+
+		for row in rows:
+			if row is rows[-1]:
+				lines.append('-' * len(lines[0]))
+			lines.append(f"{row.name:<{width}}  {row.wall:>9.3f}  {row.cpu:>9.3f}")
+
+		return '\n'.join(lines)
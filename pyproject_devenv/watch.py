@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+#
+#  watch.py
+"""
+Keep a devenv in sync with the project's configuration as it is edited.
+
+On Linux the files are watched with inotify. Elsewhere, or if inotify is unavailable,
+they are polled for changes.
+
+.. versionadded:: 0.4.0
+"""  # noqa: D400
+#
+#  Copyright © 2026 Dominic Davis-Foster <dominic@davis-foster.co.uk>
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to deal
+#  in the Software without restriction, including without limitation the rights
+#  to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+#  copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in all
+#  copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+#  EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+#  MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+#  IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+#  DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR
+#  OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+#  OR OTHER DEALINGS IN THE SOFTWARE.
+#
+
+# stdlib
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+# 3rd party
+import click
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+if TYPE_CHECKING:
+	# this package
+	from pyproject_devenv import _Devenv
+
+__all__ = (
+		"FileWatcher",
+		"InotifyWatcher",
+		"PollingWatcher",
+		"get_watcher",
+		"watched_files",
+		"watch_devenv",
+		)
+
+
+class FileWatcher:
+	"""
+	Base class for watching a set of files for changes.
+
+	Files which don't exist yet may be watched, and their creation counts as a change.
+
+	:param files:
+	"""
+
+	def __init__(self, files: Iterable[PathLike]):
+		#: The files being watched.
+		self.files: List[PathPlus] = [PathPlus(file).abspath() for file in files]
+
+	def wait(self, timeout: Optional[float] = None) -> bool:
+		"""
+		Wait for one of the files to be created, modified or deleted.
+
+		:param timeout: The maximum time to wait, in seconds. If :py:obj:`None`, wait indefinitely.
+
+		:returns: Whether a file changed before the timeout expired.
+		"""
+
+		raise NotImplementedError
+
+	def close(self) -> None:
+		"""
+		Stop watching the files.
+		"""
+
+	def __enter__(self) -> "FileWatcher":
+		return self
+
+	def __exit__(self, *args) -> None:
+		self.close()
+
+
+class PollingWatcher(FileWatcher):
+	"""
+	Watches files by checking their modification time and size periodically.
+
+	:param files:
+	:param poll_interval: The time between checks, in seconds.
+	"""
+
+	def __init__(self, files: Iterable[PathLike], *, poll_interval: float = 1.0):
+		super().__init__(files)
+		self.poll_interval: float = poll_interval
+		self._state = self._stat()
+
+	def _stat(self) -> List[Optional[Tuple[int, int]]]:
+		state: List[Optional[Tuple[int, int]]] = []
+
+		for file in self.files:
+			try:
+				stat = os.stat(file)
+			except OSError:
+				state.append(None)
+			else:
+				state.append((stat.st_mtime_ns, stat.st_size))
+
+		return state
+
+	def wait(self, timeout: Optional[float] = None) -> bool:  # noqa: D102
+		deadline = None if timeout is None else time.monotonic() + timeout
+
+		while True:
+			state = self._stat()
+			if state != self._state:
+				self._state = state
+				return True
+
+			if deadline is None:
+				time.sleep(self.poll_interval)
+			else:
+				remaining = deadline - time.monotonic()
+				if remaining <= 0:
+					return False
+				time.sleep(min(self.poll_interval, remaining))
+
+
+# Flags from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+		_IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+		| _IN_DELETE_SELF | _IN_MOVE_SELF
+		)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher(FileWatcher):
+	"""
+	Watches files with Linux's inotify API.
+
+	The directories containing the files are watched, rather than the files themselves,
+	so that files replaced by editors (by writing a new file and renaming it) are still followed.
+
+	:param files:
+
+	:raises: :exc:`OSError` if inotify is not available.
+	"""
+
+	def __init__(self, files: Iterable[PathLike]):
+		super().__init__(files)
+
+		libc_name = ctypes.util.find_library('c')
+		if not sys.platform.startswith("linux") or libc_name is None:
+			raise OSError("inotify is only available on Linux.")
+
+		self._libc = ctypes.CDLL(libc_name, use_errno=True)
+		self._fd: int = self._libc.inotify_init1(_IN_CLOEXEC)
+		if self._fd < 0:
+			errno = ctypes.get_errno()
+			raise OSError(errno, os.strerror(errno))
+
+		# Mapping of watch descriptors to the directory and the names of interest in it.
+		self._watches: Dict[int, Tuple[PathPlus, Set[str]]] = {}
+		self._add_watches()
+
+	def _add_watches(self) -> None:
+		"""
+		Watch the closest existing directory to each file, including those created since the last call.
+		"""
+
+		for wd in list(self._watches):
+			self._libc.inotify_rm_watch(self._fd, wd)
+		self._watches.clear()
+
+		for file in self.files:
+			directory, name = file.parent, file.name
+			while not directory.is_dir() and directory != directory.parent:
+				directory, name = directory.parent, directory.name
+
+			wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+			if wd < 0:  # pragma: no cover
+				errno = ctypes.get_errno()
+				raise OSError(errno, os.strerror(errno), os.fspath(directory))
+
+			self._watches.setdefault(wd, (directory, set()))[1].add(name)
+
+	def _read_events(self) -> bool:
+		data = os.read(self._fd, 64 * 1024)
+		changed = False
+		offset = 0
+
+		while offset < len(data):
+			wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+			offset += _EVENT_HEADER.size
+			name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+			offset += length
+
+			if wd not in self._watches:
+				continue
+			elif mask & (_IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED) or name in self._watches[wd][1]:
+				changed = True
+
+		if changed:
+			# Directories may have been created or removed.
+			self._add_watches()
+
+		return changed
+
+	def wait(self, timeout: Optional[float] = None) -> bool:  # noqa: D102
+		deadline = None if timeout is None else time.monotonic() + timeout
+
+		while True:
+			remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+			ready, _, _ = select.select([self._fd], [], [], remaining)
+
+			if not ready:
+				return False
+			elif self._read_events():
+				return True
+
+	def close(self) -> None:  # noqa: D102
+		if self._fd >= 0:
+			os.close(self._fd)
+			self._fd = -1
+
+
+def get_watcher(files: Iterable[PathLike], *, poll_interval: float = 1.0) -> FileWatcher:
+	"""
+	Returns an :class:`~.InotifyWatcher` for the given files if inotify is available,
+	or a :class:`~.PollingWatcher` otherwise.
+
+	:param files:
+	:param poll_interval: The time between checks, in seconds, if the files have to be polled.
+	"""  # noqa: D400
+
+	files = list(files)
+
+	try:
+		return InotifyWatcher(files)
+	except (OSError, AttributeError):
+		return PollingWatcher(files, poll_interval=poll_interval)
+
+
+def watched_files(devenv: "_Devenv") -> List[PathPlus]:
+	"""
+	Returns the files which determine the requirements installed into the devenv.
+
+	:param devenv:
+	"""
+
+	files = [
+			devenv.project_dir / "pyproject.toml",
+			devenv.project_dir / "requirements.txt",
+			devenv.project_dir / "tests" / "requirements.txt",
+			]
+
+	if devenv.locked:
+		# this package
+		from pyproject_devenv.lock import LOCKFILE_NAME
+
+		files.append(devenv.project_dir / LOCKFILE_NAME)
+
+	return files
+
+
+def watch_devenv(
+		devenv: "_Devenv",
+		*,
+		debounce: float = 0.5,
+		poll_interval: float = 1.0,
+		max_changes: Optional[int] = None,
+		) -> None:
+	"""
+	Sync the devenv, and then sync it again whenever the project's requirements change.
+
+	Only the missing or outdated requirements are installed each time (see :meth:`~._Devenv.sync`),
+	and the parsed configuration of unchanged files is reused.
+	Errors, such as invalid configuration or requirements which can't be installed,
+	are reported and the devenv is synced again after the next change.
+
+	:param devenv:
+	:param debounce: Wait until the files have not changed for this long, in seconds, before syncing.
+		Editors often write files several times when saving them.
+	:param poll_interval: The time between checks, in seconds, if inotify isn't available.
+	:param max_changes: Return after syncing this many times in response to changes.
+		By default this function only returns when interrupted.
+	"""
+
+	with get_watcher(watched_files(devenv), poll_interval=poll_interval) as watcher:
+		_sync(devenv)
+		changes = 0
+
+		while max_changes is None or changes < max_changes:
+			click.echo("Watching for changes to the project's requirements. Press Ctrl+C to stop.")
+			watcher.wait()
+
+			while watcher.wait(debounce):
+				pass
+
+			changes += 1
+			click.echo()
+			click.echo("The project's requirements have changed.")
+			devenv.reset()
+			_sync(devenv)
+
+
+def _sync(devenv: "_Devenv") -> None:
+	"""
+	Sync the devenv, reporting any error.
+	"""
+
+	# 3rd party
+	from dom_toml.parser import BadConfigError
+
+	try:
+		devenv.sync()
+	except (BadConfigError, RuntimeError, OSError, subprocess.CalledProcessError) as e:
+		# Including invalid or partly written configuration, BaseInstallError, files which were deleted,
+		# and the devenv's interpreter failing when it is inspected.
+		click.echo(f"Error: {e}", err=True)
+	else:
+		click.echo(f"The devenv in {devenv.venv_dir.as_posix()!r} is up to date.")
@@ -1 +1,41 @@
+# stdlib
+import logging
+from typing import Iterator
+
+# 3rd party
+import pytest
+
+# this package
+from pyproject_devenv.config import clear_config_cache
+from pyproject_devenv.discovery import clear_interpreter_cache
+
 pytest_plugins = ("coincidence", )
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+	"""
+	Keep each test's caches separate from the user's, and from each other.
+	"""
+
+	monkeypatch.setenv("PYPROJECT_DEVENV_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+	clear_config_cache()
+	clear_interpreter_cache()
+
+
+@pytest.fixture(autouse=True)
+def remove_stale_log_handlers() -> Iterator[None]:
+	"""
+	virtualenv adds handlers to the root logger which write to the ``sys.stdout`` of the time.
+
+	Remove them after each test, as that may be a :class:`~click.testing.CliRunner` stream which has since been closed.
+	"""
+
+	root = logging.getLogger()
+	handlers = list(root.handlers)
+
+	yield
+
+	for handler in root.handlers[:]:
+		if handler not in handlers:
+			root.removeHandler(handler)
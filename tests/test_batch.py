@@ -0,0 +1,147 @@
+# stdlib
+import shutil
+import subprocess
+import sys
+from typing import List
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from pyproject_devenv import _Devenv
+from pyproject_devenv.__main__ import main
+from pyproject_devenv.batch import (
+		BuildResult,
+		build_devenvs,
+		discover_projects,
+		mkdevenv_matrix,
+		mkdevenv_recursive
+		)
+from pyproject_devenv.discovery import find_interpreter, interpreter_tag, marker_environment
+
+
+def make_project(project_dir: PathPlus, *dependencies: str) -> None:
+	project_dir.mkdir(parents=True)
+	(project_dir / "pyproject.toml").write_lines([
+			"[project]",
+			f"name = {project_dir.name!r}",
+			f"dependencies = {list(dependencies)!r}",
+			])
+
+
+def test_discover_projects(tmp_pathplus: PathPlus) -> None:
+	make_project(tmp_pathplus / "a")
+	make_project(tmp_pathplus / "b")
+	make_project(tmp_pathplus / "libs" / "c")
+	make_project(tmp_pathplus / ".hidden")
+	make_project(tmp_pathplus / "node_modules" / "d")
+	make_project(tmp_pathplus / "a" / "venv" / "lib" / "e")
+	(tmp_pathplus / "a" / "venv" / "pyvenv.cfg").touch()
+
+	assert discover_projects(tmp_pathplus) == [
+			tmp_pathplus / "a",
+			tmp_pathplus / "b",
+			tmp_pathplus / "libs" / "c",
+			]
+
+
+def test_build_devenvs_failure(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "bad").mkdir()
+	(tmp_pathplus / "bad" / "pyproject.toml").write_lines(["[project]", "dynamic = ['name']"])
+
+	results: List[BuildResult] = []
+	assert build_devenvs([_Devenv(tmp_pathplus / "bad")], callback=results.append) == results
+	assert len(results) == 1
+	assert not results[0].success
+	assert results[0].error is not None
+	assert "The 'project.name' field may not be dynamic." in results[0].error
+	assert not (tmp_pathplus / "bad" / "venv").exists()
+
+	assert build_devenvs([]) == []
+
+
+def test_mkdevenv_recursive(tmp_pathplus: PathPlus) -> None:
+	make_project(tmp_pathplus / "a", "six")
+	make_project(tmp_pathplus / "b")
+	(tmp_pathplus / "c").mkdir()
+	(tmp_pathplus / "c" / "pyproject.toml").write_lines(["[project]", "dynamic = ['name']"])
+
+	results = mkdevenv_recursive(tmp_pathplus, jobs=2, verbosity=1)
+	assert [result.project_dir for result in results] == [tmp_pathplus / "a", tmp_pathplus / "b", tmp_pathplus / "c"]
+	assert [result.success for result in results] == [True, True, False]
+
+	assert "Installing project requirements" in results[0].output
+	assert "Installing project requirements" not in results[1].output
+	assert (tmp_pathplus / "a" / "venv" / "pyvenv.cfg").is_file()
+	assert (tmp_pathplus / "b" / "venv" / "pyvenv.cfg").is_file()
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["--recursive", "-j", "2"])
+		assert result.exit_code == 1
+
+	assert "==> a: created development virtualenv" in result.stdout
+	assert "==> c: failed" in result.stdout
+	assert "The 'project.name' field may not be dynamic." in result.stdout
+	assert result.stdout.endswith("Failed to create 1 of 3 development virtualenvs:\n  c\n")
+
+
+def _other_python() -> str:
+	for version in ("3.13", "3.12", "3.11", "3.10", "3.9", "3.8"):
+		if version == f"{sys.version_info.major}.{sys.version_info.minor}":
+			continue
+
+		candidate = shutil.which(f"python{version}")
+		if candidate and subprocess.run([candidate, "-c", ''], stderr=subprocess.DEVNULL).returncode == 0:
+			return candidate
+
+	pytest.skip("A second Python interpreter is required.")
+
+
+def test_mkdevenv_matrix(tmp_pathplus: PathPlus) -> None:
+	other_python = _other_python()
+	(tmp_pathplus / "pyproject.toml").write_lines(["[project]", "name = 'matrix'", "dependencies = ['six']"])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(
+				main,
+				args=["--python", f"{sys.executable},{other_python}"],
+				env={"PYPROJECT_DEVENV_CACHE_DIR": str(tmp_pathplus / "cache")},
+				)
+		assert result.exit_code == 0, result.stdout
+
+	this_tag = interpreter_tag(find_interpreter(sys.executable))
+	other_tag = interpreter_tag(find_interpreter(other_python))
+	assert f"==> venv-{this_tag}: created development virtualenv" in result.stdout
+	assert f"==> venv-{other_tag}: created development virtualenv" in result.stdout
+	assert result.stdout.endswith("Successfully created 2 development virtualenvs.\n")
+
+	for tag in (this_tag, other_tag):
+		assert (tmp_pathplus / f"venv-{tag}" / "pyvenv.cfg").is_file()
+		assert list((tmp_pathplus / f"venv-{tag}").rglob("six.py"))
+
+
+def test_mkdevenv_matrix_duplicate(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines(["[project]", "name = 'matrix'", "dependencies = []"])
+
+	with pytest.raises(ValueError, match="More than one of the given interpreters is 'py"):
+		mkdevenv_matrix(tmp_pathplus, pythons=[sys.executable, sys.executable])
+
+
+def test_marker_environment() -> None:
+	# 3rd party
+	from packaging.markers import default_environment
+
+	assert marker_environment(find_interpreter(sys.executable)) == default_environment()
+
+
+def test_interpreter_tag() -> None:
+	tag = interpreter_tag(find_interpreter(sys.executable))
+	assert tag == f"py{sys.version_info.major}{sys.version_info.minor}"
+	assert interpreter_tag(find_interpreter()) == tag
+
+	with pytest.raises(FileNotFoundError, match="Could not find a Python interpreter matching 'python2.1'"):
+		find_interpreter("python2.1")
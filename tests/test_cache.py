@@ -0,0 +1,219 @@
+# stdlib
+import os
+import time
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv import _Devenv, mkdevenv
+from pyproject_devenv.__main__ import main
+from pyproject_devenv.cache import (
+		auto_prune,
+		auto_prune_due,
+		cache_dir,
+		cache_entries,
+		parse_age,
+		parse_size,
+		prune_cache
+		)
+
+DAY = 24 * 60 * 60
+
+
+def make_entry(path: PathPlus, size: int, age: float) -> PathPlus:
+	path.parent.maybe_make(parents=True)
+	path.write_bytes(b'x' * size)
+	timestamp = time.time() - age
+	os.utime(path, (timestamp, timestamp))
+	return path
+
+
+@pytest.fixture()
+def populated_cache() -> PathPlus:
+	root = cache_dir()
+
+	make_entry(root / "config" / "a.json", 100, 40 * DAY)
+	make_entry(root / "interpreters" / "b.json", 200, 2 * DAY)
+
+	golden = root / "golden" / "abc"
+	make_entry(golden / "lib" / "module.py", 1000, 0)
+	os.utime(golden, (time.time() - DAY, time.time() - DAY))
+
+	store_entry = root / "store" / "py312" / "de" / "def"
+	make_entry(store_entry / "entry.json", 500, 0)
+	os.utime(store_entry, (time.time() - 3 * DAY, time.time() - 3 * DAY))
+
+	make_entry(root / "pip" / "http-v2" / "1" / "2" / "cached", 300, 5 * DAY)
+
+	# Incomplete entries are ignored.
+	make_entry(root / "golden" / ".abc.1234" / "pyvenv.cfg", 10, 100 * DAY)
+	make_entry(root / "config" / "tmp1234.tmp", 10, 100 * DAY)
+
+	return root
+
+
+def test_cache_entries(populated_cache: PathPlus) -> None:
+	entries = {entry.kind: entry for entry in cache_entries()}
+	assert sorted(entries) == ["config", "golden", "interpreters", "pip", "store"]
+
+	assert entries["golden"].path == populated_cache / "golden" / "abc"
+	assert entries["golden"].size == 1000
+	assert entries["store"].path == populated_cache / "store" / "py312" / "de" / "def"
+	assert entries["store"].size == 500
+	assert entries["pip"].size == 300
+	assert time.time() - entries["config"].last_used == pytest.approx(40 * DAY, abs=60)
+
+
+def test_prune_cache(populated_cache: PathPlus) -> None:
+	assert prune_cache(max_age=30 * DAY, dry_run=True)[0].kind == "config"
+	assert (populated_cache / "config" / "a.json").is_file()
+
+	removed = prune_cache(max_age=30 * DAY)
+	assert [entry.kind for entry in removed] == ["config"]
+	assert not (populated_cache / "config" / "a.json").exists()
+
+	# The least recently used entries are removed first.
+	removed = prune_cache(max_size=1200)
+	assert [entry.kind for entry in removed] == ["pip", "store"]
+	assert not (populated_cache / "store" / "py312" / "de" / "def").exists()
+	assert sorted(entry.kind for entry in cache_entries()) == ["golden", "interpreters"]
+	assert not list((populated_cache / "store" / "py312" / "de").iterdir())
+
+	assert [entry.kind for entry in prune_cache(max_size=0)] == ["interpreters", "golden"]
+	assert cache_entries() == []
+
+
+def test_auto_prune(populated_cache: PathPlus, monkeypatch) -> None:
+	monkeypatch.setenv("PYPROJECT_DEVENV_CACHE_MAX_SIZE", "none")
+	monkeypatch.delenv("PYPROJECT_DEVENV_CACHE_MAX_AGE", raising=False)
+
+	assert auto_prune_due()
+	removed = auto_prune()
+	assert removed is not None
+	assert [entry.kind for entry in removed] == ["config"]
+
+	# Only runs once in a while.
+	assert not auto_prune_due()
+	assert auto_prune() is None
+
+	os.utime(populated_cache / ".last-prune", (0, 0))
+	monkeypatch.setenv("PYPROJECT_DEVENV_CACHE_MAX_AGE", "4d")
+	removed = auto_prune()
+	assert removed is not None
+	assert [entry.kind for entry in removed] == ["pip"]
+
+
+def test_auto_prune_after_create(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = []",
+			])
+
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data") == 0
+	last_prune = cache_dir() / ".last-prune"
+	assert last_prune.is_file()
+	os.utime(last_prune, (0, 0))
+
+	# Nothing is added to the caches when the devenv is already up to date.
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data") == 0
+	assert os.stat(last_prune).st_mtime == 0
+
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data", force=True) == 0
+	assert time.time() - os.stat(last_prune).st_mtime < 60
+
+
+def test_mkdevenv_golden_last_used(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = []",
+			])
+
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data", golden=True) == 0
+	golden_dir = _Devenv(tmp_pathplus, "venv", golden=True).golden_venv_dir()
+	os.utime(golden_dir, (0, 0))
+
+	assert mkdevenv(tmp_pathplus, "venv2", verbosity=0, golden=True) == 0
+	assert time.time() - os.stat(golden_dir).st_mtime < 60
+
+
+@pytest.mark.parametrize(
+		"value, expected",
+		[
+				("500", 500),
+				("500b", 500),
+				("500 B", 500),
+				("1k", 1024),
+				("10G", 10 * 1024**3),
+				("1.5GB", int(1.5 * 1024**3)),
+				("2 m", 2 * 1024**2),
+				],
+		)
+def test_parse_size(value: str, expected: int) -> None:
+	assert parse_size(value) == expected
+
+
+def test_parse_age() -> None:
+	assert parse_age("30d") == 30 * DAY
+	assert parse_age("12h") == 12 * 60 * 60
+	assert parse_age("90m") == 90 * 60
+	assert parse_age("1w") == 7 * DAY
+	assert parse_age("45") == 45
+
+	with pytest.raises(ValueError, match="Invalid age 'soon'"):
+		parse_age("soon")
+
+	with pytest.raises(ValueError, match="Invalid size '10x'"):
+		parse_size("10x")
+
+
+def test_cache_cli(populated_cache: PathPlus, monkeypatch) -> None:
+	monkeypatch.delenv("PYPROJECT_DEVENV_CACHE_MAX_SIZE", raising=False)
+	monkeypatch.delenv("PYPROJECT_DEVENV_CACHE_MAX_AGE", raising=False)
+
+	runner = CliRunner()
+
+	result: Result = runner.invoke(main, args=["cache", "stats"])
+	assert result.exit_code == 0
+	lines = result.stdout.splitlines()
+	assert lines[0].split() == ["Cache", "Entries", "Size", "Last", "used"]
+	assert lines[2].split()[:3] == ["config", '1', "100"]
+	assert lines[8].split() == ["total", '5', "2.1", "KiB"]
+	assert lines[-1] == f"Location: {populated_cache.as_posix()}"
+
+	result = runner.invoke(main, args=["cache", "prune", "--max-age", "30d", "--dry-run"])
+	assert result.exit_code == 0
+	assert result.stdout.splitlines() == [
+			f"Would remove {(populated_cache / 'config' / 'a.json').as_posix()}",
+			"Would remove 1 entries (100 B).",
+			]
+
+	# Without any limits, the defaults are used.
+	result = runner.invoke(main, args=["cache", "prune", "--dry-run"])
+	assert result.exit_code == 0
+	assert result.stdout.splitlines()[-1] == "Would remove 1 entries (100 B)."
+
+	result = runner.invoke(main, args=["cache", "prune", "--max-age", "30d", "--max-size", "1k"])
+	assert result.exit_code == 0
+	assert result.stdout == "Removed 4 entries (1.1 KiB).\n"
+
+	result = runner.invoke(main, args=["cache", "prune"])
+	assert result.exit_code == 0
+	assert result.stdout == "Removed 0 entries (0 B).\n"
+
+	result = runner.invoke(main, args=["cache", "prune", "--all", "--max-age", "1d"])
+	assert result.exit_code == 2
+	assert "--all cannot be combined with --max-size or --max-age" in result.stdout
+
+	result = runner.invoke(main, args=["cache", "prune", "--all"])
+	assert result.exit_code == 0
+	assert result.stdout == "Removed 1 entries (1000 B).\n"
+	assert cache_entries() == []
+
+	result = runner.invoke(main, args=["cache", "prune", "--max-size", "lots"])
+	assert result.exit_code == 1
+	assert "Invalid size 'lots'" in result.stdout
@@ -1,4 +1,5 @@
 # stdlib
+import json
 import re
 import sys
 from typing import Dict, Tuple
@@ -189,3 +190,62 @@ def test_version_version(tmp_pathplus: PathPlus) -> None:
 			rf"pyproject-devenv version {re.escape(__version__)}, virualenv \d+\.\d+\.\d+\n",
 			result.stdout,
 			)
+
+
+def test_help(tmp_pathplus: PathPlus) -> None:
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["--help"])
+		assert result.exit_code == 0
+
+	assert "Commands:" in result.stdout
+	assert "create" in result.stdout
+	assert "lock" in result.stdout
+
+	with in_directory(tmp_pathplus):
+		result = runner.invoke(main, args=["create", "--help"])
+		assert result.exit_code == 0
+
+	assert "--upgrade" in result.stdout
+	assert "--extras" in result.stdout
+	assert "--no-tests" in result.stdout
+	assert "--watch" in result.stdout
+	assert "--editable" in result.stdout
+	assert "--store" in result.stdout
+
+
+def test_mkdevenv_timings(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["--timings", "--timings-json", "timings.json"])
+		assert result.exit_code == 0
+
+	lines = result.stdout.splitlines()
+	assert lines[0].split() == ["Phase", "Wall", "(s)", "CPU", "(s)"]
+	assert lines[-1] == "Successfully created development virtualenv."
+
+	report = json.loads((tmp_pathplus / "timings.json").read_text())
+	assert [phase["name"] for phase in report["phases"]] == [
+			"fingerprint",
+			"config",
+			"preflight",
+			"discovery",
+			"seed",
+			"install:project",
+			"install:extras",
+			"install:build",
+			"update_pyvenv",
+			"cache:prune",
+			]
+	assert report["total"]["name"] == "total"
+	assert report["total"]["wall"] >= sum(phase["wall"] for phase in report["phases"])
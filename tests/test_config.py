@@ -1,4 +1,5 @@
 # stdlib
+import os
 from typing import Dict
 
 # 3rd party
@@ -7,10 +8,12 @@ import pytest
 from consolekit.testing import CliRunner, Result
 from dom_toml.parser import BadConfigError
 from domdf_python_tools.paths import PathPlus, in_directory
+from shippinglabel.requirements import ComparableRequirement
 
 # this package
+import pyproject_devenv.config
 from pyproject_devenv.__main__ import main
-from pyproject_devenv.config import PEP621Parser, load_toml
+from pyproject_devenv.config import PEP621Parser, clear_config_cache, load_toml
 
 
 def test_dynamic_name() -> None:
@@ -53,6 +56,24 @@ def test_no_requirements_txt(tmp_pathplus: PathPlus) -> None:
 		load_toml(tmp_pathplus / "pyproject.toml")
 
 
+@pytest.mark.parametrize(
+		"content, match",
+		[
+				pytest.param("[project\nname = 'foo'\n", "Expected ']'", id="invalid_toml"),
+				pytest.param(
+						"[project]\nname = 'foo'\ndependencies = 1\n",
+						"Invalid type for 'project.dependencies'",
+						id="wrong_type",
+						),
+				],
+		)
+def test_invalid_pyproject_toml(tmp_pathplus: PathPlus, content: str, match: str) -> None:
+	(tmp_pathplus / "pyproject.toml").write_text(content)
+
+	with pytest.raises(BadConfigError, match=rf"Could not load '.*pyproject.toml': {match}"):
+		load_toml(tmp_pathplus / "pyproject.toml")
+
+
 @pytest.mark.parametrize(
 		"config, match",
 		[
@@ -115,3 +136,57 @@ def test_bad_config_cli_traceback(tmp_pathplus: PathPlus, config: Dict, match: s
 
 		with pytest.raises(BadConfigError, match=match):
 			runner.invoke(main, args=["-T"])
+
+
+def test_load_toml_cache(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	pyproject_file = tmp_pathplus / "pyproject.toml"
+	dom_toml.dump({"project": {"name": "foo", "dependencies": ["click>=7"]}}, pyproject_file)
+
+	config = load_toml(pyproject_file)
+	assert config["dependencies"] == ["click>=7"]
+
+	# The cached configuration is used for unchanged files, both from memory and from disk.
+	monkeypatch.setattr(pyproject_devenv.config, "_parse_toml", pytest.fail)
+	assert load_toml(pyproject_file) == config
+	assert load_toml(pyproject_file)["dependencies"][0] is config["dependencies"][0]
+
+	clear_config_cache()
+	assert load_toml(pyproject_file) == config
+	assert len(list((PathPlus(os.environ["PYPROJECT_DEVENV_CACHE_DIR"]) / "config").iterdir())) == 1
+
+	# Modifying the returned configuration doesn't modify the cache.
+	config["dependencies"].append(ComparableRequirement("six"))
+	assert load_toml(pyproject_file)["dependencies"] == ["click>=7"]
+
+	monkeypatch.undo()
+
+	# The file is parsed again when it changes, even if its size and modification time don't.
+	stat = pyproject_file.stat()
+	dom_toml.dump({"project": {"name": "foo", "dependencies": ["click>=8"]}}, pyproject_file)
+	os.utime(pyproject_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+	assert load_toml(pyproject_file)["dependencies"] == ["click>=8"]
+
+
+def test_load_toml_cache_requirements_txt(tmp_pathplus: PathPlus) -> None:
+	pyproject_file = tmp_pathplus / "pyproject.toml"
+	dom_toml.dump({"project": {"name": "foo", "dynamic": ["dependencies"]}}, pyproject_file)
+	(tmp_pathplus / "requirements.txt").write_lines(["click>=7"])
+
+	assert load_toml(pyproject_file)["dependencies"] == ["click>=7"]
+
+	(tmp_pathplus / "requirements.txt").write_lines(["click>=7", "six"])
+	assert load_toml(pyproject_file)["dependencies"] == ["click>=7", "six"]
+
+	(tmp_pathplus / "requirements.txt").unlink()
+	with pytest.raises(BadConfigError, match="no 'requirements.txt' file was found"):
+		load_toml(pyproject_file)
+
+
+def test_load_toml_no_cache(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	pyproject_file = tmp_pathplus / "pyproject.toml"
+	dom_toml.dump({"project": {"name": "foo", "dependencies": []}}, pyproject_file)
+
+	load_toml(pyproject_file)
+
+	monkeypatch.setattr(pyproject_devenv.config, "_parse_toml", lambda filename: {"name": "bar"})
+	assert load_toml(pyproject_file, use_cache=False) == {"name": "bar"}
@@ -1,16 +1,28 @@
 # stdlib
+import os
+import subprocess
 import sys
 from typing import Dict
 
 # 3rd party
 import pytest
+import virtualenv.run  # type: ignore[import-untyped]
+from dom_toml.parser import BadConfigError
 from domdf_python_tools.compat import PYPY
 from domdf_python_tools.paths import PathPlus
 from domdf_python_tools.utils import strtobool
 from shippinglabel import read_pyvenv
 
 # this package
-from pyproject_devenv import __version__, mkdevenv
+from pyproject_devenv import (
+		CombinedInstallError,
+		ConflictError,
+		_Devenv,
+		__version__,
+		_interpreter_identity,
+		mkdevenv
+		)
+from pyproject_devenv.discovery import find_interpreter
 
 
 @pytest.mark.parametrize("verbosity", [0, 1, 2])
@@ -74,6 +86,7 @@ def test_mkdevenv(tmp_pathplus: PathPlus, capsys, verbosity: int) -> None:
 
 	assert "pyproject-devenv" in pyvenv_config
 	assert pyvenv_config["pyproject-devenv"] == __version__
+	assert pyvenv_config["pyproject-devenv-fingerprint"] == _Devenv(tmp_pathplus).fingerprint()
 
 	assert "virtualenv" in pyvenv_config
 
@@ -399,3 +412,514 @@ def test_mkdevenv_no_dynamic(tmp_pathplus: PathPlus, capsys) -> None:
 
 	assert "include-system-site-packages" in pyvenv_config
 	assert not strtobool(pyvenv_config["include-system-site-packages"])
+
+
+def test_mkdevenv_combine(tmp_pathplus: PathPlus, capsys) -> None:
+	lib_requirements = [
+			"click",
+			"requests",
+			]
+
+	test_requirements = [
+			"pytest",
+			]
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools", "wheel"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dynamic = ['dependencies']",
+			'',
+			"[project.optional-dependencies]",
+			"doc = ['sphinx']",
+			'',
+			])
+	(tmp_pathplus / "requirements.txt").write_lines(lib_requirements)
+
+	(tmp_pathplus / "tests").mkdir()
+	(tmp_pathplus / "tests/requirements.txt").write_lines(test_requirements)
+
+	assert mkdevenv(tmp_pathplus, tmp_pathplus / "venv", verbosity=1, upgrade=False, combine=True) == 0
+
+	capout = capsys.readouterr()
+	assert not capout.err
+	assert (
+			" Installing project requirements, extra 'doc', build requirements and test requirements "
+			in capout.out
+			)
+	assert "Installing extra 'doc' " not in capout.out
+
+	# Check list of packages in virtualenv
+	venv_dir = tmp_pathplus / "venv"
+
+	if PYPY and not sys.version_info >= (3, 8):
+		version_dirs = [venv_dir]
+	elif sys.platform == "win32":
+		version_dirs = [(venv_dir / "Lib")]
+	else:
+		version_dirs = list((venv_dir / "lib").glob("py*"))
+
+	for version_dir in version_dirs:
+
+		for package in [*lib_requirements, *test_requirements, "sphinx", "setuptools", "wheel"]:
+			assert (version_dir / "site-packages" / package).is_dir()
+
+	assert len(version_dirs) == 1
+
+
+def test_mkdevenv_combined_failure(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools", "wheel"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click']",
+			'',
+			"[project.optional-dependencies]",
+			"doc = ['pyproject-devenv-does-not-exist==1.0']",
+			'',
+			])
+
+	devenv = _Devenv(tmp_pathplus, tmp_pathplus / "venv", verbosity=0, combine=True, build=False)
+
+	with pytest.raises(CombinedInstallError) as e:
+		devenv.create()
+
+	assert e.value.failed_groups == {"extra 'doc'": ["pyproject-devenv-does-not-exist==1.0"]}
+	assert "The requirements which could not be installed are in:\n  extra 'doc':" in str(e.value)
+
+
+def test_fingerprint(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools", "wheel"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dynamic = ['dependencies']",
+			"",
+			"[tool.foo]",
+			"bar = 1",
+			])
+	(tmp_pathplus / "requirements.txt").write_lines(["click"])
+
+	fingerprint = _Devenv(tmp_pathplus).fingerprint()
+	assert len(fingerprint) == 64
+	assert _Devenv(tmp_pathplus).fingerprint() == fingerprint
+
+	# Unrelated tables don't matter
+	(tmp_pathplus / "pyproject.toml").append_text("baz = 2\n")
+	assert _Devenv(tmp_pathplus).fingerprint() == fingerprint
+
+	# The requirements are always reinstalled with upgrade, so it doesn't need to be recorded.
+	assert _Devenv(tmp_pathplus, upgrade=True).fingerprint() == fingerprint
+	assert _Devenv(tmp_pathplus, python="python3-does-not-exist").fingerprint() != fingerprint
+
+	(tmp_pathplus / "requirements.txt").write_lines(["click", "flask"])
+	assert _Devenv(tmp_pathplus).fingerprint() != fingerprint
+	fingerprint = _Devenv(tmp_pathplus).fingerprint()
+
+	(tmp_pathplus / "tests").mkdir()
+	(tmp_pathplus / "tests/requirements.txt").write_lines(["pytest"])
+	assert _Devenv(tmp_pathplus).fingerprint() != fingerprint
+	fingerprint = _Devenv(tmp_pathplus).fingerprint()
+
+	# The selected groups of requirements
+	assert _Devenv(tmp_pathplus, extras=[]).fingerprint() != fingerprint
+	assert _Devenv(tmp_pathplus, extras=["doc", "cli"]).fingerprint() == _Devenv(
+			tmp_pathplus, extras=["cli", "doc"]
+			).fingerprint()
+	assert _Devenv(tmp_pathplus, project=False).fingerprint() != fingerprint
+	assert _Devenv(tmp_pathplus, tests=False).fingerprint() != fingerprint
+	assert _Devenv(tmp_pathplus, build=False).fingerprint() != fingerprint
+
+
+def test_interpreter_identity() -> None:
+	spec = f"{sys.version_info.major}.{sys.version_info.minor}"
+	identity = _interpreter_identity(spec)
+	assert identity["spec"] == spec
+	assert identity["executable"] == os.path.realpath(find_interpreter(spec).executable)
+	assert identity["size"] == os.stat(str(identity["executable"])).st_size
+
+	assert _interpreter_identity("python2.1") == {"spec": "python2.1"}
+
+
+def test_mkdevenv_up_to_date(tmp_pathplus: PathPlus, monkeypatch, capsys) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click']",
+			])
+
+	venv_dir = tmp_pathplus / "venv"
+	venv_dir.mkdir()
+	(venv_dir / "pyvenv.cfg").write_lines([
+			f"pyproject-devenv = {__version__}",
+			f"pyproject-devenv-fingerprint = {_Devenv(tmp_pathplus).fingerprint()}",
+			])
+
+	def session_via_cli(*args, **kwargs):  # noqa: MAN002
+		raise AssertionError("The virtualenv should not have been recreated.")
+
+	monkeypatch.setattr(virtualenv.run, "session_via_cli", session_via_cli)
+	monkeypatch.setattr(_Devenv, "load_config", session_via_cli)
+
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=1) == 0
+	assert "is already up to date." in capsys.readouterr().out
+
+	with pytest.raises(AssertionError, match="The virtualenv should not have been recreated."):
+		mkdevenv(tmp_pathplus, venv_dir, verbosity=1, force=True)
+
+	(tmp_pathplus / "pyproject.toml").append_text("optional-dependencies = {doc = ['sphinx']}\n")
+
+	with pytest.raises(AssertionError, match="The virtualenv should not have been recreated."):
+		mkdevenv(tmp_pathplus, venv_dir, verbosity=1)
+
+
+def test_mkdevenv_upgrade_twice(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	pip_args = []
+	run_pip = _Devenv._run_pip
+
+	def record_pip(self, executable, args, env) -> None:  # noqa: MAN001
+		pip_args.append(args)
+		run_pip(self, executable, args, env)
+
+	monkeypatch.setattr(_Devenv, "_run_pip", record_pip)
+
+	for sync in (False, False, True):
+		pip_args.clear()
+		assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data", upgrade=True, sync=sync) == 0
+		assert ["install", "six", "--upgrade"] in pip_args
+
+
+def test_mkdevenv_sync(tmp_pathplus: PathPlus, monkeypatch, capsys) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click']",
+			])
+
+	venv_dir = tmp_pathplus / "venv"
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=0, sync=True) == 0
+
+	def session_via_cli(*args, **kwargs):  # noqa: MAN002
+		raise AssertionError("The virtualenv should not have been recreated.")
+
+	monkeypatch.setattr(virtualenv.run, "session_via_cli", session_via_cli)
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click', 'six; python_version >= \"3\"', 'pywin32; python_version < \"3\"']",
+			])
+
+	capsys.readouterr()
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=1, sync=True, prune=True) == 0
+	capout = capsys.readouterr()
+	assert " Installing 1 missing requirement " in capout.out
+	assert "Removing" not in capout.out
+
+	pyvenv_config: Dict[str, str] = read_pyvenv(venv_dir)
+	assert pyvenv_config["pyproject-devenv-fingerprint"] == _Devenv(tmp_pathplus).fingerprint()
+
+	if sys.platform == "win32":
+		version_dirs = [(venv_dir / "Lib")]
+	else:
+		version_dirs = list((venv_dir / "lib").glob("py*"))
+
+	assert (version_dirs[0] / "site-packages" / "six.py").is_file()
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=1, sync=True, prune=True) == 0
+	capout = capsys.readouterr()
+	assert "Installing" not in capout.out
+	assert " Removing click " in capout.out
+	assert not (version_dirs[0] / "site-packages" / "click").exists()
+
+
+def test_mkdevenv_golden(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	monkeypatch.setenv("PYPROJECT_DEVENV_CACHE_DIR", str(tmp_pathplus / "cache"))
+
+	for checkout in ("checkout-1", "checkout-2"):
+		(tmp_pathplus / checkout).mkdir()
+		(tmp_pathplus / checkout / "pyproject.toml").write_lines([
+				"[project]",
+				"name = 'pyproject-devenv-demo'",
+				"dependencies = ['six']",
+				])
+
+	assert mkdevenv(tmp_pathplus / "checkout-1", "venv", verbosity=0, golden=True) == 0
+	assert len(list((tmp_pathplus / "cache" / "golden").iterdir())) == 1
+
+	def session_via_cli(*args, **kwargs):  # noqa: MAN002
+		raise AssertionError("The virtualenv should have been cloned.")
+
+	monkeypatch.setattr(virtualenv.run, "session_via_cli", session_via_cli)
+
+	venv_dir = tmp_pathplus / "checkout-2" / "venv"
+	assert mkdevenv(tmp_pathplus / "checkout-2", "venv", verbosity=0, golden=True) == 0
+
+	pyvenv_config: Dict[str, str] = read_pyvenv(venv_dir)
+	assert pyvenv_config["prompt"] == "pyproject-devenv-demo"
+	assert pyvenv_config["pyproject-devenv-fingerprint"] == _Devenv(tmp_pathplus / "checkout-2").fingerprint()
+
+	# Updating the clone's pyvenv.cfg doesn't affect the golden virtualenv, or other clones.
+	golden_venv_dir = _Devenv(tmp_pathplus / "checkout-2", golden=True).golden_venv_dir()
+	golden_config = (golden_venv_dir / "pyvenv.cfg").read_text()
+	assert not os.path.samefile(venv_dir / "pyvenv.cfg", golden_venv_dir / "pyvenv.cfg")
+	assert not os.path.samefile(venv_dir / "pyvenv.cfg", tmp_pathplus / "checkout-1" / "venv" / "pyvenv.cfg")
+
+	(tmp_pathplus / "checkout-2" / "pyproject.toml").append_text("description = 'changed'\n")
+	_Devenv(tmp_pathplus / "checkout-2", "venv", golden=True).update_pyvenv()
+	assert (golden_venv_dir / "pyvenv.cfg").read_text() == golden_config
+
+	# The same change in the other checkout isn't mistaken for having been applied there.
+	(tmp_pathplus / "checkout-1" / "pyproject.toml").append_text("description = 'changed'\n")
+	assert not _Devenv(tmp_pathplus / "checkout-1", "venv", golden=True).is_up_to_date()
+
+	if sys.platform == "win32":
+		executable = venv_dir / "Scripts" / "python.exe"
+	else:
+		executable = venv_dir / "bin" / "python"
+		assert venv_dir.as_posix() in (venv_dir / "bin" / "activate").read_text()
+		assert "checkout-1" not in (venv_dir / "bin" / "activate").read_text()
+
+	output = subprocess.check_output([executable, "-c", "import six, sys; print(six.__file__); print(sys.prefix)"])
+	assert output.decode("UTF-8").splitlines() == [
+			str(next((venv_dir / "lib").glob("py*/site-packages/six.py"))) if sys.platform != "win32" else
+			str(venv_dir / "Lib" / "site-packages" / "six.py"),
+			str(venv_dir),
+			]
+
+
+def test_mkdevenv_app_data_seeder(tmp_pathplus: PathPlus, monkeypatch, capsys) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	with pytest.raises(ValueError, match="Unknown seeder 'conda'"):
+		_Devenv(tmp_pathplus, seeder="conda")
+
+	assert _Devenv.seeder_args("pip") == ["--seeder", "pip", "--download"]
+	assert "--no-download" in _Devenv.seeder_args("app-data")
+
+	venv_dir = tmp_pathplus / "venv"
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=0, seeder="app-data") == 0
+	assert not capsys.readouterr().err
+
+	if sys.platform == "win32":
+		site_packages = venv_dir / "Lib" / "site-packages"
+	else:
+		site_packages = next((venv_dir / "lib").glob("py*/site-packages"))
+		assert (site_packages / "pip").is_symlink()
+
+	assert (site_packages / "six.py").is_file()
+
+	# If the app-data seeder fails, pip is used instead.
+	session_via_cli = virtualenv.run.session_via_cli
+	seeders = []
+
+	def failing_session_via_cli(args, *posargs, **kwargs):  # noqa: MAN001,MAN002
+		seeders.append(args[args.index("--seeder") + 1])
+		if "app-data" in args:
+			raise RuntimeError("the app-data cache is read-only")
+		return session_via_cli(args, *posargs, **kwargs)
+
+	monkeypatch.setattr(virtualenv.run, "session_via_cli", failing_session_via_cli)
+
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=0, force=True, seeder="app-data") == 0
+	assert seeders == ["app-data", "pip"]
+	assert "the app-data cache is read-only" in capsys.readouterr().err
+	assert not (site_packages / "pip").is_symlink()
+	assert (site_packages / "six.py").is_file()
+
+
+def test_mkdevenv_selected_groups(tmp_pathplus: PathPlus, capsys) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["toml"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			'',
+			"[project.optional-dependencies]",
+			"doc = ['iniconfig']",
+			"cli = ['click']",
+			])
+	(tmp_pathplus / "tests").mkdir()
+	(tmp_pathplus / "tests/requirements.txt").write_lines(["pluggy"])
+
+	with pytest.raises(BadConfigError, match="The project has no extra named 'docs'"):
+		_Devenv(tmp_pathplus, extras=["docs"]).extras_to_install
+
+	venv_dir = tmp_pathplus / "venv"
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=1, extras=["cli"], tests=False, build=False) == 0
+
+	capout = capsys.readouterr()
+	assert "Installing extra 'cli'" in capout.out
+	assert "Installing extra 'doc'" not in capout.out
+	assert "Installing test requirements" not in capout.out
+	assert "Installing build requirements" not in capout.out
+
+	if sys.platform == "win32":
+		site_packages = venv_dir / "Lib" / "site-packages"
+	else:
+		site_packages = next((venv_dir / "lib").glob("py*/site-packages"))
+
+	assert (site_packages / "six.py").is_file()
+	assert (site_packages / "click").is_dir()
+	assert not (site_packages / "iniconfig").exists()
+	assert not (site_packages / "pluggy").exists()
+	assert not (site_packages / "toml").exists()
+
+	# Selecting different groups recreates the devenv.
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=1, extras=[], project=False, combine=True) == 0
+	assert "Installing build requirements and test requirements" in capsys.readouterr().out
+	assert (site_packages / "pluggy").is_dir()
+	assert (site_packages / "toml").is_dir()
+
+
+def test_mkdevenv_conflicts(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six==1.15', \"click==7; sys_platform == 'does-not-exist'\"]",
+			'',
+			"[project.optional-dependencies]",
+			"cli = ['click>=8']",
+			])
+	(tmp_pathplus / "tests").mkdir()
+	(tmp_pathplus / "tests/requirements.txt").write_lines(["six>=1.16"])
+
+	def session_via_cli(*args, **kwargs):  # noqa: MAN002
+		raise AssertionError("The conflict should have been found before creating the virtualenv.")
+
+	monkeypatch.setattr(virtualenv.run, "session_via_cli", session_via_cli)
+
+	with pytest.raises(ConflictError, match="  six \\(no version satisfies all of them\\):") as e:
+		mkdevenv(tmp_pathplus, "venv", verbosity=0)
+
+	assert [conflict.name for conflict in e.value.conflicts] == ["six"]
+	assert not (tmp_pathplus / "venv").exists()
+
+	with pytest.raises(AssertionError, match="The conflict should have been found before creating the virtualenv."):
+		mkdevenv(tmp_pathplus, "venv", verbosity=0, tests=False)
+
+
+def test_mkdevenv_markers(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			"requires = [\"toml; sys_platform == 'does-not-exist'\"]",
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six; python_version >= \"3\"', \"click; sys_platform == 'does-not-exist'\"]",
+			'',
+			"[project.optional-dependencies]",
+			"doc = [\"iniconfig; sys_platform == 'does-not-exist'\"]",
+			])
+
+	devenv = _Devenv(tmp_pathplus)
+	assert list(map(str, devenv.applicable_requirements(devenv.all_requirements()))) == ["six"]
+
+	# Requirements which don't apply to the interpreter don't affect the golden virtualenv.
+	golden_venv_dir = devenv.golden_venv_dir()
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			'',
+			"[project.optional-dependencies]",
+			"doc = []",
+			])
+	assert _Devenv(tmp_pathplus).golden_venv_dir() == golden_venv_dir
+
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six; python_version >= \"3\"', \"click; sys_platform == 'does-not-exist'\"]",
+			])
+
+	pip_args = []
+
+	def run_pip(self, executable, args, env) -> None:  # noqa: MAN001
+		pip_args.append(args)
+
+	monkeypatch.setattr(_Devenv, "_run_pip", run_pip)
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data") == 0
+	assert pip_args == [["install", "six"]]
+
+
+def test_mkdevenv_editable(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			"requires = ['setuptools>=64']",
+			"build-backend = 'setuptools.build_meta'",
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"version = '0.1.0'",
+			"dependencies = ['six']",
+			'',
+			"[tool.setuptools]",
+			"py-modules = ['pyproject_devenv_demo']",
+			])
+	(tmp_pathplus / "pyproject_devenv_demo.py").write_text("GREETING = 'Hello world'\n")
+
+	pip_args = []
+	run_pip = _Devenv._run_pip
+
+	def record_pip(self, executable, args, env) -> None:  # noqa: MAN001
+		pip_args.append(args)
+		run_pip(self, executable, args, env)
+
+	monkeypatch.setattr(_Devenv, "_run_pip", record_pip)
+
+	venv_dir = tmp_pathplus / "venv"
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=0, seeder="app-data", editable=True) == 0
+
+	# The build requirements are installed first, and nothing is built in an isolated environment.
+	assert pip_args[0] == ["install", "setuptools>=64", "--no-build-isolation"]
+	assert pip_args[1] == ["install", "six", "--no-build-isolation"]
+	assert pip_args[-1] == ["install", "--no-deps", "--editable", tmp_pathplus.as_posix(), "--no-build-isolation"]
+
+	devenv = _Devenv(tmp_pathplus, venv_dir)
+	process = subprocess.run(
+			[str(devenv.venv_executable()), "-c", "import pyproject_devenv_demo; print(pyproject_devenv_demo.GREETING)"],
+			cwd=str(venv_dir),
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+	assert process.stdout.decode("UTF-8").strip() == "Hello world"
+
+	# Changes to the project take effect without reinstalling it.
+	(tmp_pathplus / "pyproject_devenv_demo.py").write_text("GREETING = 'Hello everyone'\n")
+	process = subprocess.run(
+			[str(devenv.venv_executable()), "-c", "import pyproject_devenv_demo; print(pyproject_devenv_demo.GREETING)"],
+			cwd=str(venv_dir),
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+	assert process.stdout.decode("UTF-8").strip() == "Hello everyone"
+
+	# The project itself isn't pruned when syncing.
+	pip_args.clear()
+	assert mkdevenv(tmp_pathplus, venv_dir, verbosity=0, sync=True, prune=True, force=True, editable=True) == 0
+	assert pip_args == []
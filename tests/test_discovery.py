@@ -0,0 +1,107 @@
+# stdlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# 3rd party
+import pytest
+import virtualenv.discovery.builtin  # type: ignore[import-untyped]
+import virtualenv.discovery.cached_py_info  # type: ignore[import-untyped]
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv.cache import cache_dir
+from pyproject_devenv.discovery import clear_interpreter_cache, find_interpreter
+
+
+@pytest.fixture()
+def searches(monkeypatch) -> List[Optional[str]]:
+	"""
+	Records the specifiers virtualenv is asked to search for.
+	"""
+
+	searched: List[Optional[str]] = []
+	get_interpreter = virtualenv.discovery.builtin.get_interpreter
+
+	def record(spec, *args, **kwargs):  # noqa: MAN001,MAN002
+		searched.append(spec)
+		return get_interpreter(spec, *args, **kwargs)
+
+	monkeypatch.setattr(virtualenv.discovery.builtin, "get_interpreter", record)
+	return searched
+
+
+def test_find_interpreter_cache(searches: List[Optional[str]]) -> None:
+	interpreter = find_interpreter(sys.executable)
+	assert searches == [sys.executable]
+
+	# In memory
+	assert find_interpreter(sys.executable) is interpreter
+	assert searches == [sys.executable]
+
+	# On disk
+	clear_interpreter_cache()
+	cached = find_interpreter(sys.executable)
+	assert searches == [sys.executable]
+	assert cached is not interpreter
+	assert cached.executable == interpreter.executable
+	assert cached.version_info == interpreter.version_info
+	assert cached.version_info.major == sys.version_info.major
+
+	assert find_interpreter(sys.executable, use_cache=False).executable == interpreter.executable
+	assert searches == [sys.executable, sys.executable]
+
+	# The cache is invalidated if the interpreter changes.
+	(cache_file, ) = (cache_dir() / "interpreters").iterdir()
+	data = json.loads(cache_file.read_text())
+	data["state"]["executable"][1] -= 1
+	cache_file.write_text(json.dumps(data))
+
+	clear_interpreter_cache()
+	find_interpreter(sys.executable)
+	assert searches == [sys.executable, sys.executable, sys.executable]
+
+
+def test_find_interpreter_shared_with_virtualenv(monkeypatch) -> None:
+	executable = os.path.realpath(sys.executable)
+	find_interpreter(executable)
+
+	# As if virtualenv hadn't seen the interpreter in this process.
+	monkeypatch.setattr(virtualenv.discovery.cached_py_info, "_CACHE", {})
+	clear_interpreter_cache()
+
+	interpreter = find_interpreter(executable)
+	assert virtualenv.discovery.cached_py_info._CACHE == {Path(interpreter.executable): interpreter}
+
+	def from_file_cache(*args, **kwargs):  # noqa: MAN001,MAN002
+		raise AssertionError("virtualenv inspected the interpreter again")
+
+	monkeypatch.setattr(virtualenv.discovery.cached_py_info, "_get_via_file_cache", from_file_cache)
+	assert virtualenv.discovery.builtin.get_interpreter(interpreter.executable, [], env=os.environ) is interpreter
+
+
+def test_find_interpreter_cache_path(tmp_pathplus: PathPlus, monkeypatch, searches: List[Optional[str]]) -> None:
+	bin_dir = tmp_pathplus / "bin"
+	bin_dir.mkdir()
+	monkeypatch.setenv("PATH", os.pathsep.join([str(bin_dir), os.path.dirname(sys.executable)]))
+
+	spec = f"python{sys.version_info.major}.{sys.version_info.minor}"
+	find_interpreter(spec)
+	find_interpreter(spec)
+	assert searches == [spec]
+
+	# Interpreters may have been added to a directory on PATH.
+	(bin_dir / "new-file").touch()
+	os.utime(bin_dir, ns=(0, 0))
+	find_interpreter(spec)
+	assert searches == [spec, spec]
+
+	# The cache is keyed by PATH.
+	monkeypatch.setenv("PATH", os.path.dirname(sys.executable))
+	find_interpreter(spec)
+	assert searches == [spec, spec, spec]
+
+	with pytest.raises(FileNotFoundError, match="Could not find a Python interpreter matching 'python2.1'"):
+		find_interpreter("python2.1")
@@ -1,3 +1,6 @@
+# stdlib
+from typing import Dict, List, Union
+
 # 3rd party
 import pytest
 from domdf_python_tools.paths import PathPlus
@@ -5,7 +8,8 @@ from packaging.requirements import Requirement
 from shippinglabel.requirements import ComparableRequirement
 
 # this package
-from pyproject_devenv import InstallError, InstallFromFileError
+from pyproject_devenv import CombinedInstallError, ConflictError, InstallError, InstallFromFileError
+from pyproject_devenv.requirements import RequirementConflict
 
 
 def test_InstallFromFileError() -> None:
@@ -48,3 +52,110 @@ def test_InstallError() -> None:
 			match="Could not install the given requirements: 'pytest', 'flake8', 'black' and 'pip'",
 			):
 		raise InstallError(ComparableRequirement("pytest"), Requirement("flake8"), "black", Requirement("pip"))
+
+
+def test_CombinedInstallError() -> None:
+	groups: Dict[str, List[Union[str, Requirement]]] = {
+			"project requirements": [ComparableRequirement("click"), Requirement("flask")],
+			"extra 'doc'": ["sphinx"],
+			}
+
+	with pytest.raises(
+			CombinedInstallError,
+			match=r"Could not install the given requirements:\n"
+			r"  project requirements: 'click' and 'flask'\n"
+			r"  extra 'doc': 'sphinx'",
+			) as e:
+		raise CombinedInstallError(groups)
+
+	assert isinstance(e.value, InstallError)
+	assert e.value.groups == {"project requirements": ["click", "flask"], "extra 'doc'": ["sphinx"]}
+	assert e.value.requirements == ["click", "flask", "sphinx"]
+
+
+@pytest.mark.parametrize(
+		"output",
+		[
+				pytest.param(
+						[
+								"ERROR: Could not find a version that satisfies the requirement "
+								"Sphinx_Toolbox==99 (from versions: 1.0)",
+								"ERROR: No matching distribution found for Sphinx_Toolbox==99",
+								],
+						id="pip",
+						),
+				pytest.param(
+						[
+								"  × No solution found when resolving dependencies:",
+								"  ╰─▶ Because there is no version of sphinx-toolbox==99 and you require "
+								"sphinx-toolbox==99, we can conclude that your requirements are unsatisfiable.",
+								],
+						id="uv",
+						),
+				],
+		)
+def test_CombinedInstallError_failed_groups(output: List[str]) -> None:
+	groups = {
+			"project requirements": ["click", "sphinx-toolbox==99; python_version > '3'"],
+			"extra 'doc'": ["sphinx", "sphinx-toolbox==99"],
+			"test requirements": ["pytest"],
+			}
+
+	with pytest.raises(
+			CombinedInstallError,
+			match=r"The requirements which could not be installed are in:\n"
+			r"  project requirements: \"sphinx-toolbox==99; python_version > '3'\"\n"
+			r"  extra 'doc': 'sphinx-toolbox==99'\n",
+			) as e:
+		raise CombinedInstallError(groups, output=output)
+
+	assert e.value.failed_groups == {
+			"project requirements": ["sphinx-toolbox==99; python_version > '3'"],
+			"extra 'doc'": ["sphinx-toolbox==99"],
+			}
+
+
+def test_CombinedInstallError_unknown_failure() -> None:
+	groups = {"project requirements": ["click"], "extra 'doc'": ["sphinx"]}
+
+	with pytest.raises(
+			CombinedInstallError,
+			match=r"  extra 'doc': 'sphinx'\n\n"
+			r"Could not tell which requirement failed; it could be in any of the groups above\.",
+			) as e:
+		raise CombinedInstallError(groups, output=["ERROR: Something went wrong."])
+
+	assert e.value.failed_groups == {}
+
+
+def test_ConflictError() -> None:
+	conflict = RequirementConflict(
+			"six",
+			{"project requirements": ["six==1.15"], "test requirements": ["six>=1.16", "six!=1.17"]},
+			"no version satisfies all of them",
+			)
+
+	with pytest.raises(
+			ConflictError,
+			match=r"The project's requirements conflict:\n"
+			r"  six \(no version satisfies all of them\):\n"
+			r"    project requirements: 'six==1.15'\n"
+			r"    test requirements: 'six>=1.16' and 'six!=1.17'",
+			) as e:
+		raise ConflictError([conflict])
+
+	assert e.value.conflicts == [conflict]
+
+
+def test_InstallError_output() -> None:
+	with pytest.raises(
+			InstallError,
+			match=r"Could not install the given requirements: 'pytest'\n\n"
+			r"The last lines of output were:\n"
+			r"    Collecting pytest\n"
+			r"    ERROR: No matching distribution found for pytest$",
+			) as e:
+		raise InstallError("pytest", output=["Collecting pytest", "ERROR: No matching distribution found for pytest"])
+
+	assert e.value.output == ["Collecting pytest", "ERROR: No matching distribution found for pytest"]
+	assert InstallFromFileError("requirements.txt").output == []
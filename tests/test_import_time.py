@@ -0,0 +1,107 @@
+# stdlib
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+from domdf_python_tools.typing import PathLike
+
+# this package
+from pyproject_devenv import mkdevenv
+
+# Generous limits (in milliseconds) which still catch heavy modules being imported at startup again.
+PACKAGE_BUDGET = int(os.environ.get("PYPROJECT_DEVENV_IMPORT_BUDGET", 250))
+VERSION_BUDGET = int(os.environ.get("PYPROJECT_DEVENV_VERSION_IMPORT_BUDGET", 1500))
+NOOP_BUDGET = int(os.environ.get("PYPROJECT_DEVENV_NOOP_IMPORT_BUDGET", 1500))
+
+# Modules which are only needed to actually create a devenv.
+HEAVY_MODULES = ["virtualenv", "pyproject_parser", "shippinglabel", "packaging.requirements", "pyproject_devenv.config"]
+
+
+def importtime(*args: str, cwd: Optional[PathLike] = None) -> Dict[str, List[int]]:
+	"""
+	Run Python with ``-X importtime``, returning a mapping of module names to self and cumulative times in μs.
+
+	The combined cumulative time of all top-level imports is recorded under ``<total>``.
+	"""
+
+	# Run from another directory, the package is found via PYTHONPATH.
+	env = dict(os.environ)
+	env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+	# Make sure bytecode caches are written, so they aren't included in the time.
+	subprocess.run([sys.executable, *args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=cwd, env=env)
+
+	process = subprocess.run(
+			[sys.executable, "-X", "importtime", *args],
+			stdout=subprocess.DEVNULL,
+			stderr=subprocess.PIPE,
+			check=True,
+			cwd=cwd,
+			env=env,
+			)
+
+	modules: Dict[str, List[int]] = {"<total>": [0, 0]}
+
+	for line in process.stderr.decode("UTF-8").splitlines():
+		if not line.startswith("import time:") or "self [us]" in line:
+			continue
+
+		self_time, cumulative, name = line[len("import time:"):].split('|')
+		modules[name.strip()] = [int(self_time), int(cumulative)]
+
+		if not name[1:].startswith(' '):
+			modules["<total>"][1] += int(cumulative)
+
+	return modules
+
+
+@pytest.mark.parametrize(
+		"args",
+		[
+				pytest.param(["-c", "import pyproject_devenv"], id="import"),
+				pytest.param(["-m", "pyproject_devenv", "--version"], id="version"),
+				],
+		)
+def test_no_heavy_imports(args: List[str]) -> None:
+	modules = importtime(*args)
+	assert "pyproject_devenv" in modules
+	assert [name for name in HEAVY_MODULES if name in modules] == []
+
+
+def test_import_time_budget() -> None:
+	modules = importtime("-c", "import pyproject_devenv")
+	assert modules["pyproject_devenv"][1] / 1000 <= PACKAGE_BUDGET
+
+
+def test_version_import_time_budget() -> None:
+	modules = importtime("-m", "pyproject_devenv", "--version")
+	assert modules["<total>"][1] / 1000 <= VERSION_BUDGET
+
+
+def test_up_to_date_import_time_budget(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = []",
+			])
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data") == 0
+
+	# Running again when the devenv is already up to date only needs to compute its fingerprint.
+	process = subprocess.run(
+			[sys.executable, "-m", "pyproject_devenv"],
+			stdout=subprocess.PIPE,
+			check=True,
+			cwd=tmp_pathplus,
+			env={**os.environ, "PYTHONPATH": os.getcwd()},
+			)
+	assert process.stdout.decode("UTF-8").splitlines() == [
+			f"The devenv in {(tmp_pathplus / 'venv').as_posix()!r} is already up to date.",
+			]
+
+	modules = importtime("-m", "pyproject_devenv", cwd=tmp_pathplus)
+	assert [name for name in HEAVY_MODULES if name in modules] == []
+	assert modules["<total>"][1] / 1000 <= NOOP_BUDGET
@@ -0,0 +1,121 @@
+# stdlib
+import shutil
+import sys
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv import InstallError, _Devenv, mkdevenv
+from pyproject_devenv.installers import PipInstaller, PipWorkerInstaller, UvInstaller, get_installer
+
+requires_uv = pytest.mark.skipif(not UvInstaller.is_available(), reason="uv is not installed.")
+
+
+def test_pip_command() -> None:
+	assert PipInstaller(verbosity=0, cache_dir="cache").command("python", ["install", "click"]) == [
+			"python",
+			"-m",
+			"pip",
+			"install",
+			"click",
+			"--disable-pip-version-check",
+			"--cache-dir",
+			"cache",
+			"--quiet",
+			]
+
+
+def test_uv_command(monkeypatch) -> None:
+	monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+
+	uv = UvInstaller(verbosity=2, cache_dir="cache")
+	assert uv.command("python", ["install", "-r", "requirements.txt", "--upgrade"]) == [
+			"/usr/bin/uv",
+			"pip",
+			"install",
+			"--python",
+			"python",
+			"-r",
+			"requirements.txt",
+			"--upgrade",
+			"--cache-dir",
+			"cache",
+			"--verbose",
+			]
+	assert uv.command("python", ["uninstall", "--yes", "click"]) == [
+			"/usr/bin/uv",
+			"pip",
+			"uninstall",
+			"--python",
+			"python",
+			"click",
+			"--cache-dir",
+			"cache",
+			"--verbose",
+			]
+	assert "--cache-dir" not in UvInstaller().command("python", ["install", "click"])
+
+
+def test_get_installer(monkeypatch) -> None:
+	assert isinstance(get_installer("pip-worker", verbosity=0), PipWorkerInstaller)
+
+	monkeypatch.setattr(shutil, "which", lambda name: None)
+	assert isinstance(get_installer("auto"), PipInstaller)
+
+	monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+	assert isinstance(get_installer("auto"), UvInstaller)
+
+	with pytest.raises(ValueError, match="Unknown installer 'poetry'"):
+		get_installer("poetry")
+
+	with pytest.raises(ValueError, match="Unknown installer 'poetry'"):
+		_Devenv(PathPlus(__file__).parent.parent, installer="poetry")
+
+
+@requires_uv
+def test_mkdevenv_uv(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	assert mkdevenv(tmp_pathplus, verbosity=0, installer="uv") == 0
+
+	site_packages = list((tmp_pathplus / "venv").rglob("site-packages"))[0]
+	assert (site_packages / "six.py").is_file()
+
+
+@pytest.mark.parametrize(
+		"installer",
+		[
+				pytest.param("pip", id="pip"),
+				pytest.param(
+						"pip-worker",
+						id="pip-worker",
+						marks=pytest.mark.skipif(sys.platform == "win32", reason="Not supported on Windows."),
+						),
+				pytest.param("uv", id="uv", marks=requires_uv),
+				],
+		)
+def test_mkdevenv_install_error(tmp_pathplus: PathPlus, installer: str) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['pyproject-devenv-does-not-exist==1.0']",
+			])
+
+	log_file = tmp_pathplus / "install.log"
+
+	with pytest.raises(
+			InstallError,
+			match="Could not install the given requirements: 'pyproject-devenv-does-not-",
+			) as e:
+		mkdevenv(tmp_pathplus, verbosity=0, installer=installer, log_file=log_file)
+
+	# The end of the installer's output is included in the error.
+	assert any("pyproject-devenv-does-not-exist" in line for line in e.value.output)
+	assert "\n\nThe last lines of output were:\n    " in str(e.value)
+	assert e.value.output[-1] in log_file.read_text()
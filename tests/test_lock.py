@@ -0,0 +1,223 @@
+# stdlib
+import subprocess
+import sys
+
+# 3rd party
+import dom_toml
+import pytest
+from consolekit.testing import CliRunner, Result
+from dom_toml.parser import BadConfigError
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from pyproject_devenv import _Devenv, mkdevenv
+from pyproject_devenv.__main__ import main
+from pyproject_devenv.discovery import find_interpreter
+from pyproject_devenv.installers import PipInstaller
+from pyproject_devenv.lock import (
+		LOCKFILE_NAME,
+		check_environment,
+		create_lockfile,
+		load_lockfile,
+		locked_requirements,
+		requirement_groups
+		)
+
+lockfile = {
+		"lock-version": 1,
+		"requirements-hash": "abc",
+		"packages": {
+				"click": {"version": "8.0.1", "hashes": ["sha256:1234"]},
+				"six": {"version": "1.16.0", "hashes": ["sha256:5678", "sha512:90ab"]},
+				"pytest": {"version": "6.2.5", "hashes": ["sha256:cdef"]},
+				"setuptools": {"version": "58.0.0", "hashes": ["sha256:0000"]},
+				"mylib": {"version": "0.1.0", "url": "file:///path/to/mylib"},
+				},
+		"groups": {
+				"project": ["click"],
+				"tests": ["pytest", "six"],
+				"build": ["setuptools"],
+				"extras": {"local": ["mylib"]},
+				},
+		}
+
+
+def test_locked_requirements() -> None:
+	assert locked_requirements(lockfile) == [
+			"click==8.0.1 --hash=sha256:1234",
+			"pytest==6.2.5 --hash=sha256:cdef",
+			"setuptools==58.0.0 --hash=sha256:0000",
+			"six==1.16.0 --hash=sha256:5678 --hash=sha512:90ab",
+			]
+
+	assert locked_requirements(lockfile, tests=False, build=False) == ["click==8.0.1 --hash=sha256:1234"]
+
+	# Hashes must be given for all requirements or none.
+	assert locked_requirements(lockfile, tests=False, build=False, extras=["local"]) == [
+			"click==8.0.1",
+			"mylib @ file:///path/to/mylib",
+			]
+
+
+def test_load_lockfile(tmp_pathplus: PathPlus) -> None:
+	with pytest.raises(BadConfigError, match="The lockfile '.*' was not found. Run 'pyproject-devenv lock' first."):
+		load_lockfile(tmp_pathplus / LOCKFILE_NAME)
+
+	dom_toml.dump({**lockfile, "lock-version": 999}, tmp_pathplus / LOCKFILE_NAME)
+
+	with pytest.raises(BadConfigError, match="Unsupported lockfile version 999"):
+		load_lockfile(tmp_pathplus / LOCKFILE_NAME)
+
+	dom_toml.dump(lockfile, tmp_pathplus / LOCKFILE_NAME)
+	assert load_lockfile(tmp_pathplus / LOCKFILE_NAME) == lockfile
+
+
+def test_requirement_groups(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click']",
+			'',
+			"[project.optional-dependencies]",
+			"doc = ['sphinx']",
+			])
+	(tmp_pathplus / "tests").mkdir()
+	(tmp_pathplus / "tests/requirements.txt").write_lines(["pytest"])
+
+	groups = {name: list(map(str, reqs)) for name, reqs in requirement_groups(_Devenv(tmp_pathplus)).items()}
+	assert groups == {
+			"project": ["click"],
+			"extras.doc": ["sphinx"],
+			"tests": ["pytest"],
+			"build": ["setuptools"],
+			}
+
+	devenv = _Devenv(tmp_pathplus, extras=[], build=False)
+	groups = {name: list(map(str, reqs)) for name, reqs in requirement_groups(devenv, selected=True).items()}
+	assert groups == {"project": ["click"], "tests": ["pytest"]}
+	assert list(devenv.requirement_groups()) == ["project requirements", "test requirements"]
+
+
+def test_check_environment() -> None:
+	environment = {
+			"implementation_name": "cpython",
+			"python_version": "3.11",
+			"python_full_version": "3.11.4",
+			"sys_platform": "linux",
+			"platform_machine": "x86_64",
+			}
+
+	check_environment({"environment": environment}, {**environment, "python_full_version": "3.11.9"})
+
+	other_environment = {**environment, "python_version": "3.12", "sys_platform": "darwin"}
+	message = r"different interpreter or platform \(python_version '3.11' != '3.12', sys_platform 'linux' != 'darwin'\)"
+
+	with pytest.raises(BadConfigError, match=message):
+		check_environment({"environment": environment}, other_environment)
+
+
+def test_lock_python_spec(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click']",
+			])
+
+	class Resolved(Exception):
+		pass
+
+	executables = []
+
+	def run(self, executable, args, env) -> int:  # noqa: MAN001
+		executables.append(executable)
+		raise Resolved
+
+	monkeypatch.setattr(PipInstaller, "run", run)
+
+	# The interpreter is found in the same way as when creating the devenv.
+	spec = f"{sys.version_info.major}.{sys.version_info.minor}"
+	with pytest.raises(Resolved):
+		create_lockfile(_Devenv(tmp_pathplus, python=spec))
+
+	assert executables == [find_interpreter(spec).executable]
+
+
+def test_lock_and_install(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['click', 'colorama; sys_platform == \"win32\"']",
+			'',
+			"[project.optional-dependencies]",
+			"six = ['six']",
+			])
+
+	with in_directory(tmp_pathplus):
+		runner = CliRunner()
+		result: Result = runner.invoke(main, args=["lock"])
+		assert result.exit_code == 0
+		assert result.stdout.endswith(f"{LOCKFILE_NAME}'\n")
+
+	data = load_lockfile(tmp_pathplus / LOCKFILE_NAME)
+	assert set(data["packages"]) <= {"click", "colorama", "six", "setuptools"}
+	assert "click" in data["groups"]["project"]
+	assert data["groups"]["extras"]["six"] == ["six"]
+	assert data["groups"]["build"] == ["setuptools"]
+	assert all(package["hashes"] for package in data["packages"].values())
+
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, locked=True) == 0
+
+	if sys.platform == "win32":
+		site_packages = tmp_pathplus / "venv" / "Lib" / "site-packages"
+	else:
+		site_packages = next((tmp_pathplus / "venv" / "lib").glob("py*")) / "site-packages"
+
+	version = data["packages"]["click"]["version"]
+	assert (site_packages / f"click-{version}.dist-info").is_dir()
+	assert (site_packages / "six.py").is_file()
+
+	# Syncing installs the missing pinned versions, without resolving their dependencies.
+	devenv = _Devenv(tmp_pathplus, "venv", verbosity=0, locked=True)
+	subprocess.run(
+			[str(devenv.venv_executable()), "-m", "pip", "uninstall", "--yes", "click"],
+			stdout=subprocess.DEVNULL,
+			check=True,
+			)
+
+	installs = []
+	install = _Devenv._install
+
+	def record_install(self, executable, args, options, env) -> None:  # noqa: MAN001
+		installs.append((PathPlus(args[1]).read_text().splitlines(), options))
+		install(self, executable, args, options, env)
+
+	monkeypatch.setattr(_Devenv, "_install", record_install)
+	assert mkdevenv(tmp_pathplus, "venv", verbosity=0, locked=True, sync=True, force=True) == 0
+	assert installs == [([locked_requirements(data, tests=False, build=False)[0]], ["--no-deps"])]
+	assert installs[0][0][0].startswith(f"click=={version} --hash=")
+	assert (site_packages / f"click-{version}.dist-info").is_dir()
+	assert devenv.is_up_to_date()
+	monkeypatch.undo()
+
+	# A lockfile for another interpreter is refused.
+	(tmp_pathplus / LOCKFILE_NAME).write_text(
+			(tmp_pathplus / LOCKFILE_NAME).read_text().replace(
+					f"python_version = \"{data['environment']['python_version']}\"",
+					"python_version = \"2.7\"",
+					)
+			)
+
+	with pytest.raises(BadConfigError, match="The lockfile was created for a different interpreter or platform"):
+		mkdevenv(tmp_pathplus, "venv", verbosity=0, locked=True, force=True)
+
+	# Changing the requirements makes the lockfile stale
+	(tmp_pathplus / "pyproject.toml").append_text("other = ['flask']\n")
+
+	with pytest.raises(BadConfigError, match="The lockfile '.*' is out of date."):
+		mkdevenv(tmp_pathplus, "venv", verbosity=0, locked=True)
@@ -0,0 +1,50 @@
+# stdlib
+import io
+import sys
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv.output import StreamedOutput, run_streamed
+
+
+def test_streamed_output(tmp_pathplus: PathPlus, capfd) -> None:
+	output = StreamedOutput(max_lines=2, log_file=tmp_pathplus / "output.log")
+
+	assert not output.stream(io.BytesIO(b"one\ntwo\r\nthree\nfour"))
+	assert output.tail == ["three", "four"]
+	assert capfd.readouterr().out == "one\ntwo\r\nthree\nfour"
+
+	output.clear()
+	assert output.tail == []
+
+	stream = io.BytesIO(b"five\nsix\n--end--\nseven\n")
+	assert output.stream(stream, until=b"--end--\n")
+	assert output.tail == ["five", "six"]
+	assert stream.read() == b"seven\n"
+
+	assert (tmp_pathplus / "output.log").read_bytes() == b"one\ntwo\r\nthree\nfourfive\nsix\n"
+
+
+def test_streamed_output_long_lines(capfd) -> None:
+	line = b'x' * 100_000
+	output = StreamedOutput(echo=False)
+
+	# The marker is found even if it is split between two chunks.
+	stream = io.BytesIO(line[:-3] + b"--end--\n")
+	assert output.stream(stream, until=b"--end--\n")
+	assert ''.join(output.tail) == 'x' * (100_000 - 3)
+	assert not capfd.readouterr().out
+
+
+def test_run_streamed(capfd) -> None:
+	output = StreamedOutput()
+	command = [sys.executable, "-c", "import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"]
+
+	assert run_streamed(command, {}, output) == 3
+	assert sorted(output.tail) == ["err", "out"]
+
+	captured = capfd.readouterr()
+	assert captured.out == "out\n"
+	assert captured.err == "err\n"
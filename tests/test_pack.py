@@ -0,0 +1,245 @@
+# stdlib
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from typing import Dict, List
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from pyproject_devenv import _Devenv, mkdevenv
+from pyproject_devenv.__main__ import main
+from pyproject_devenv.pack import MANIFEST_NAME, pack_venv, read_manifest, unpack_venv
+
+
+@pytest.fixture()
+def venv(tmp_pathplus: PathPlus) -> PathPlus:
+	venv_dir = tmp_pathplus / "src" / "venv"
+	(venv_dir / "bin").mkdir(parents=True)
+	site_packages = venv_dir / "lib" / "python3.9" / "site-packages"
+	site_packages.mkdir(parents=True)
+	(venv_dir / "include").mkdir()
+
+	(venv_dir / "pyvenv.cfg").write_lines(["home = /usr/bin", "prompt = demo"])
+	(venv_dir / "bin" / "activate").write_lines([f"VIRTUAL_ENV={venv_dir.as_posix()}"])
+	(venv_dir / "bin" / "pytest").write_lines([f"#!{venv_dir.as_posix()}/bin/python", "import pytest"])
+	(venv_dir / "bin" / "pytest").chmod(0o755)
+	(site_packages / "editable.pth").write_lines([f"{venv_dir.as_posix()}/src"])
+	(site_packages / "module.py").write_lines([f"PATH = {venv_dir.as_posix()!r}"])
+	os.utime(site_packages / "module.py", ns=(1_600_000_001_123_456_789, 1_600_000_001_123_456_789))
+
+	if sys.platform != "win32":
+		os.symlink("pytest", venv_dir / "bin" / "py.test")
+		os.symlink(venv_dir / "bin" / "pytest", venv_dir / "bin" / "absolute-link")
+
+	return venv_dir
+
+
+@pytest.mark.parametrize("jobs", [1, None])
+def test_pack_unpack(venv: PathPlus, tmp_pathplus: PathPlus, jobs: int) -> None:
+	archive = pack_venv(venv, tmp_pathplus / "venv.zip", fingerprint="abc123")
+	assert archive == tmp_pathplus / "venv.zip"
+	assert not list(tmp_pathplus.glob(".venv.zip.*"))
+
+	manifest = read_manifest(archive)
+	assert manifest["fingerprint"] == "abc123"
+	assert manifest["prefix"] == os.fspath(venv)
+	assert "include" in manifest["directories"]
+
+	dst = tmp_pathplus / "dst" / "venv"
+	assert unpack_venv(archive, dst, jobs=jobs) == manifest
+	site_packages = dst / "lib" / "python3.9" / "site-packages"
+
+	assert (dst / "include").is_dir()
+	assert (dst / "pyvenv.cfg").read_text().splitlines() == ["home = /usr/bin", "prompt = demo"]
+	assert (dst / "bin" / "activate").read_text().splitlines() == [f"VIRTUAL_ENV={dst.as_posix()}"]
+	assert (dst / "bin" / "pytest").read_text().splitlines() == [f"#!{dst.as_posix()}/bin/python", "import pytest"]
+	assert (site_packages / "editable.pth").read_text().splitlines() == [f"{dst.as_posix()}/src"]
+
+	# Only files which are expected to contain the path are rewritten.
+	assert (site_packages / "module.py").read_text().splitlines() == [f"PATH = {venv.as_posix()!r}"]
+	assert os.stat(site_packages / "module.py").st_mtime_ns == 1_600_000_001_123_456_789
+
+	if sys.platform != "win32":
+		assert os.access(dst / "bin" / "pytest", os.X_OK)
+		assert os.readlink(dst / "bin" / "py.test") == "pytest"
+		assert os.readlink(dst / "bin" / "absolute-link") == os.fspath(dst / "bin" / "pytest")
+
+	# An existing virtualenv is replaced.
+	(dst / "bin" / "stale").touch()
+	unpack_venv(archive, dst, jobs=jobs)
+	assert not (dst / "bin" / "stale").exists()
+	assert sorted(p.name for p in dst.parent.iterdir()) == ["venv"]
+
+
+def test_read_manifest_errors(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "not-a-zip.zip").write_text("Hello world")
+
+	with pytest.raises(ValueError, match="is not a packed virtualenv"):
+		read_manifest(tmp_pathplus / "not-a-zip.zip")
+
+	with zipfile.ZipFile(tmp_pathplus / "other.zip", 'w') as zf:
+		zf.writestr("README.rst", "Hello world")
+
+	with pytest.raises(ValueError, match="is not a packed virtualenv"):
+		read_manifest(tmp_pathplus / "other.zip")
+
+	with zipfile.ZipFile(tmp_pathplus / "future.zip", 'w') as zf:
+		zf.writestr(MANIFEST_NAME, '{"version": 999}')
+
+	with pytest.raises(ValueError, match="is from an incompatible version"):
+		read_manifest(tmp_pathplus / "future.zip")
+
+
+@pytest.mark.parametrize(
+		"files, directories, symlinks, match",
+		[
+				pytest.param(["../evil.pth"], [], {}, "contains the unsafe path '../evil.pth'", id="parent"),
+				pytest.param(["lib/../../evil.pth"], [], {}, "unsafe path 'lib/../../evil.pth'", id="nested"),
+				pytest.param(["/tmp/evil.pth"], [], {}, "unsafe path '/tmp/evil.pth'", id="absolute"),
+				pytest.param(["C:/evil.pth"], [], {}, "unsafe path 'C:/evil.pth'", id="drive"),
+				pytest.param(["..\\evil.pth"], [], {}, "unsafe path '..\\\\\\\\evil.pth'", id="backslash"),
+				pytest.param([], ["../evil"], {}, "unsafe path '../evil'", id="directory"),
+				pytest.param([], [], {"../evil": "/etc"}, "unsafe path '../evil'", id="symlink_location"),
+				pytest.param(
+						[],
+						[],
+						{"bin/evil": "../../etc"},
+						"contains a symlink 'bin/evil' pointing outside it to '../../etc'",
+						id="symlink_target",
+						),
+				],
+		)
+def test_unpack_malicious(
+		tmp_pathplus: PathPlus,
+		files: List[str],
+		directories: List[str],
+		symlinks: Dict[str, str],
+		match: str,
+		) -> None:
+	manifest = {
+			"version": 1,
+			"prefix": "/src/venv",
+			"fingerprint": None,
+			"directories": directories,
+			"symlinks": symlinks,
+			"mtimes": {},
+			}
+
+	with zipfile.ZipFile(tmp_pathplus / "evil.zip", 'w') as zf:
+		zf.writestr("pyvenv.cfg", "home = /usr/bin")
+		for filename in files:
+			zf.writestr(filename, "import os")
+		zf.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+	with pytest.raises(ValueError, match=match):
+		unpack_venv(tmp_pathplus / "evil.zip", tmp_pathplus / "dst" / "venv")
+
+	assert sorted(p.name for p in tmp_pathplus.iterdir()) == ["evil.zip"]
+
+
+def test_archive_path_editable(tmp_pathplus: PathPlus) -> None:
+	for project_dir in (tmp_pathplus / "project", tmp_pathplus / "other-project"):
+		project_dir.mkdir()
+		(project_dir / "pyproject.toml").write_lines(["[project]", "name = 'pyproject-devenv-demo'"])
+
+	project = _Devenv(tmp_pathplus / "project")
+	other = _Devenv(tmp_pathplus / "other-project")
+	assert project.archive_path("archives") == other.archive_path("archives")
+
+	# Editable installs point at the project directory, so can't be used from another.
+	project = _Devenv(tmp_pathplus / "project", editable=True)
+	other = _Devenv(tmp_pathplus / "other-project", editable=True)
+	assert project.archive_path("archives") != other.archive_path("archives")
+	assert project.archive_path("archives").name.startswith(project.fingerprint())
+	again = _Devenv(tmp_pathplus / "project", editable=True)
+	assert project.archive_path("archives") == again.archive_path("archives")
+
+
+def test_pack_unpack_devenv(tmp_pathplus: PathPlus) -> None:
+	project_dir = tmp_pathplus / "project"
+	project_dir.mkdir()
+	(project_dir / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	devenv = _Devenv(project_dir, "venv", verbosity=0, seeder="app-data")
+
+	with pytest.raises(ValueError, match="is missing or out of date"):
+		devenv.pack(tmp_pathplus / "archives")
+
+	assert mkdevenv(project_dir, "venv", verbosity=0, seeder="app-data") == 0
+	archive = devenv.pack(tmp_pathplus / "archives")
+	assert archive == tmp_pathplus / "archives" / f"{devenv.fingerprint()}.zip"
+
+	# Restore the devenv for a copy of the project.
+	other_project_dir = tmp_pathplus / "other-project"
+	other_project_dir.mkdir()
+	(other_project_dir / "pyproject.toml").write_text((project_dir / "pyproject.toml").read_text())
+
+	other = _Devenv(other_project_dir, "venv", verbosity=0)
+	assert other.unpack(tmp_pathplus / "archives")
+	assert other.is_up_to_date()
+
+	process = subprocess.run(
+			[str(other.venv_executable()), "-c", "import six, sys; print(sys.prefix); print(six.__file__)"],
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+	prefix, six_file = process.stdout.decode("UTF-8").splitlines()
+	assert os.path.samefile(prefix, other.venv_dir)
+	assert PathPlus(six_file).is_relative_to(other.venv_dir)
+
+	if sys.platform != "win32":
+		# Console scripts work at the new location.
+		pip = other.venv_dir / "bin" / "pip"
+		subprocess.run([str(pip), "--version"], stdout=subprocess.PIPE, check=True)
+
+	(other_project_dir / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six', 'click']",
+			])
+	assert not _Devenv(other_project_dir, "venv2").unpack(tmp_pathplus / "archives")
+	assert not (other_project_dir / "venv2").exists()
+
+
+def test_pack_unpack_cli(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = []",
+			])
+
+	runner = CliRunner()
+
+	with in_directory(tmp_pathplus):
+		result: Result = runner.invoke(main, args=["unpack", "archives"])
+		assert result.exit_code == 1
+		assert result.stdout == "No archive found for the devenv in 'archives'\n"
+
+		assert mkdevenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data") == 0
+
+		result = runner.invoke(main, args=["pack", "archives"])
+		assert result.exit_code == 0
+		archive = tmp_pathplus / "archives" / f"{_Devenv(tmp_pathplus).fingerprint()}.zip"
+		assert result.stdout == f"Wrote archive to {archive.as_posix()!r}\n"
+
+		result = runner.invoke(main, args=["unpack", "archives"])
+		assert result.exit_code == 0
+		assert result.stdout == f"The devenv in {(tmp_pathplus / 'venv').as_posix()!r} is already up to date.\n"
+
+		result = runner.invoke(main, args=["unpack", "archives", "venv2"])
+		assert result.exit_code == 0
+		assert result.stdout == f"Restored the devenv in {(tmp_pathplus / 'venv2').as_posix()!r}\n"
+		assert _Devenv(tmp_pathplus, "venv2").is_up_to_date()
+
+		result = runner.invoke(main, args=["unpack", "archives", "venv3", "--no-tests"])
+		assert result.exit_code == 1
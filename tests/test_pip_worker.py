@@ -0,0 +1,59 @@
+# stdlib
+import sys
+from typing import List
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv import mkdevenv
+from pyproject_devenv.pip_worker import PipJobResult, PipWorker
+
+
+def test_pip_worker() -> None:
+	with PipWorker(sys.executable) as worker:
+		assert worker.run(["--version"]).returncode == 0
+		assert worker.run(["install", "--no-index", "--quiet", "pyproject-devenv-missing"]).returncode == 1
+
+		# The worker is still usable after a failed command.
+		result = worker.run(["show", "--quiet", "pip"])
+
+	assert result == PipJobResult(["show", "--quiet", "pip"], 0, result.duration, None)
+	assert [result.returncode for result in worker.results] == [0, 1, 0]
+
+
+def test_mkdevenv_pip_worker(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[build-system]",
+			'requires = ["setuptools"]',
+			'',
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			'',
+			"[project.optional-dependencies]",
+			"extra = ['attrs']",
+			])
+
+	workers: List[PipWorker] = []
+	close = PipWorker.close
+
+	def record_close(self: PipWorker) -> None:
+		workers.append(self)
+		close(self)
+
+	monkeypatch.setattr(PipWorker, "close", record_close)
+
+	assert mkdevenv(tmp_pathplus, verbosity=0, installer="pip-worker") == 0
+
+	assert len(workers) == 1
+	assert [result.args[:2] for result in workers[0].results] == [
+			["install", "six"],
+			["install", "attrs"],
+			["install", "setuptools"],
+			]
+	assert all(result.returncode == 0 for result in workers[0].results)
+
+	site_packages = list((tmp_pathplus / "venv").rglob("site-packages"))[0]
+	assert (site_packages / "six.py").is_file()
+	assert (site_packages / "attr").is_dir()
@@ -0,0 +1,135 @@
+# stdlib
+import os
+import subprocess
+
+# 3rd party
+import pytest
+from consolekit.testing import CliRunner, Result
+from dom_toml.parser import BadConfigError
+from domdf_python_tools.paths import PathPlus, in_directory
+
+# this package
+from pyproject_devenv import _Devenv
+from pyproject_devenv.__main__ import main
+from pyproject_devenv.pool import DevenvPool, PoolProject, read_pool_config, serve_pool
+
+
+@pytest.fixture()
+def project_dir(tmp_pathplus: PathPlus) -> PathPlus:
+	project_dir = tmp_pathplus / "project"
+	project_dir.mkdir()
+	(project_dir / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = []",
+			])
+	return project_dir
+
+
+def test_read_pool_config(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "pool.toml").write_lines([
+			"[[project]]",
+			"path = 'project-a'",
+			'',
+			"[[project]]",
+			"path = 'project-b'",
+			"size = 4",
+			"python = '3.11'",
+			"extras = ['docs']",
+			])
+
+	assert read_pool_config(tmp_pathplus / "pool.toml", default_size=3) == [
+			PoolProject(tmp_pathplus / "project-a", 3, [None], None),
+			PoolProject(tmp_pathplus / "project-b", 4, ["3.11"], ["docs"]),
+			]
+
+	(tmp_pathplus / "pool.toml").write_lines(["[[project]]", "size = 4"])
+	with pytest.raises(BadConfigError, match="must have a 'path'"):
+		read_pool_config(tmp_pathplus / "pool.toml")
+
+	(tmp_pathplus / "pool.toml").write_lines(["[[project]]", "path = 'project-a'", "size = -1"])
+	with pytest.raises(BadConfigError, match="Invalid 'size' for project 'project-a'"):
+		read_pool_config(tmp_pathplus / "pool.toml")
+
+
+def test_pool(project_dir: PathPlus, tmp_pathplus: PathPlus) -> None:
+	devenv_pool = DevenvPool(tmp_pathplus / "pool")
+	devenv = _Devenv(project_dir, "venv", verbosity=0, seeder="app-data")
+
+	assert not devenv_pool.take(devenv)
+
+	results = devenv_pool.fill(devenv, 2, jobs=2)
+	assert [result.success for result in results] == [True, True]
+	assert devenv_pool.available(devenv) == 2
+	assert devenv_pool.building(devenv) == 0
+	assert devenv_pool.fill(devenv, 2) == []
+
+	# Left behind by a process which has exited.
+	(devenv_pool.building_dir(devenv.fingerprint()) / "999999999-abc").mkdir()
+	assert devenv_pool.building(devenv) == 0
+
+	assert devenv_pool.take(devenv)
+	assert devenv_pool.available(devenv) == 1
+	assert devenv.is_up_to_date()
+
+	process = subprocess.run(
+			[str(devenv.venv_executable()), "-c", "import sys; print(sys.prefix)"],
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+	assert os.path.samefile(process.stdout.decode("UTF-8").strip(), devenv.venv_dir)
+	assert devenv.venv_dir.as_posix() in (devenv.venv_dir / "bin" / "activate").read_text()
+	subprocess.run([str(devenv.venv_dir / "bin" / "pip"), "--version"], stdout=subprocess.PIPE, check=True)
+
+	# An existing virtualenv is replaced.
+	(devenv.venv_dir / "stale").touch()
+	assert devenv_pool.take(devenv)
+	assert not (devenv.venv_dir / "stale").exists()
+	assert sorted(p.name for p in project_dir.iterdir()) == ["pyproject.toml", "venv"]
+
+	assert not devenv_pool.take(devenv)
+
+	# A different configuration uses a different pool.
+	assert not devenv_pool.take(_Devenv(project_dir, "venv", tests=False))
+
+
+def test_serve_pool(project_dir: PathPlus, tmp_pathplus: PathPlus) -> None:
+	devenv_pool = DevenvPool(tmp_pathplus / "pool")
+	(tmp_pathplus / "pool" / "0123abcd" / "ready" / "1-abc").mkdir(parents=True)
+
+	serve_pool(
+			devenv_pool,
+			lambda: [PoolProject(project_dir, 1)],
+			max_rounds=1,
+			verbosity=0,
+			seeder="app-data",
+			)
+
+	devenv = _Devenv(project_dir, "venv")
+	assert devenv_pool.available(devenv) == 1
+	# Devenvs for other fingerprints are removed.
+	assert [p.name for p in (tmp_pathplus / "pool").iterdir()] == [devenv.fingerprint()]
+
+
+def test_pool_cli(project_dir: PathPlus, tmp_pathplus: PathPlus) -> None:
+	runner = CliRunner()
+
+	with in_directory(project_dir):
+		result: Result = runner.invoke(main, args=["pool", "take", "../pool"])
+		assert result.exit_code == 1
+		assert result.stdout == "No ready devenv found in '../pool'\n"
+
+		result = runner.invoke(main, args=["pool", "fill", "../pool", "--size", '1', "--seeder", "app-data"])
+		assert result.exit_code == 0
+		assert result.stdout.splitlines() == [
+				"==> project: added a devenv to the pool",
+				"The pool has 1 ready virtual environments.",
+				]
+
+		result = runner.invoke(main, args=["pool", "take", "../pool", "--no-tests"])
+		assert result.exit_code == 1
+
+		result = runner.invoke(main, args=["pool", "take", "../pool"])
+		assert result.exit_code == 0
+		assert result.stdout == f"Took the devenv in {(project_dir / 'venv').as_posix()!r} from the pool\n"
+		assert _Devenv(project_dir).is_up_to_date()
@@ -0,0 +1,95 @@
+# stdlib
+import os
+import sys
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv.relocate import Linker, clone_venv, relocate_venv
+
+
+@pytest.fixture()
+def venv(tmp_pathplus: PathPlus) -> PathPlus:
+	venv_dir = tmp_pathplus / "src" / "venv"
+	(venv_dir / "bin").mkdir(parents=True)
+	site_packages = venv_dir / "lib" / "python3.9" / "site-packages"
+	site_packages.mkdir(parents=True)
+
+	(venv_dir / "pyvenv.cfg").write_lines(["home = /usr/bin", "prompt = demo"])
+	(venv_dir / "bin" / "activate").write_lines([f"VIRTUAL_ENV={venv_dir.as_posix()}"])
+	(venv_dir / "bin" / "pytest").write_lines([f"#!{venv_dir.as_posix()}/bin/python", "import pytest"])
+	(venv_dir / "bin" / "pytest").chmod(0o755)
+	(site_packages / "editable.pth").write_lines([f"{venv_dir.as_posix()}/src"])
+	(site_packages / "module.py").write_lines([f"PATH = {venv_dir.as_posix()!r}"])
+
+	if sys.platform != "win32":
+		os.symlink("pytest", venv_dir / "bin" / "py.test")
+		os.symlink(venv_dir / "bin" / "pytest", venv_dir / "bin" / "absolute-link")
+
+	return venv_dir
+
+
+def test_clone_venv(venv: PathPlus, tmp_pathplus: PathPlus) -> None:
+	dst = clone_venv(venv, tmp_pathplus / "dst" / "venv", linker=Linker(["hardlink", "copy"]))
+	site_packages = dst / "lib" / "python3.9" / "site-packages"
+
+	assert (dst / "pyvenv.cfg").read_text().splitlines() == ["home = /usr/bin", "prompt = demo"]
+	assert (dst / "bin" / "activate").read_text().splitlines() == [f"VIRTUAL_ENV={dst.as_posix()}"]
+	assert (dst / "bin" / "pytest").read_text().splitlines() == [f"#!{dst.as_posix()}/bin/python", "import pytest"]
+	assert os.access(dst / "bin" / "pytest", os.X_OK)
+	assert (site_packages / "editable.pth").read_text().splitlines() == [f"{dst.as_posix()}/src"]
+
+	# Only files expected to contain the path are rewritten; others are linked.
+	assert (site_packages / "module.py").read_text().splitlines() == [f"PATH = {venv.as_posix()!r}"]
+	assert os.path.samefile(site_packages / "module.py", venv / "lib" / "python3.9" / "site-packages" / "module.py")
+	# pyvenv.cfg doesn't contain the path, but is still copied as it is modified later.
+	assert not os.path.samefile(dst / "pyvenv.cfg", venv / "pyvenv.cfg")
+	assert not os.path.samefile(dst / "bin" / "pytest", venv / "bin" / "pytest")
+
+	if sys.platform != "win32":
+		assert os.readlink(dst / "bin" / "py.test") == "pytest"
+		assert os.readlink(dst / "bin" / "absolute-link") == os.path.join(dst, "bin", "pytest")
+
+
+def test_clone_venv_copy(venv: PathPlus, tmp_pathplus: PathPlus) -> None:
+	dst = clone_venv(venv, tmp_pathplus / "dst", linker=Linker(["copy"]))
+	module = dst / "lib" / "python3.9" / "site-packages" / "module.py"
+	assert not os.path.samefile(module, venv / "lib" / "python3.9" / "site-packages" / "module.py")
+
+
+def test_linker_fallback(tmp_pathplus: PathPlus) -> None:
+	(tmp_pathplus / "a.txt").write_text("hello")
+
+	linker = Linker()
+	method = linker.link(tmp_pathplus / "a.txt", tmp_pathplus / "b.txt")
+	assert method in {"reflink", "hardlink", "copy"}
+	assert linker.methods[0] == method
+	assert (tmp_pathplus / "b.txt").read_text() == "hello"
+
+
+def test_clone_venv_new_prefix(venv: PathPlus, tmp_pathplus: PathPlus) -> None:
+	dst = clone_venv(venv, tmp_pathplus / "staging", new_prefix=tmp_pathplus / "final")
+	assert (dst / "bin" / "activate").read_text().splitlines() == [f"VIRTUAL_ENV={(tmp_pathplus / 'final').as_posix()}"]
+
+
+def test_relocate_venv(venv: PathPlus, tmp_pathplus: PathPlus) -> None:
+	dst = tmp_pathplus / "dst" / "venv"
+	dst.parent.mkdir()
+	os.rename(venv, dst)
+
+	assert relocate_venv(dst, venv) == dst
+	site_packages = dst / "lib" / "python3.9" / "site-packages"
+
+	assert (dst / "pyvenv.cfg").read_text().splitlines() == ["home = /usr/bin", "prompt = demo"]
+	assert (dst / "bin" / "activate").read_text().splitlines() == [f"VIRTUAL_ENV={dst.as_posix()}"]
+	assert (dst / "bin" / "pytest").read_text().splitlines() == [f"#!{dst.as_posix()}/bin/python", "import pytest"]
+	assert os.access(dst / "bin" / "pytest", os.X_OK)
+	assert (site_packages / "editable.pth").read_text().splitlines() == [f"{dst.as_posix()}/src"]
+	assert (site_packages / "module.py").read_text().splitlines() == [f"PATH = {venv.as_posix()!r}"]
+	assert not list(dst.rglob(".*.pyproject-devenv-tmp"))
+
+	if sys.platform != "win32":
+		assert os.readlink(dst / "bin" / "py.test") == "pytest"
+		assert os.readlink(dst / "bin" / "absolute-link") == os.path.join(dst, "bin", "pytest")
@@ -0,0 +1,168 @@
+# stdlib
+import sys
+
+# 3rd party
+import pytest
+from packaging.requirements import Requirement
+from packaging.specifiers import SpecifierSet
+from shippinglabel.requirements import ComparableRequirement
+
+# this package
+from pyproject_devenv.requirements import (
+		InstalledDistribution,
+		RequirementConflict,
+		VenvState,
+		evaluate_marker,
+		find_conflicts,
+		inspect_venv,
+		is_satisfiable,
+		plan_sync
+		)
+
+linux_environment = {
+		"implementation_name": "cpython",
+		"implementation_version": "3.9.7",
+		"os_name": "posix",
+		"platform_machine": "x86_64",
+		"platform_release": "5.10.0",
+		"platform_system": "Linux",
+		"platform_version": "#1 SMP",
+		"python_full_version": "3.9.7",
+		"platform_python_implementation": "CPython",
+		"python_version": "3.9",
+		"sys_platform": "linux",
+		}
+
+
+def test_inspect_venv() -> None:
+	state = inspect_venv(sys.executable)
+
+	assert state.environment["python_version"] == f"{sys.version_info.major}.{sys.version_info.minor}"
+	assert state.environment["sys_platform"] == sys.platform
+	assert "packaging" in state.distributions
+	assert state.distributions["packaging"].name == "packaging"
+
+
+def test_evaluate_marker() -> None:
+	assert evaluate_marker(Requirement("foo"), linux_environment)
+	assert evaluate_marker(Requirement("foo; sys_platform == 'linux'"), linux_environment)
+	assert not evaluate_marker(Requirement("foo; sys_platform == 'win32'"), linux_environment)
+	assert not evaluate_marker(Requirement("foo; python_version < '3.8'"), linux_environment)
+	assert not evaluate_marker(Requirement("foo; extra == 'doc'"), linux_environment)
+	assert evaluate_marker(Requirement("foo; extra == 'doc'"), linux_environment, extra="doc")
+
+
+def test_plan_sync() -> None:
+	state = VenvState(
+			linux_environment,
+			{
+					"pip": InstalledDistribution("pip", "21.0", []),
+					"click": InstalledDistribution("click", "7.1.2", []),
+					"flask": InstalledDistribution(
+							"Flask",
+							"2.0.1",
+							["click>=7.1.2", "Werkzeug>=2.0", "python-dotenv; extra == 'dotenv'"],
+							),
+					"werkzeug": InstalledDistribution("Werkzeug", "2.0.1", []),
+					"old-thing": InstalledDistribution("old_thing", "1.0", []),
+					},
+			)
+
+	plan = plan_sync([ComparableRequirement("flask")], state)
+	assert plan.install == []
+	assert plan.extraneous == ["old_thing"]
+
+	plan = plan_sync(
+			[
+					ComparableRequirement("flask[dotenv]"),
+					ComparableRequirement("click>=8"),
+					ComparableRequirement("pywin32; sys_platform == 'win32'"),
+					ComparableRequirement("requests"),
+					],
+			state,
+			)
+	assert list(map(str, plan.install)) == ["click>=8", "requests", "python-dotenv"]
+	assert plan.extraneous == ["old_thing"]
+
+	# The dependencies of a distribution being reinstalled are kept.
+	plan = plan_sync([ComparableRequirement("flask>=2.1")], state)
+	assert list(map(str, plan.install)) == ["flask>=2.1"]
+	assert plan.extraneous == ["old_thing"]
+
+
+@pytest.mark.parametrize(
+		"specifier, expected",
+		[
+				('', True),
+				(">=1,<3", True),
+				(">=1,<=1", True),
+				("~=1.4,<2", True),
+				("==1.*,<1.9", True),
+				("==1.0,==1.0.0", True),
+				("==1.0,==2.0", False),
+				("==1.0,!=1.0", False),
+				(">=2,<1.5", False),
+				(">=1,<1", False),
+				(">=1,<=1,!=1", False),
+				("~=1.4.2,>=1.5", False),
+				("==1.*,>=2", False),
+				("===abc,==1", False),
+				]
+		)
+def test_is_satisfiable(specifier: str, expected: bool) -> None:
+	assert is_satisfiable(SpecifierSet(specifier)) is expected
+
+
+def test_find_conflicts() -> None:
+	groups = {
+			"project requirements": [Requirement("six==1.15"), Requirement("click>=7")],
+			"extra 'doc'": [Requirement("click<9"), Requirement("sphinx==3; sys_platform == 'win32'")],
+			"test requirements": [
+					Requirement("Six>=1.16"),
+					Requirement("sphinx==4"),
+					Requirement("toml @ https://example.com/toml-0.10.2-py2.py3-none-any.whl"),
+					],
+			"build requirements": [Requirement("toml @ https://example.org/toml-0.10.2-py2.py3-none-any.whl")],
+			}
+
+	assert find_conflicts(groups, linux_environment) == [
+			RequirementConflict(
+					"six",
+					{"project requirements": ["six==1.15"], "test requirements": ["Six>=1.16"]},
+					"no version satisfies all of them",
+					),
+			RequirementConflict(
+					"toml",
+					{
+							"test requirements": ["toml @ https://example.com/toml-0.10.2-py2.py3-none-any.whl"],
+							"build requirements": ["toml @ https://example.org/toml-0.10.2-py2.py3-none-any.whl"],
+							},
+					"they are from different URLs",
+					),
+			]
+
+	assert find_conflicts({"project requirements": [Requirement("six==1.15"), Requirement("six==1.15")]}, {}) == []
+
+
+def test_find_conflicts_pins() -> None:
+	groups = {
+			"project requirements": [Requirement("foo==1.0; python_version >= '3'")],
+			"extra 'doc'": [Requirement("Foo==2.0; sys_platform == 'linux'"), Requirement("bar==1.0")],
+			"test requirements": [Requirement("bar==1.0.0"), Requirement("bar==2.0; sys_platform == 'win32'")],
+			}
+
+	assert find_conflicts(groups, linux_environment) == [
+			RequirementConflict(
+					"foo",
+					{
+							"project requirements": ["foo==1.0; python_version >= \"3\""],
+							"extra 'doc'": ["Foo==2.0; sys_platform == \"linux\""],
+							},
+					"no version satisfies all of them",
+					),
+			]
+
+	# Duplicate pins within a group conflict too.
+	assert find_conflicts({"test requirements": [Requirement("foo==1.0"), Requirement("foo==2.0")]}, {}) == [
+			RequirementConflict("foo", {"test requirements": ["foo==1.0", "foo==2.0"]}, "no version satisfies all of them"),
+			]
@@ -0,0 +1,143 @@
+# stdlib
+import csv
+import json
+import os
+import subprocess
+import sys
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv import _Devenv, mkdevenv
+from pyproject_devenv.cache import cache_dir
+from pyproject_devenv.store import InstallItem, read_install_report, record_hash
+
+
+def test_read_install_report(tmp_pathplus: PathPlus) -> None:
+	report = {
+			"version": '1',
+			"install": [
+					{
+							"download_info": {
+									"url": "https://files.pythonhosted.org/packages/six-1.16.0-py2.py3-none-any.whl",
+									"archive_info": {"hash": "sha256=abc", "hashes": {"sha256": "abc"}},
+									},
+							"is_direct": False,
+							"requested": True,
+							"metadata": {"name": "six", "version": "1.16.0"},
+							},
+					{
+							"download_info": {
+									"url": "https://example.com/toml-0.10.2.tar.gz",
+									"archive_info": {"hash": "sha256=def"},
+									},
+							"is_direct": True,
+							"metadata": {"name": "toml", "version": "0.10.2"},
+							},
+					{
+							"download_info": {"url": "file:///src/project", "dir_info": {}},
+							"is_direct": True,
+							"requested": True,
+							"metadata": {"name": "project", "version": "1.0.0"},
+							},
+					],
+			}
+
+	(tmp_pathplus / "report.json").write_text(json.dumps(report))
+
+	assert read_install_report(tmp_pathplus / "report.json") == [
+			InstallItem("six", "1.16.0", "six==1.16.0", "abc", True),
+			InstallItem("toml", "0.10.2", "toml @ https://example.com/toml-0.10.2.tar.gz", "def", False),
+			InstallItem("project", "1.0.0", "project @ file:///src/project", None, True),
+			]
+
+
+def test_record_hash() -> None:
+	assert record_hash(b'') == "sha256=47DEQpj8HBSa-_TImW-5JCeuQeRkm5NMpJWZG3hSuFU"
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Console scripts are executables on Windows")
+def test_mkdevenv_store(tmp_pathplus: PathPlus, monkeypatch) -> None:
+	for name in ("project-a", "project-b"):
+		(tmp_pathplus / name).mkdir()
+		(tmp_pathplus / name / "pyproject.toml").write_lines([
+				"[project]",
+				f"name = {name!r}",
+				"dependencies = ['flask', 'six']",
+				])
+
+	pip_args = []
+	run_pip = _Devenv._run_pip
+
+	def record_pip(self, executable, args, env) -> None:  # noqa: MAN001
+		pip_args.append(args)
+		run_pip(self, executable, args, env)
+
+	monkeypatch.setattr(_Devenv, "_run_pip", record_pip)
+
+	assert mkdevenv(tmp_pathplus / "project-a", "venv", verbosity=0, seeder="app-data", store=True) == 0
+	assert [args[:2] for args in pip_args] == [["install", "--dry-run"], ["install", "--no-deps"]]
+	assert (cache_dir() / "store").is_dir()
+
+	# Everything is linked from the store.
+	pip_args.clear()
+	assert mkdevenv(tmp_pathplus / "project-b", "venv", verbosity=0, seeder="app-data", store=True) == 0
+	assert [args[:2] for args in pip_args] == [["install", "--dry-run"]]
+
+	venv_a = _Devenv(tmp_pathplus / "project-a")
+	venv_b = _Devenv(tmp_pathplus / "project-b")
+	site_packages = os.path.dirname(
+			subprocess.run(
+					[str(venv_b.venv_executable()), "-c", "import six; print(six.__file__)"],
+					stdout=subprocess.PIPE,
+					check=True,
+					).stdout.decode("UTF-8").strip()
+			)
+	assert PathPlus(site_packages).is_relative_to(venv_b.venv_dir)
+
+	six_a = PathPlus(site_packages.replace(os.fspath(venv_b.venv_dir), os.fspath(venv_a.venv_dir))) / "six.py"
+	assert os.path.samefile(PathPlus(site_packages) / "six.py", six_a) or (
+			(PathPlus(site_packages) / "six.py").read_bytes() == six_a.read_bytes()
+			)
+
+	# The RECORD files match the installed files.
+	for record in PathPlus(site_packages).glob("*.dist-info/RECORD"):
+		with record.open(newline='') as fp:
+			for path, file_hash, size in csv.reader(fp):
+				filename = os.path.normpath(os.path.join(site_packages, path))
+				if file_hash and os.path.isfile(filename):
+					content = PathPlus(filename).read_bytes()
+					assert record_hash(content) == file_hash, path
+					assert str(len(content)) == size, path
+
+	for dist_info in ("six-*.dist-info", "flask-*.dist-info"):
+		assert len(list(PathPlus(site_packages).glob(f"{dist_info}/REQUESTED"))) == 1
+	assert not list(PathPlus(site_packages).glob("click-*.dist-info/REQUESTED"))
+
+	# Console scripts are rewritten for each devenv.
+	flask_script = venv_b.venv_dir / "bin" / "flask"
+	assert flask_script.read_lines()[0] == f"#!{venv_b.venv_dir.as_posix()}/bin/python"
+	subprocess.run([str(flask_script), "--version"], stdout=subprocess.PIPE, check=True)
+
+	subprocess.run([str(venv_b.venv_executable()), "-m", "pip", "check"], stdout=subprocess.PIPE, check=True)
+
+	# Uninstalling from one devenv doesn't affect the store or other devenvs.
+	subprocess.run(
+			[str(venv_b.venv_executable()), "-m", "pip", "uninstall", "--yes", "six"],
+			stdout=subprocess.PIPE,
+			check=True,
+			)
+	assert not (PathPlus(site_packages) / "six.py").exists()
+	assert six_a.is_file()
+
+	pip_args.clear()
+	assert mkdevenv(tmp_pathplus / "project-b", "venv", verbosity=0, sync=True, force=True, store=True) == 0
+	assert [args[:2] for args in pip_args] == [["install", "--dry-run"]]
+	assert (PathPlus(site_packages) / "six.py").is_file()
+
+
+def test_store_uv() -> None:
+	with pytest.raises(ValueError, match="The package store can't be used with the 'uv' installer."):
+		_Devenv('.', installer="uv", store=True)
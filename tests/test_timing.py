@@ -0,0 +1,46 @@
+# stdlib
+import json
+import subprocess
+import sys
+
+# 3rd party
+from domdf_python_tools.paths import PathPlus
+
+# this package
+from pyproject_devenv.timing import PhaseTiming, Timings
+
+
+def test_timings(tmp_pathplus: PathPlus) -> None:
+	timings = Timings()
+	assert timings.total == PhaseTiming("total", 0.0, 0.0)
+
+	with timings.phase("outer"):
+		with timings.phase("subprocess"):
+			subprocess.run([sys.executable, "-c", "sum(range(1000000))"], check=True)
+
+	assert [phase.name for phase in timings.phases] == ["subprocess", "outer"]
+	assert timings.phases[0].cpu > 0
+	assert timings.phases[1].wall >= timings.phases[0].wall
+	assert timings.total.wall == timings.phases[1].wall
+
+	table = timings.format_table().splitlines()
+	assert len(table) == 6
+	assert table[2].startswith("subprocess ")
+	assert table[5].startswith("total ")
+
+	timings.dump_json(tmp_pathplus / "timings.json")
+	report = json.loads((tmp_pathplus / "timings.json").read_text())
+	assert report["phases"][0] == timings.phases[0]._asdict()
+	assert report["total"] == timings.total._asdict()
+
+
+def test_timings_exception() -> None:
+	timings = Timings()
+
+	try:
+		with timings.phase("failing"):
+			raise ValueError
+	except ValueError:
+		pass
+
+	assert [phase.name for phase in timings.phases] == ["failing"]
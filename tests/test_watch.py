@@ -0,0 +1,160 @@
+# stdlib
+import subprocess
+import threading
+import time
+from typing import Any, Callable, List, Tuple, Type
+
+# 3rd party
+import pytest
+from domdf_python_tools.paths import PathPlus
+
+# this package
+import pyproject_devenv.requirements
+from pyproject_devenv import _Devenv
+from pyproject_devenv.watch import FileWatcher, InotifyWatcher, PollingWatcher, get_watcher, watch_devenv
+
+watchers = pytest.mark.parametrize(
+		"watcher_class",
+		[
+				pytest.param(InotifyWatcher, id="inotify"),
+				pytest.param(PollingWatcher, id="polling"),
+				],
+		)
+
+
+def make_watcher(watcher_class: Type[FileWatcher], files: List[PathPlus]) -> FileWatcher:
+	if watcher_class is PollingWatcher:
+		return PollingWatcher(files, poll_interval=0.02)
+
+	try:
+		return watcher_class(files)
+	except OSError:  # pragma: no cover
+		pytest.skip("inotify is not available.")
+
+
+def later(func: Callable[[], object], delay: float = 0.2) -> threading.Thread:
+	thread = threading.Timer(delay, func)
+	thread.start()
+	return thread
+
+
+@watchers
+def test_watcher(tmp_pathplus: PathPlus, watcher_class: Type[FileWatcher]) -> None:
+	pyproject = tmp_pathplus / "pyproject.toml"
+	pyproject.write_text("[project]\n")
+	test_requirements = tmp_pathplus / "tests" / "requirements.txt"
+
+	with make_watcher(watcher_class, [pyproject, test_requirements]) as watcher:
+		assert not watcher.wait(0.1)
+
+		# Unrelated files are ignored.
+		(tmp_pathplus / "README.rst").write_text("Hello world")
+		assert not watcher.wait(0.1)
+
+		later(lambda: pyproject.write_text("[project]\nname = 'foo'\n"))
+		assert watcher.wait(5)
+
+		# Replaced by renaming, as many editors do.
+		(tmp_pathplus / "pyproject.toml.tmp").write_text("[project]\nname = 'bar'\n")
+		later(lambda: (tmp_pathplus / "pyproject.toml.tmp").rename(pyproject))
+		assert watcher.wait(5)
+
+		# Created in a directory which doesn't exist yet.
+		(tmp_pathplus / "tests").mkdir()
+		while watcher.wait(0.1):
+			pass
+		later(lambda: test_requirements.write_text("pytest\n"))
+		assert watcher.wait(5)
+
+		while watcher.wait(0.1):
+			pass
+		later(test_requirements.unlink)
+		assert watcher.wait(5)
+
+
+def test_get_watcher(tmp_pathplus: PathPlus) -> None:
+	with get_watcher([tmp_pathplus / "pyproject.toml"]) as watcher:
+		assert isinstance(watcher, (InotifyWatcher, PollingWatcher))
+
+
+def test_watch_devenv(tmp_pathplus: PathPlus, monkeypatch, capsys) -> None:
+	(tmp_pathplus / "pyproject.toml").write_lines([
+			"[project]",
+			"name = 'pyproject-devenv-demo'",
+			"dependencies = ['six']",
+			])
+
+	pip_args = []
+	run_pip = _Devenv._run_pip
+
+	def record_pip(self, executable, args, env) -> None:  # noqa: MAN001
+		pip_args.append(args)
+		run_pip(self, executable, args, env)
+
+	monkeypatch.setattr(_Devenv, "_run_pip", record_pip)
+	devenv = _Devenv(tmp_pathplus, "venv", verbosity=0, seeder="app-data")
+	sync = _Devenv.sync
+
+	def edit() -> None:
+		# Several writes in quick succession result in one sync.
+		for dependencies in ["'six', 'iniconfig'", "'six', 'iniconfig', 'click'", "'six', 'iniconfig'"]:
+			(tmp_pathplus / "pyproject.toml").write_lines([
+					"[project]",
+					"name = 'pyproject-devenv-demo'",
+					f"dependencies = [{dependencies}]",
+					])
+			time.sleep(0.05)
+
+	monkeypatch.setattr(_Devenv, "create", _record_and_edit(_Devenv.create, edit))
+	watch_devenv(devenv, debounce=0.5, poll_interval=0.05, max_changes=1)
+
+	assert pip_args[0] == ["install", "six"]
+	assert pip_args[1:] == [["install", "iniconfig"]]
+
+	out = capsys.readouterr().out.splitlines()
+	assert "The project's requirements have changed." in out
+	assert out[-1] == f"The devenv in {devenv.venv_dir.as_posix()!r} is up to date."
+
+	# Errors are reported, and the watcher keeps going.
+	def break_config() -> None:
+		(tmp_pathplus / "pyproject.toml").write_text("[project]\nname = 'pyproject-devenv-demo'\ndependencies = 1\n")
+
+	monkeypatch.setattr(_Devenv, "sync", _record_and_edit(sync, break_config))
+	watch_devenv(devenv, debounce=0.2, poll_interval=0.05, max_changes=1)
+	assert "Error: " in capsys.readouterr().err
+	assert pip_args[1:] == [["install", "iniconfig"]]
+
+	# Including the devenv's interpreter failing.
+	def fail_inspect(executable) -> None:  # noqa: MAN001
+		raise subprocess.CalledProcessError(1, [str(executable), "-c", "..."])
+
+	def fix_config() -> None:
+		(tmp_pathplus / "pyproject.toml").write_lines([
+				"[project]",
+				"name = 'pyproject-devenv-demo'",
+				"dependencies = ['six', 'click']",
+				])
+
+	monkeypatch.setattr(pyproject_devenv.requirements, "inspect_venv", fail_inspect)
+	monkeypatch.setattr(_Devenv, "sync", _record_and_edit(sync, fix_config))
+	watch_devenv(devenv, debounce=0.2, poll_interval=0.05, max_changes=1)
+	assert "returned non-zero exit status 1." in capsys.readouterr().err
+	assert pip_args[1:] == [["install", "iniconfig"]]
+
+
+def _record_and_edit(method: Callable, edit: Callable[[], None]) -> Callable:
+	"""
+	Wrap ``method`` so the files are edited (once) shortly after it is first called, even if it fails.
+	"""
+
+	calls: List[Tuple[Any, ...]] = []
+
+	def wrapper(self, *args, **kwargs):  # noqa: MAN001,MAN002
+		try:
+			return method(self, *args, **kwargs)
+		finally:
+			if not calls:
+				later(edit)
+			calls.append(args)
+
+	return wrapper